@@ -0,0 +1,145 @@
+"""Measures the time needed to import the entry points of WattAdvisor in a fresh interpreter
+and checks that heavy third-party dependencies are not imported before the code path needing them is executed.
+
+Usage (from the root directory of the repository)::
+
+    python -m benchmarks.import_time                    # measure all entry points
+    python -m benchmarks.import_time --repeat 10        # take the median of more measurements
+
+Every measurement runs in a new interpreter, so that no module is cached. The exit code is 1
+if one of the `LAZY_MODULES` is imported by an entry point.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+
+
+logger = logging.getLogger()
+
+# modules imported by users, CLIs and worker processes
+ENTRY_POINTS = [
+    "wattadvisor.opt_model",
+    "wattadvisor.components.photovoltaic",
+    "wattadvisor.components.energy_demand",
+    "wattadvisor.parameter_sweep",
+    "wattadvisor.optimization_service",
+]
+
+# heavy dependencies which are only imported when a model is built or a profile is calculated
+LAZY_MODULES = [
+    "pyomo.environ",
+    "highspy",
+    "scipy.sparse",
+    "scipy.cluster",
+    "pvlib",
+    "windpowerlib",
+    "demandlib",
+    "holidays",
+    "xarray",
+]
+
+_MEASURE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{"import_time": time.perf_counter() - start, "modules": [m for m in {lazy_modules!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """Imports a module in a new interpreter.
+
+    Parameters
+    ----------
+    module : str
+        Absolute name of the module
+
+    Returns
+    -------
+    dict
+        Time of the import [s], time until the interpreter exited [s] and the `LAZY_MODULES` which were imported
+    """
+
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", _MEASURE.format(module=module, lazy_modules=LAZY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    process_time = time.perf_counter() - start
+
+    measurement = json.loads(output.strip().splitlines()[-1])
+    measurement["process_time"] = process_time
+
+    return measurement
+
+
+def run_import_benchmark(modules: list[str], repeat: int = 5) -> list[dict]:
+    """Measures the import of every module `repeat` times.
+
+    Parameters
+    ----------
+    modules : list[str]
+        Absolute names of the modules
+    repeat : int, optional
+        Number of measurements per module, by default 5
+
+    Returns
+    -------
+    list[dict]
+        Median import and process time [s] and the imported `LAZY_MODULES` of every module
+    """
+
+    results = []
+
+    for module in modules:
+        measurements = [measure_import(module) for _ in range(repeat)]
+
+        results.append(
+            {
+                "module": module,
+                "import_time": statistics.median(m["import_time"] for m in measurements),
+                "process_time": statistics.median(m["process_time"] for m in measurements),
+                "eager_modules": sorted(set().union(*(m["modules"] for m in measurements))),
+            }
+        )
+
+    return results
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measures the import time of the entry points of WattAdvisor.")
+    parser.add_argument("--modules", nargs="+", default=ENTRY_POINTS, help="modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements per module")
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    results = run_import_benchmark(args.modules, args.repeat)
+
+    print(f"{'module':<40}{'import':>12}{'process':>12}  eagerly imported")
+    for result in results:
+        print(
+            f"{result['module']:<40}{result['import_time']:>10.3f} s{result['process_time']:>10.3f} s"
+            f"  {', '.join(result['eager_modules']) or '-'}"
+        )
+
+    eager = [result for result in results if len(result["eager_modules"]) > 0]
+
+    for result in eager:
+        logger.error(f"{result['module']} imports {', '.join(result['eager_modules'])}")
+
+    return 1 if len(eager) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""Runs the benchmark suite, which builds and solves synthetic energy systems of increasing size,
+and compares the measured times and peak memory against a stored baseline.
+
+Usage (from the root directory of the repository)::
+
+    python -m benchmarks.run_benchmarks                     # run all sizes and compare against the baseline
+    python -m benchmarks.run_benchmarks --sizes small       # run selected sizes only
+    python -m benchmarks.run_benchmarks --update-baseline   # store the results as new baseline
+
+Every case runs in a fresh process, so that the peak memory of the cases is measured independently.
+The exit code is 1 if a regression against the baseline was found. Timings depend on the machine,
+so the baseline should be updated on the machine the benchmarks are regularly run on.
+
+At full resolution, the suite takes about half an hour on a single core, most of it solving the large system.
+``--n-typical-periods 12`` runs all sizes in a few seconds, but is not comparable to the stored baseline.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from wattadvisor.data_models.enums import ModelBackend
+from wattadvisor.opt_model import OptModel
+
+from .synthetic_systems import SIZES, build_synthetic_system
+
+
+logger = logging.getLogger()
+
+BASELINE_PATH = Path(__file__).parent.joinpath("baseline.json")
+
+TIMING_METRICS = ["preprocessing", "build", "solve_target", "solve_current", "results", "total"]
+
+
+def _peak_memory() -> int | None:
+    """Returns the peak resident memory of the current process [bytes], None if it cannot be determined."""
+
+    try:
+        import resource
+
+    except ImportError:
+        return None
+
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # kilobytes on Linux, bytes on macOS
+    return peak_memory if sys.platform == "darwin" else peak_memory * 1024
+
+
+def run_case(name: str, backend: ModelBackend, n_typical_periods: int | None, verbose: bool = False) -> dict:
+    """Builds and solves one benchmark system. Is called in a fresh worker process.
+
+    Parameters
+    ----------
+    name : str
+        Size of the system, key of `SIZES`
+    backend : ModelBackend
+        Backend used to build the optimization model
+    n_typical_periods : int | None
+        Number of representative periods to aggregate the time series to, None for full resolution
+    verbose : bool, optional
+        Whether the output of the model and the solver is shown, by default False
+
+    Returns
+    -------
+    dict
+        Status, objective values, model size, phase timings [s] and peak memory [bytes] of the case
+    """
+
+    if not verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        # the solver writes its log directly to the file descriptor of stdout
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+
+    start = time.perf_counter()
+    components = build_synthetic_system(**SIZES[name])
+
+    results = OptModel(components).run_calculation(
+        backend=backend, n_typical_periods=n_typical_periods, model_statistics=True
+    )
+    total = time.perf_counter() - start
+
+    phases = {phase.name: phase.wall_time for phase in results.performance.phases}
+    statistics = results.performance.model_statistics
+
+    return {
+        "case": name,
+        **SIZES[name],
+        "status": results.status.status.value,
+        "objective_target": None if results.target_scenario is None else results.target_scenario.kpis.total_annuities,
+        "objective_current": None if results.current_scenario is None else results.current_scenario.kpis.total_annuities,
+        "n_components": len(components),
+        "n_variables": statistics.n_variables,
+        "n_constraints": statistics.n_constraints,
+        "n_nonzeros": statistics.n_nonzeros,
+        "timings": {
+            "preprocessing": phases.get("preprocessing", 0.0),
+            "build": phases.get("build", 0.0),
+            "solve_target": phases.get("solve_target", 0.0),
+            "solve_current": phases.get("solve_current", 0.0),
+            "results": phases.get("results_target", 0.0) + phases.get("results_current", 0.0),
+            "total": total - phases.get("model_statistics", 0.0),
+        },
+        "peak_memory": _peak_memory(),
+    }
+
+
+def run_benchmarks(
+    sizes: list[str],
+    backend: ModelBackend = ModelBackend.PYOMO,
+    n_typical_periods: int | None = None,
+    verbose: bool = False,
+) -> dict:
+    """Runs the benchmark cases one after another, each in a fresh process.
+
+    Parameters
+    ----------
+    sizes : list[str]
+        Sizes of the systems to benchmark, keys of `SIZES`
+    backend : ModelBackend, optional
+        Backend used to build the optimization models, by default ModelBackend.PYOMO
+    n_typical_periods : int | None, optional
+        Number of representative periods to aggregate the time series to, by default None (full resolution)
+    verbose : bool, optional
+        Whether the output of the model and the solver is shown, by default False
+
+    Returns
+    -------
+    dict
+        Settings and machine of the run and the results of every case
+    """
+
+    cases = []
+    context = multiprocessing.get_context("spawn")
+
+    for name in sizes:
+        logger.info(f"Run benchmark case {name}")
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            cases.append(executor.submit(run_case, name, backend, n_typical_periods, verbose).result())
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "backend": backend.value,
+        "n_typical_periods": n_typical_periods,
+        "cases": cases,
+    }
+
+
+def compare_to_baseline(
+    results: dict,
+    baseline: dict,
+    tolerance: float = 0.25,
+    min_time_difference: float = 0.5,
+    min_memory_difference: int = 50 * 1024**2,
+) -> list[str]:
+    """Compares benchmark results against a baseline. A timing or the peak memory is a regression
+    if it exceeds the baseline by more than `tolerance` and by more than the minimum difference,
+    which prevents short phases from being reported due to measurement noise. Changes of the model size
+    or of the objective values are reported as well, since they indicate a change of the model formulation.
+
+    Parameters
+    ----------
+    results : dict
+        Results of `run_benchmarks`
+    baseline : dict
+        Stored results of a previous run
+    tolerance : float, optional
+        Allowed relative increase, by default 0.25
+    min_time_difference : float, optional
+        Minimum absolute increase of a timing to be reported [s], by default 0.5
+    min_memory_difference : int, optional
+        Minimum absolute increase of the peak memory to be reported [bytes], by default 50 MiB
+
+    Returns
+    -------
+    list[str]
+        Description of every regression, empty if there is none
+    """
+
+    regressions = []
+
+    if (results["backend"], results["n_typical_periods"]) != (baseline["backend"], baseline["n_typical_periods"]):
+        logger.warning("Baseline was created with different settings, timings are not comparable")
+
+    baseline_cases = {case["case"]: case for case in baseline["cases"]}
+
+    for case in results["cases"]:
+        name = case["case"]
+        if name not in baseline_cases:
+            logger.warning(f"Case {name} is not part of the baseline")
+            continue
+
+        base = baseline_cases[name]
+
+        for metric in ["status", "n_variables", "n_constraints", "n_nonzeros"]:
+            if case[metric] != base[metric]:
+                regressions.append(f"{name}: {metric} changed from {base[metric]} to {case[metric]}")
+
+        for metric in ["objective_target", "objective_current"]:
+            if case[metric] is None or base[metric] is None:
+                if case[metric] != base[metric]:
+                    regressions.append(f"{name}: {metric} changed from {base[metric]} to {case[metric]}")
+
+            elif abs(case[metric] - base[metric]) > 1e-6 * max(1, abs(base[metric])):
+                regressions.append(f"{name}: {metric} changed from {base[metric]:.6f} to {case[metric]:.6f}")
+
+        for metric in TIMING_METRICS:
+            value, base_value = case["timings"][metric], base["timings"][metric]
+            if value > base_value * (1 + tolerance) and value - base_value > min_time_difference:
+                regressions.append(f"{name}: {metric} took {value:.2f} s instead of {base_value:.2f} s")
+
+        if case["peak_memory"] is not None and base["peak_memory"] is not None:
+            value, base_value = case["peak_memory"], base["peak_memory"]
+            if value > base_value * (1 + tolerance) and value - base_value > min_memory_difference:
+                regressions.append(
+                    f"{name}: peak memory was {value / 1024**2:.0f} MiB instead of {base_value / 1024**2:.0f} MiB"
+                )
+
+    return regressions
+
+
+def _summary(results: dict) -> str:
+    """Formats the timings and the peak memory of all cases as a table."""
+
+    header = f"{'case':<8}" + "".join(f"{metric:>15}" for metric in TIMING_METRICS) + f"{'peak memory':>15}"
+    lines = [header]
+
+    for case in results["cases"]:
+        peak_memory = "-" if case["peak_memory"] is None else f"{case['peak_memory'] / 1024**2:.0f} MiB"
+        lines.append(
+            f"{case['case']:<8}"
+            + "".join(f"{case['timings'][metric]:>13.2f} s" for metric in TIMING_METRICS)
+            + f"{peak_memory:>15}"
+        )
+
+    return "\n".join(lines)
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks building and solving synthetic energy systems.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="sizes of the systems to benchmark")
+    parser.add_argument("--backend", choices=[backend.value for backend in ModelBackend], default=ModelBackend.PYOMO.value)
+    parser.add_argument("--n-typical-periods", type=int, default=None, help="aggregate the time series to typical days")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"), help="file to write the results to")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative increase of timings and memory")
+    parser.add_argument("--verbose", action="store_true", help="show the output of the model and the solver")
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    results = run_benchmarks(args.sizes, ModelBackend(args.backend), args.n_typical_periods, args.verbose)
+
+    args.output.write_text(json.dumps(results, indent=2))
+    print(_summary(results))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        logger.info(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        logger.warning(f"No baseline found at {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, json.loads(args.baseline.read_text()), tolerance=args.tolerance)
+
+    for regression in regressions:
+        logger.error(regression)
+
+    if len(regressions) == 0:
+        logger.info("No regressions against the baseline")
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Contains the generation of synthetic energy systems of configurable size for benchmarks.
+All inputs (weather data, demand and price profiles) are generated offline from a seeded random generator,
+so that every run builds exactly the same optimization models.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import numpy as np
+import pandas as pd
+
+from wattadvisor.components.component import Component
+from wattadvisor.components.combined_heat_power import CombinedHeatPower
+from wattadvisor.components.electrical_energy_storage import ElectricalEnergyStorage
+from wattadvisor.components.electrode_boiler import ElectrodeBoiler
+from wattadvisor.components.energy_demand import EnergyDemand
+from wattadvisor.components.energy_feedin import EnergyFeedin
+from wattadvisor.components.energy_purchase import EnergyPurchase
+from wattadvisor.components.gas_boiler import GasBoiler
+from wattadvisor.components.heat_pump import HeatPumpAir
+from wattadvisor.components.photovoltaic import PhotovoltaikRoof
+from wattadvisor.components.solarthemal_energy import SolarthermalEnergy
+from wattadvisor.components.solid_fuel_boiler import SolidFuelBoiler
+from wattadvisor.components.thermal_energy_storage import ThermalEnergyStorage
+from wattadvisor.components.wind_power import WindPower
+from wattadvisor.data_models.enums import EnergyType, WeatherDataSource
+from wattadvisor.data_models.weather_data import WeatherDataHeightUnspecific, WeatherDataType
+
+
+# sizes of the benchmark systems: number of components per type, number of storages per
+# storage type and number of energy types (electrical, thermal, natural gas, solid fuel)
+SIZES = {
+    "small": {"n_per_type": 1, "n_storages": 1, "n_energy_types": 2},
+    "medium": {"n_per_type": 2, "n_storages": 1, "n_energy_types": 3},
+    "large": {"n_per_type": 3, "n_storages": 2, "n_energy_types": 4},
+}
+
+ENERGY_TYPES = [EnergyType.ELECTRICAL, EnergyType.THERMAL, EnergyType.NATURAL_GAS, EnergyType.SOLID_FUEL]
+
+
+def synthetic_weather_data(seed: int = 0) -> dict[WeatherDataType, WeatherDataHeightUnspecific]:
+    """Generates hourly weather data of one year with daily and seasonal cycles and random noise.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed of the random generator, by default 0
+
+    Returns
+    -------
+    dict[WeatherDataType, WeatherDataHeightUnspecific]
+        Air temperature [°C], global horizontal irradiance [W/m²] and wind speed [m/s]
+    """
+
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2022-01-01", periods=8760, freq="h", tz="UTC")
+    hours = np.arange(8760)
+    season = -np.cos(hours / 8760 * 2 * np.pi)
+    day = np.sin((hours % 24 - 6) / 12 * np.pi)
+
+    air_temperature = 10 + 10 * season + 4 * day + rng.normal(0, 2, 8760)
+    cloudiness = np.clip(rng.normal(0.6, 0.25, 365).repeat(24), 0, 1)
+    ghi = np.clip(day, 0, None) * (550 + 350 * season) * cloudiness
+    wind_speed = np.clip(5 - 1.5 * season + rng.normal(0, 2.5, 8760), 0, None)
+
+    return {
+        weather_data_type: WeatherDataHeightUnspecific.from_array(
+            values, index, source=WeatherDataSource.CUSTOM_CSV, type=weather_data_type, dtype=np.float64
+        )
+        for weather_data_type, values in [
+            (WeatherDataType.AIR_TEMPERATURE, air_temperature),
+            (WeatherDataType.GHI, ghi),
+            (WeatherDataType.WIND_SPEED, wind_speed),
+        ]
+    }
+
+
+def build_synthetic_system(
+    n_per_type: int = 1, n_storages: int = 1, n_energy_types: int = 2, seed: int = 0
+) -> list[Component]:
+    """Builds the components of a synthetic energy system. The parameters of multiple components
+    of the same type differ slightly, so that the optimization model is not degenerated. The first heat pump
+    is already installed, so that the current scenario can be solved as well.
+
+    Parameters
+    ----------
+    n_per_type : int, optional
+        Number of generation and conversion components per component type, by default 1
+    n_storages : int, optional
+        Number of storages per storage type, by default 1
+    n_energy_types : int, optional
+        Number of energy types with demand or supply, from 2 (electrical and thermal)
+        to 4 (additionally natural gas and solid fuel), by default 2
+    seed : int, optional
+        Seed of the random generator of all time series, by default 0
+
+    Returns
+    -------
+    list[Component]
+        Components of the system
+    """
+
+    if not 2 <= n_energy_types <= len(ENERGY_TYPES):
+        raise ValueError(f"Number of energy types must be between 2 and {len(ENERGY_TYPES)}.")
+
+    energy_types = ENERGY_TYPES[:n_energy_types]
+    rng = np.random.default_rng(seed)
+    weather = synthetic_weather_data(seed)
+    index = weather[WeatherDataType.GHI].series.index
+    hours = np.arange(8760)
+
+    ghi = weather[WeatherDataType.GHI].series.to_numpy()
+    wind_speed = weather[WeatherDataType.WIND_SPEED].series.to_numpy()
+    air_temperature = weather[WeatherDataType.AIR_TEMPERATURE].series.to_numpy()
+
+    electrical_demand = 0.4 + 0.2 * np.sin((hours % 24 - 8) / 24 * 2 * np.pi) + rng.uniform(0, 0.1, 8760)
+    thermal_demand = np.clip(1.2 - 0.08 * (air_temperature - 10), 0.2, None) + rng.uniform(0, 0.2, 8760)
+    price = 0.3 + 0.1 * np.sin((hours % 24 - 12) / 24 * 2 * np.pi) + rng.normal(0, 0.02, 8760)
+
+    components = [
+        EnergyDemand(energy_type=EnergyType.ELECTRICAL, demand_profile=pd.Series(n_per_type * electrical_demand, index=index)),
+        EnergyDemand(energy_type=EnergyType.THERMAL, demand_profile=pd.Series(n_per_type * thermal_demand, index=index)),
+        EnergyPurchase(energy_type=EnergyType.ELECTRICAL, energy_price_profile=pd.Series(price, index=index), co2_intensity=445, power_price=50),
+        EnergyFeedin(energy_type=EnergyType.ELECTRICAL, energy_price_scalar=0.08),
+    ]
+
+    for i in range(n_per_type):
+        factor = 1 + 0.05 * i
+        shift = np.roll(np.arange(8760), i)
+
+        components += [
+            PhotovoltaikRoof(lifespan=20, capex=750 * factor, opex=2.87, potential_power=20,
+                             normed_production=pd.Series(np.clip(ghi[shift] / 1000, 0, 1), index=index)),
+            WindPower(lifespan=20, capex=1500 * factor, opex=2, potential_power=5,
+                      normed_production=pd.Series(np.clip((wind_speed[shift] / 12) ** 3, 0, 1), index=index)),
+            HeatPumpAir(lifespan=20, capex=1000 * factor, opex=2, installed_power=3 * n_per_type if i == 0 else 0,
+                        source_temperature_series=weather[WeatherDataType.AIR_TEMPERATURE]),
+            ElectrodeBoiler(lifespan=20, capex=100 * factor, opex=1, eff=0.99),
+            SolarthermalEnergy(lifespan=20, capex=500 * factor, opex=1, eff=0.6, potential_area=10,
+                               ghi=weather[WeatherDataType.GHI]),
+        ]
+
+        if EnergyType.NATURAL_GAS in energy_types:
+            components += [
+                GasBoiler(lifespan=20, capex=300 * factor, opex=2, eff=0.75, installed_power=3 if i == 0 else 0),
+                CombinedHeatPower(lifespan=15, capex=2000 * factor, opex=5, eff_elt=0.3, eff_heat=0.55),
+            ]
+
+        if EnergyType.SOLID_FUEL in energy_types:
+            components.append(SolidFuelBoiler(lifespan=20, capex=400 * factor, opex=2, eff=0.8))
+
+    for i in range(n_storages):
+        factor = 1 + 0.05 * i
+
+        components += [
+            ElectricalEnergyStorage(lifespan=15, capex_capacity=500 * factor, capex_power=500 * factor, opex=0.1,
+                                    eff=0.9, relative_losses=0.00007, initial_soc=0.2),
+            ThermalEnergyStorage(lifespan=20, capex_capacity=5 * factor, capex_power=100 * factor, opex=2,
+                                 eff=0.75, relative_losses=0.00138),
+        ]
+
+    if EnergyType.NATURAL_GAS in energy_types:
+        components.append(EnergyPurchase(energy_type=EnergyType.NATURAL_GAS, energy_price_scalar=0.10, co2_intensity=202))
+
+    if EnergyType.SOLID_FUEL in energy_types:
+        components.append(EnergyPurchase(energy_type=EnergyType.SOLID_FUEL, energy_price_scalar=0.08, co2_intensity=350))
+
+    return components
@@ -2,13 +2,19 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
 from pydantic import Field
 
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..data_models.enums import EnergyType
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class CombinedHeatPower(InvestmentComponent):
     """Component to turn an energy carrying medium like gas into electric and thermal power.
         2 different kinds of capacities have to be implemented for this, but since the
@@ -85,28 +91,20 @@ class CombinedHeatPower(InvestmentComponent):
         model.add_component('{}_eq01'.format(self.name), self._eq01)
 
         # calculating electrical output
-        self._eq02=pyoe.ConstraintList()
+        self._eq02=pyoe.Constraint(t, rule=lambda model, tx: self._output_electrical[tx] == self._input_gas[tx] * self.eff_elt)
         model.add_component('{}_eq02'.format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(self._output_electrical[tx] == self._input_gas[tx] * self.eff_elt)
-        
+
         # calculating thermal output
-        self._eq03=pyoe.ConstraintList()
+        self._eq03=pyoe.Constraint(t, rule=lambda model, tx: self._output_thermal[tx] == self._input_gas[tx] * self.eff_heat)
         model.add_component('{}_eq03'.format(self.name), self._eq03)
-        for tx in t:
-            self._eq03.add(self._output_thermal[tx] == self._input_gas[tx] * self.eff_heat)
 
         # restraining electrical output / calculating necessary installed electrical power
-        self._eq04=pyoe.ConstraintList()
+        self._eq04=pyoe.Constraint(t, rule=lambda model, tx: self._output_electrical[tx] <= self._advised_power)
         model.add_component('{}_eq04'.format(self.name), self._eq04)
-        for tx in t:
-            self._eq04.add(self._output_electrical[tx] <= self._advised_power)
 
         # restraining thermal output / calculating necessary installed thermal power
-        self._eq05=pyoe.ConstraintList()
+        self._eq05=pyoe.Constraint(t, rule=lambda model, tx: self._output_thermal[tx] <= self._maxhp)
         model.add_component('{}_eq05'.format(self.name), self._eq05)
-        for tx in t:
-            self._eq05.add(self._output_thermal[tx]<= self._maxhp)
 
         # calculate annual running cost
         self._eq06=pyoe.Constraint(expr=self._operational_cost == self._investment_cost * self.opex/100)
@@ -116,4 +114,104 @@ class CombinedHeatPower(InvestmentComponent):
         self._eq07=pyoe.Constraint(expr=self._investment_cost == self._advised_power * self.capex)
         model.add_component('{}_eq07'.format(self.name), self._eq07)
 
-        return model
\ No newline at end of file
+        return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) electrical power [kW]
+        self._output_electrical = model.add_variable(
+            f"{self.name}_output_electrical", indexed=True, bounds=(0.0, None)
+        )
+
+        # peak electrical power [kWp]
+        self._advised_power = model.add_variable(
+            f"{self.name}_advised_power",
+            bounds=(self.installed_power, self.potential_power),
+        )
+
+        # (Output) thermal power [kW]
+        self._output_thermal = model.add_variable(
+            f"{self.name}_output_thermal", indexed=True, bounds=(0.0, None)
+        )
+
+        # peak thermal power [kWp]
+        self._maxhp = model.add_variable(f"{self.name}_maxhp", bounds=(0.0, None))
+
+        # (Input) Energy in form of gas [kW]
+        self._input_gas = model.add_variable(
+            f"{self.name}_input_gas", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        self.bilance_variables.output[EnergyType.ELECTRICAL] = self._output_electrical
+        self.bilance_variables.output[EnergyType.THERMAL] = self._output_thermal
+        self.bilance_variables.input[EnergyType.NATURAL_GAS] = self._input_gas
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, depends on peak(installed) electrical power
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating electrical output
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [(self._output_electrical, 1), (self._input_gas, -self.eff_elt)],
+            "==",
+        )
+
+        # calculating thermal output
+        model.add_constraints(
+            f"{self.name}_eq03",
+            [(self._output_thermal, 1), (self._input_gas, -self.eff_heat)],
+            "==",
+        )
+
+        # restraining electrical output / calculating necessary installed electrical power
+        model.add_constraints(
+            f"{self.name}_eq04",
+            [(self._output_electrical, 1), (self._advised_power, -1)],
+            "<=",
+        )
+
+        # restraining thermal output / calculating necessary installed thermal power
+        model.add_constraints(
+            f"{self.name}_eq05", [(self._output_thermal, 1), (self._maxhp, -1)], "<="
+        )
+
+        # calculate annual running cost
+        model.add_constraint(
+            f"{self.name}_eq06",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq07",
+            [(self._investment_cost, 1), (self._advised_power, -self.capex)],
+            "==",
+        )
+
+        return model
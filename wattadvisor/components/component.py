@@ -2,22 +2,60 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
+from __future__ import annotations
+
 import logging
-from typing import ClassVar
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, ClassVar, Iterator
 
-from pyomo.core import Model, RangeSet
-import pyomo.environ as pyoe
+import numpy as np
+import pandas as pd
 from pydantic import Field, model_validator, computed_field
 
 from ..data_models.bilance_variables import BilanceVariables
 from ..data_models.base_model import BaseModelCustom
 from ..data_models.enums import EnergyType
+from ..utils.build_profiler import build_phase
+from ..utils.lazy_import import lazy_import
+from ..utils.model_scope import ModelScope
 from ..utils.parameters import Parameters
+from ..utils.performance import cpu_time
+from ..utils.time_aggregation import TimeAggregation
+from ..sparse_model import SparseModel, SparseVariable
+
+if TYPE_CHECKING:
+    from pyomo.core import Model, RangeSet
 
 
+pyoe = lazy_import("pyomo.environ")
 logger = logging.getLogger()
 
 
+def _array_param(values: np.ndarray, t: RangeSet) -> pyoe.Param:
+    """Creates a parameter indexed by the time set `t`, whose value of time step ``tx`` is the value
+    at position ``tx - 1`` of `values`. The values are read by position while pyomo constructs the parameter,
+    which is considerably faster than initializing it from a dict mapping every time step to its value.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values in the order of the time steps of `t`
+    t : RangeSet
+        Time set starting at 1
+
+    Returns
+    -------
+    pyoe.Param
+        Parameter, which is constructed when it is added to the model
+    """
+
+    # python floats, so that pyomo does not store numpy scalars
+    items = values.tolist()
+
+    return pyoe.Param(t, initialize=lambda model, tx: items[tx - 1])
+
+
 class Component(BaseModelCustom):
     """Parent base class for all optimization energy components. 
         Contains empty methods which are overidden by child classes.
@@ -26,7 +64,7 @@ class Component(BaseModelCustom):
         ----------
         name : str | None, optional
             Name of the component. If not given, name is generated automatically based on the 
-            class name of the component and an integer counter, default None
+            class name of the component and an integer counter of the active `ModelScope`, default None
         parameters : None | dict, optional
             Dictionary of techno-economic parameters of the component, by default None.
             A dict of the following structure is expected. 
@@ -43,11 +81,13 @@ class Component(BaseModelCustom):
 
     """
     
-    names_counter: ClassVar[dict] = {}
     name: str | None = None
     parameters: dict | None = Field(default=None, exclude=True, description="Der Name des Benutzers")
     bilance_variables: BilanceVariables = Field(default_factory=BilanceVariables, exclude=True)
 
+    # fields calculated in the constructor mapped to the fields they are calculated from
+    _preprocessing_inputs: ClassVar[dict[str, tuple[str, ...]]] = {}
+
     @computed_field
     @property
     def annuity(self) -> float | None:
@@ -153,7 +193,7 @@ class Component(BaseModelCustom):
         if len(self.bilance_variables.output.keys()) > 0:
             output_energy_sum_dict = {}
             for energy_type, bilance_variable in self.bilance_variables.output.items():
-                output_energy_sum_dict[energy_type] = sum(bilance_variable.extract_values().values())
+                output_energy_sum_dict[energy_type] = self._time_series_sum(self._solution_values(bilance_variable))
 
             return output_energy_sum_dict
         
@@ -216,7 +256,7 @@ class Component(BaseModelCustom):
         """
 
         if hasattr(self, "co2_intensity"):
-            return self.co2_intensity * sum(self._output.extract_values().values()) / 1e6
+            return self.co2_intensity * self._time_series_sum(self._solution_values(self._output)) / 1e6
         
     @computed_field
     @property
@@ -231,7 +271,7 @@ class Component(BaseModelCustom):
         """
 
         if hasattr(self, "_purchase_cost"):   
-            return sum(list(self.bilance_variables.output.values())[0].extract_values().values())
+            return self._time_series_sum(self._solution_values(list(self.bilance_variables.output.values())[0]))
 
     @model_validator(mode="before")
     @classmethod
@@ -249,15 +289,30 @@ class Component(BaseModelCustom):
         super().__init__(**data)
 
         if self.name is None:
-            if self.__class__.__name__ in Component.names_counter:
-                Component.names_counter[self.__class__.__name__] += 1
-            else:
-                Component.names_counter[self.__class__.__name__] = 1
-            
-            self.name = f"{self.__class__.__name__}_{Component.names_counter[self.__class__.__name__]}"
+            self.name = ModelScope.current().next_name(self.__class__.__name__)
+            # generated names differ between identical systems built in the same scope
+            self._generated_name = True
 
         logger.debug(f"Component '{self.name}' initialized via Class '{self.__class__.__name__}'")
 
+    @contextmanager
+    def _timed_preprocessing(self) -> Iterator[None]:
+        """Context manager adding the wall and CPU time spent in its body to the attribute ``_preprocessing_time``
+        of the component. Wraps the calculation of time series (e.g. feed-in, demand or COP profiles) in the constructor."""
+
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+
+        try:
+            yield
+
+        finally:
+            wall_time, used_cpu_time = getattr(self, "_preprocessing_time", None) or (0.0, 0.0)
+            self._preprocessing_time = (
+                wall_time + time.perf_counter() - wall_start,
+                used_cpu_time + cpu_time() - cpu_start,
+            )
+
     def has_input(self, energy_type: EnergyType) -> bool:
         """Checks whether the components ``bilance_variables`` attribute 
         contains an input with the given `energy_type`.
@@ -296,6 +351,168 @@ class Component(BaseModelCustom):
         
         return energy_type in self.bilance_variables.output
 
+    @property
+    def _aggregation(self) -> TimeAggregation | None:
+        """Returns the time aggregation the component was added to the model with, if any.
+
+        Returns
+        -------
+        TimeAggregation | None
+            Time aggregation or None if the model is built over the full time span
+        """
+
+        return getattr(self, "_time_aggregation", None)
+
+    def _time_series_array(self, values: pd.Series | list | np.ndarray) -> np.ndarray:
+        """Returns a time series of the full time span as contiguous float array. If the component
+        was added to the model with a time aggregation, the time series is aggregated to its representative periods.
+        Float series and arrays are not copied if no aggregation is applied.
+
+        Parameters
+        ----------
+        values : pd.Series | list | np.ndarray
+            Values of every time step of the full time span
+
+        Returns
+        -------
+        np.ndarray
+            Values in the order of the time steps of the model
+        """
+
+        values = np.ascontiguousarray(values, dtype=np.float64)
+
+        if self._aggregation is None:
+            return values
+
+        return self._aggregation.aggregate(values)
+
+    def _time_series_param(self, values: pd.Series | list | np.ndarray, t: RangeSet) -> pyoe.Param:
+        """Creates a parameter indexed by the time set `t` from a time series of the full time span
+        (see `_time_series_array`).
+
+        Parameters
+        ----------
+        values : pd.Series | list | np.ndarray
+            Values of every time step of the full time span
+        t : RangeSet
+            Time set the values are mapped to
+
+        Returns
+        -------
+        pyoe.Param
+            Parameter, which is constructed when it is added to the model
+        """
+
+        return _array_param(self._time_series_array(values), t)
+
+    def _solution_values(self, variable) -> np.ndarray:
+        """Returns the solution values of a time-indexed pyomo or sparse variable as array.
+        The values are extracted from the solved model only once and kept until
+        `clear_solution_values` is called, which happens every time the model is solved.
+
+        Parameters
+        ----------
+        variable : IndexedVar | SparseVariable
+            Time-indexed variable of the component
+
+        Returns
+        -------
+        np.ndarray
+            Solution values in the order of the time steps, ``nan`` if a value is missing
+        """
+
+        solution_values = getattr(self, "_solution_values_cache", None)
+        if solution_values is None:
+            solution_values = self._solution_values_cache = {}
+
+        key = id(variable)
+        if key not in solution_values:
+            if isinstance(variable, SparseVariable):
+                solution_values[key] = variable.values
+            else:
+                solution_values[key] = np.array([var.value for var in variable.values()], dtype=float)
+
+        return solution_values[key]
+
+    def clear_solution_values(self):
+        """Discards the cached solution values of the component's variables,
+        so that they are extracted again after the model was (re-)solved."""
+
+        self._solution_values_cache = {}
+
+    def _time_series_sum(self, values: np.ndarray) -> float:
+        """Sums up the values of a time-indexed variable or parameter over the full time span.
+        If the component was added to the model with a time aggregation, the values are weighted
+        by the number of periods their representative period stands for.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values in the order of the time steps of the model
+
+        Returns
+        -------
+        float
+            Sum over the full time span
+        """
+
+        if self._aggregation is None:
+            return float(values.sum())
+
+        return float(np.dot(values, self._aggregation.weights))
+
+    def _load_time_weights(self, model: Model, t: RangeSet) -> Model:
+        """Adds the weights of the time steps of the aggregated time set `t` as a parameter to the pyomo model,
+        e.g. to weight time-variant cost when summing them up to annual cost.
+
+        Parameters
+        ----------
+        model : Model
+            Pyomo model to which the parameter will be added.
+        t : RangeSet
+            Aggregated time set
+
+        Returns
+        -------
+        Model
+            Pyomo model with the added parameter
+        """
+
+        self._time_weights = _array_param(self._aggregation.weights, t)
+        model.add_component(f"{self.name}_time_weights", self._time_weights)
+
+        return model
+
+    def _weighted_sum(self, variable, t: RangeSet, param: pyoe.Param | None = None):
+        """Returns the expression of the sum of a time-indexed variable over the time set `t`. Every time step
+        is multiplied by the time-indexed parameter `param`, if given, and by the weight of the time step,
+        if the component was added to the model with a time aggregation (see `_load_time_weights`).
+
+        Parameters
+        ----------
+        variable : IndexedVar
+            Time-indexed variable
+        t : RangeSet
+            Time set
+        param : pyoe.Param | None, optional
+            Time-indexed parameter, by default None
+
+        Returns
+        -------
+        Expression
+            Sum over the time set
+        """
+
+        factors = [variable]
+
+        if param is not None:
+            factors.append(param)
+
+        if self._aggregation is not None:
+            factors.append(self._time_weights)
+
+        return pyoe.sum_product(*factors, index=t)
+
     def _load_params(self, model: Model, t: RangeSet) -> Model:
         """Function to add parameters to the pyomo optimization model in `model`
 
@@ -350,7 +567,7 @@ class Component(BaseModelCustom):
 
         return model
 
-    def add_to_model(self, model: Model, t: RangeSet) -> Model:
+    def add_to_model(self, model: Model, t: RangeSet, time_aggregation: TimeAggregation | None = None) -> Model:
         """Calls the appropriate functions to add parameters, variables and constraints to the pyomo model given by `model`.
 
         Parameters
@@ -359,6 +576,9 @@ class Component(BaseModelCustom):
             Pyomo model to which the parameters, variables and constraints will be added.
         t : RangeSet
             Time set over which time-variant parameters, variables and constraints will be added.
+        time_aggregation : TimeAggregation | None, optional
+            Time aggregation `t` represents. If given, time series are aggregated to the representative periods
+            and time sums are weighted, by default None
 
         Returns
         -------
@@ -366,13 +586,83 @@ class Component(BaseModelCustom):
             Pyomo model with the added parameters, variables and constraints
         """
 
+        self._time_aggregation = time_aggregation
+        self.clear_solution_values()
+
+        class_name = self.__class__.__name__
+
         # Call to load the parameters in form of scalars, sets or charts
-        model = self._load_params(model, t)
+        with build_phase(class_name, self.name, "load_params", model):
+            model = self._load_params(model, t)
         # Call to add variables to the optimization model
-        model = self._add_variables(model, t)
+        with build_phase(class_name, self.name, "add_variables", model):
+            model = self._add_variables(model, t)
         # Call to add constraints to the optimization model
-        model = self._add_constraints(model, t)
+        with build_phase(class_name, self.name, "add_constraints", model):
+            model = self._add_constraints(model, t)
 
         logger.debug(f"Component '{self.name}' added to model.")
 
-        return model
\ No newline at end of file
+        return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+        """Function to add variables and constant time series to the sparse optimization model in `model`
+
+        Parameters
+        ----------
+        model : SparseModel
+            Sparse model to which variables will be added.
+
+        Returns
+        -------
+        SparseModel
+            Sparse model with the added variables
+        """
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+        """Function to add constraints as blocks of sparse coefficients to the sparse optimization model in `model`
+
+        Parameters
+        ----------
+        model : SparseModel
+            Sparse model to which constraints will be added.
+
+        Returns
+        -------
+        SparseModel
+            Sparse model with the added constraints
+        """
+
+        return model
+
+    def add_to_sparse_model(self, model: SparseModel) -> SparseModel:
+        """Calls the appropriate functions to add variables and constraints to the sparse model given by `model`.
+
+        Parameters
+        ----------
+        model : SparseModel
+            Sparse model to which the variables and constraints will be added.
+
+        Returns
+        -------
+        SparseModel
+            Sparse model with the added variables and constraints
+        """
+
+        self._time_aggregation = None
+        self.clear_solution_values()
+
+        class_name = self.__class__.__name__
+
+        # Call to add variables to the optimization model
+        with build_phase(class_name, self.name, "add_variables", model):
+            model = self._add_sparse_variables(model)
+        # Call to add constraints to the optimization model
+        with build_phase(class_name, self.name, "add_constraints", model):
+            model = self._add_sparse_constraints(model)
+
+        logger.debug(f"Component '{self.name}' added to sparse model.")
+
+        return model
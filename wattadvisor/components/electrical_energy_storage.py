@@ -2,13 +2,20 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
+import numpy as np
 from pydantic import Field
 
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..data_models.enums import EnergyType
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class ElectricalEnergyStorage(InvestmentComponent):
     """Component where electrical power can be stored and later taken out again, due to
     efficiency a part of the energy is lost.
@@ -57,8 +64,10 @@ class ElectricalEnergyStorage(InvestmentComponent):
         self._dc = pyoe.Var(t, bounds=(0.0, None))
         model.add_component("{}_dc".format(self.name), self._dc)
 
-        # currently stored energy [kWh]
-        self._storage = pyoe.Var(t, bounds=(0.0, None))
+        # currently stored energy [kWh], relative to the start of the
+        # representative period if the time set is aggregated
+        storage_bounds = (0.0, None) if self._aggregation is None else (None, None)
+        self._storage = pyoe.Var(t, bounds=storage_bounds)
         model.add_component("{}_storage".format(self.name), self._storage)
 
         # peak capacity [kWh], necessary to install capacity
@@ -115,50 +124,46 @@ class ElectricalEnergyStorage(InvestmentComponent):
         model.add_component("{}_eq01".format(self.name), self._eq01)
 
         # calculating chg/dc balance
-        self._eq02 = pyoe.ConstraintList()
+        self._eq02 = pyoe.Constraint(
+            t,
+            rule=lambda model, tx: self._input_electrical[tx]
+            == self._chg[tx] - self._dc[tx] * self.eff,
+        )
         model.add_component("{}_eq02".format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(
-                self._input_electrical[tx] == self._chg[tx] - self._dc[tx] * self.eff
-            )
 
         # calculating the current amount of energy stored
-        self._eq03 = pyoe.ConstraintList()
-        model.add_component("{}_eq03".format(self.name), self._eq03)
-        for tx in t:
-            if tx == 1:
-                self._eq03.add(
-                    self._storage[tx]
-                    == self._advised_capacity * self.initial_soc
-                    + self._chg[tx]
-                    - self._dc[tx]
-                    - self._losses[tx]
-                )
+        def _eq03_rule(model, tx):
+            if self._aggregation is not None and self._aggregation.is_period_start(tx):
+                previous_storage = 0
+            elif tx == t.first():
+                previous_storage = self._advised_capacity * self.initial_soc
             else:
-                self._eq03.add(
-                    self._storage[tx]
-                    == self._storage[tx - 1]
-                    + self._chg[tx]
-                    - self._dc[tx]
-                    - self._losses[tx]
-                )
+                previous_storage = self._storage[tx - 1]
+
+            return (
+                self._storage[tx]
+                == previous_storage + self._chg[tx] - self._dc[tx] - self._losses[tx]
+            )
+
+        self._eq03 = pyoe.Constraint(t, rule=_eq03_rule)
+        model.add_component("{}_eq03".format(self.name), self._eq03)
 
         # set peak rate for charging and discharging to receive necessary to install power
-        self._eq07 = pyoe.ConstraintList()
+        self._eq07 = pyoe.Constraint(
+            t, rule=lambda model, tx: self._dc[tx] <= self._advised_power
+        )
         model.add_component("{}_eq07".format(self.name), self._eq07)
-        for tx in t:
-            self._eq07.add(self._dc[tx] <= self._advised_power)
 
-        self._eq08 = pyoe.ConstraintList()
+        self._eq08 = pyoe.Constraint(
+            t, rule=lambda model, tx: self._chg[tx] <= self._advised_power
+        )
         model.add_component("{}_eq08".format(self.name), self._eq08)
-        for tx in t:
-            self._eq08.add(self._chg[tx] <= self._advised_power)
 
         # restrict the size of the storage unit to get the necessary capacity to install
-        self._eq09 = pyoe.ConstraintList()
+        self._eq09 = pyoe.Constraint(
+            t, rule=lambda model, tx: self._storage[tx] <= self._advised_capacity
+        )
         model.add_component("{}_eq09".format(self.name), self._eq09)
-        for tx in t:
-            self._eq09.add(self._storage[tx] <= self._advised_capacity)
 
         # calculate the annual running cost
         self._eq10 = pyoe.Constraint(
@@ -174,15 +179,155 @@ class ElectricalEnergyStorage(InvestmentComponent):
         )
         model.add_component("{}_eq11".format(self.name), self._eq11)
 
-        # calculate the losses of stored energy over time
-        self._eq12 = pyoe.ConstraintList()
+        # calculate the losses of stored energy over time, if the time set is aggregated,
+        # losses are applied to the energy stored at the start of each period instead
+        def _eq12_rule(model, tx):
+            if tx == t.first() or self._aggregation is not None:
+                return self._losses[tx] == 0
+
+            return self._losses[tx] == self.relative_losses * self._storage[tx - 1]
+
+        self._eq12 = pyoe.Constraint(t, rule=_eq12_rule)
         model.add_component("{}_eq12".format(self.name), self._eq12)
-        for tx in t:
-            if tx == 1:
-                self._eq12.add(self._losses[tx] == 0)
-            else:
-                self._eq12.add(
-                    self._losses[tx] == self.relative_losses * self._storage[tx - 1]
-                )
+
+        if self._aggregation is not None:
+            # link the energy stored across all periods of the full time span
+            model = self._aggregation.add_storage_linking(
+                model,
+                t,
+                self.name,
+                self._storage,
+                self._advised_capacity,
+                self.initial_soc,
+                self.relative_losses,
+            )
+
+        return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Input) charging energy [kW]
+        self._chg = model.add_variable(f"{self.name}_chg", indexed=True, bounds=(0.0, None))
+
+        # (Output) discharging energy [kW]
+        self._dc = model.add_variable(f"{self.name}_dc", indexed=True, bounds=(0.0, None))
+
+        # currently stored energy [kWh]
+        self._storage = model.add_variable(
+            f"{self.name}_storage", indexed=True, bounds=(0.0, None)
+        )
+
+        # peak capacity [kWh], necessary to install capacity
+        self._advised_capacity = model.add_variable(
+            f"{self.name}_advised_capacity",
+            bounds=(self.installed_capacity, self.potential_capacity),
+        )
+
+        # peak charging/discharging rate [kW], necessary power
+        self._advised_power = model.add_variable(
+            f"{self.name}_advised_power",
+            bounds=(self.installed_power, self.potential_power),
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        # charging/discharging balance; input - output
+        self._input_electrical = model.add_variable(f"{self.name}_input_electrical", indexed=True)
+
+        # losses of stored energy over time
+        self._losses = model.add_variable(
+            f"{self.name}_losses", indexed=True, bounds=(0.0, None)
+        )
+
+        self.bilance_variables.input[EnergyType.ELECTRICAL] = self._input_electrical
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, depending on peak capacity and chg/dc rate
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating chg/dc balance
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [(self._input_electrical, 1), (self._chg, -1), (self._dc, self.eff)],
+            "==",
+        )
+
+        # calculating the current amount of energy stored, the energy stored
+        # before the first time step is given by the initial SOC
+        previous_storage_coefficients = np.full(model.n_time_steps, -1.0)
+        previous_storage_coefficients[0] = -self.initial_soc
+
+        model.add_constraints(
+            f"{self.name}_eq03",
+            [
+                (self._storage, 1),
+                (self._storage.lag(first=self._advised_capacity), previous_storage_coefficients),
+                (self._chg, -1),
+                (self._dc, 1),
+                (self._losses, 1),
+            ],
+            "==",
+        )
+
+        # set peak rate for charging and discharging to receive necessary to install power
+        model.add_constraints(
+            f"{self.name}_eq07", [(self._dc, 1), (self._advised_power, -1)], "<="
+        )
+
+        model.add_constraints(
+            f"{self.name}_eq08", [(self._chg, 1), (self._advised_power, -1)], "<="
+        )
+
+        # restrict the size of the storage unit to get the necessary capacity to install
+        model.add_constraints(
+            f"{self.name}_eq09", [(self._storage, 1), (self._advised_capacity, -1)], "<="
+        )
+
+        # calculate the annual running cost
+        model.add_constraint(
+            f"{self.name}_eq10",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate the one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq11",
+            [
+                (self._investment_cost, 1),
+                (self._advised_capacity, -self.capex_capacity),
+                (self._advised_power, -self.capex_power),
+            ],
+            "==",
+        )
+
+        # calculate the losses of stored energy over time, no losses occur in the first time step
+        model.add_constraints(
+            f"{self.name}_eq12",
+            [(self._losses, 1), (self._storage.lag(), -self.relative_losses)],
+            "==",
+        )
 
         return model
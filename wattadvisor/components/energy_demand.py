@@ -2,11 +2,16 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
+from typing import ClassVar
+
 import pandas as pd
 from pydantic import Field, field_validator
 
 from .non_investment_component import NonInvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..utils.demand_tools import (
     generate_electrical_demand_profile,
     generate_heat_demand_profile,
@@ -15,6 +20,9 @@ from ..data_models.enums import EnergyUnit, EnergyType
 from ..data_models.weather_data import WeatherDataHeightSpecific
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class EnergyDemand(NonInvestmentComponent):
     """Component which consumes energy of a certain ``EnergyType`` to fulfill an energy demand.
 
@@ -44,6 +52,10 @@ class EnergyDemand(NonInvestmentComponent):
         default=None, exclude=True
     )
 
+    _preprocessing_inputs: ClassVar[dict[str, tuple[str, ...]]] = {
+        "demand_profile": ("demand_sum", "demand_unit", "profile_type", "profile_year", "temperature_air")
+    }
+
     @field_validator("demand_profile")
     @classmethod
     def check_time_series_length(cls, series: pd.Series | None) -> pd.Series | None:
@@ -101,27 +113,37 @@ class EnergyDemand(NonInvestmentComponent):
                 )
 
             elif self.energy_type in [EnergyType.ELECTRICAL, EnergyType.COOLING]:
-                self.demand_profile = generate_electrical_demand_profile(
-                    self.demand_sum * self.demand_unit.get_conversion_factor(),
-                    self.profile_type,
-                    self.profile_year,
-                )
+                with self._timed_preprocessing():
+                    self.demand_profile = generate_electrical_demand_profile(
+                        self.demand_sum * self.demand_unit.get_conversion_factor(),
+                        self.profile_type,
+                        self.profile_year,
+                    )
 
             elif self.energy_type in [EnergyType.THERMAL, EnergyType.NATURAL_GAS]:
-                self.demand_profile = generate_heat_demand_profile(
-                    self.demand_sum * self.demand_unit.get_conversion_factor(),
-                    self.profile_type,
-                    self.profile_year,
-                    self.temperature_air.series[0],
-                )
+                with self._timed_preprocessing():
+                    self.demand_profile = generate_heat_demand_profile(
+                        self.demand_sum * self.demand_unit.get_conversion_factor(),
+                        self.profile_type,
+                        self.profile_year,
+                        self.temperature_air.series[0],
+                    )
 
     def _load_params(self, model: pyoe.Model, t: pyoe.RangeSet) -> pyoe.Model:
 
-        self._input = pyoe.Param(
-            t, initialize=self.demand_profile.set_axis(t).to_dict()
-        )
+        self._input = self._time_series_param(self.demand_profile, t)
         model.add_component(f"{self.name}_input", self._input)
 
         self.bilance_variables.input[self.energy_type] = self._input
 
         return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        self._input = model.add_parameter(
+            f"{self.name}_input", self.demand_profile.to_numpy(dtype=float)
+        )
+
+        self.bilance_variables.input[self.energy_type] = self._input
+
+        return model
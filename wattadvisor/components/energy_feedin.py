@@ -2,13 +2,19 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
-from pyomo.core.util import sum_product
+from __future__ import annotations
+
+import numpy as np
 import pandas as pd
 from pydantic import Field, field_validator
 
 import wattadvisor.data_models.enums as enums
 from .non_investment_component import NonInvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
+
+
+pyoe = lazy_import("pyomo.environ")
 
 
 class EnergyFeedin(NonInvestmentComponent):
@@ -70,14 +76,17 @@ class EnergyFeedin(NonInvestmentComponent):
         """
 
         if self.energy_price_profile is None:
-            self._energy_price_dict = {tx: self.energy_price_scalar for tx in t}
+            # a scalar price stays a single parameter instead of being repeated for every time step
+            self._energy_price = pyoe.Param(initialize=self.energy_price_scalar)
+            model.add_component(f"{self.name}_energy_price", self._energy_price)
         else:
-            self._energy_price_dict = self.energy_price_profile.set_axis(t).to_dict()
+            self._energy_price_profile = self._time_series_param(self.energy_price_profile, t)
+            model.add_component(
+                f"{self.name}_energy_price_profile", self._energy_price_profile
+            )
 
-        self._energy_price_profile = pyoe.Param(t, initialize=self._energy_price_dict)
-        model.add_component(
-            f"{self.name}_energy_price_profile", self._energy_price_profile
-        )
+        if self._aggregation is not None:
+            model = self._load_time_weights(model, t)
 
         return model
 
@@ -105,10 +114,61 @@ class EnergyFeedin(NonInvestmentComponent):
         self._eq01 = pyoe.Constraint(expr=self._annuity == self._feedin_income)
         model.add_component("{}_eq01".format(self.name), self._eq01)
 
+        if self.energy_price_profile is None:
+            energy_income = self._energy_price * self._weighted_sum(self._input, t)
+        else:
+            energy_income = self._weighted_sum(self._input, t, self._energy_price_profile)
+
         self._eq02 = pyoe.Constraint(
-            expr=self._feedin_income
-            == -1 * sum_product(self._input, self._energy_price_profile, index=t)
+            expr=self._feedin_income == -1 * energy_income
         )
         model.add_component("{}_eq02".format(self.name), self._eq02)
 
         return model
+
+    def _energy_prices(self) -> np.ndarray | float:
+        """Returns the energy price as an array of hourly prices, if a price profile is given,
+        or as the scalar price otherwise.
+
+        Returns
+        -------
+        np.ndarray | float
+            Energy prices [€/kWh]
+        """
+
+        if self.energy_price_profile is None:
+            return self.energy_price_scalar
+
+        return self.energy_price_profile.to_numpy(dtype=float)
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Input) electricity to grid [kWh]
+        self._input = model.add_variable(
+            f"{self.name}_input", indexed=True, bounds=(0.0, None)
+        )
+
+        # calculated cost [€], without regard to the optimization criteria, cost<0 --> profit
+        self._feedin_income = model.add_variable(f"{self.name}_feedin_income")
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity")
+
+        self.bilance_variables.input[self.energy_type] = self._input
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating the total cost by applying the price to the imported electricity
+        model.add_constraint(
+            f"{self.name}_eq01", [(self._annuity, 1), (self._feedin_income, -1)], "=="
+        )
+
+        model.add_constraint(
+            f"{self.name}_eq02",
+            [(self._feedin_income, 1), (self._input, self._energy_prices())],
+            "==",
+        )
+
+        return model
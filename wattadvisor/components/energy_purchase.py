@@ -2,15 +2,21 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
-from pyomo.core.util import sum_product
+from __future__ import annotations
+
+import numpy as np
 import pandas as pd
 from pydantic import Field, field_validator
 
 from .non_investment_component import NonInvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 import wattadvisor.data_models.enums as enums
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class EnergyPurchase(NonInvestmentComponent):
     """Component that simulates the import and obtaining of energy from external sources 
         in different forms like gas, oil, electricity or heat.
@@ -49,16 +55,19 @@ class EnergyPurchase(NonInvestmentComponent):
         return value
 
     def _load_params(self, model: pyoe.Model, t: pyoe.RangeSet) -> pyoe.Model:
-        if self.energy_price_profile is None:
-            self._energy_price_dict = {tx: self.energy_price_scalar for tx in t}
-        else:
-            self._energy_price_dict = self.energy_price_profile.set_axis(t).to_dict()
-
         self._power_price = pyoe.Param(initialize=self.power_price)
         model.add_component(f'{self.name}_power_price', self._power_price)
 
-        self._energy_price_profile = pyoe.Param(t, initialize=self._energy_price_dict)
-        model.add_component(f'{self.name}_energy_price_profile', self._energy_price_profile)
+        if self.energy_price_profile is None:
+            # a scalar price stays a single parameter instead of being repeated for every time step
+            self._energy_price = pyoe.Param(initialize=self.energy_price_scalar)
+            model.add_component(f'{self.name}_energy_price', self._energy_price)
+        else:
+            self._energy_price_profile = self._time_series_param(self.energy_price_profile, t)
+            model.add_component(f'{self.name}_energy_price_profile', self._energy_price_profile)
+
+        if self._aggregation is not None:
+            model = self._load_time_weights(model, t)
 
         return model
 
@@ -94,18 +103,89 @@ class EnergyPurchase(NonInvestmentComponent):
         self._eq01=pyoe.Constraint(expr=self._annuity == self._purchase_cost)
         model.add_component('{}_eq01'.format(self.name),self._eq01)
 
-        self._eq02=pyoe.Constraint(expr=self._purchase_cost == sum_product(self._output, self._energy_price_profile, index=t) + self._max_power * self._power_price)
+        if self.energy_price_profile is None:
+            energy_cost = self._energy_price * self._weighted_sum(self._output, t)
+        else:
+            energy_cost = self._weighted_sum(self._output, t, self._energy_price_profile)
+
+        self._eq02=pyoe.Constraint(expr=self._purchase_cost == energy_cost + self._max_power * self._power_price)
         model.add_component('{}_eq02'.format(self.name), self._eq02)
         
-        self._eq03=pyoe.ConstraintList()
+        self._eq03=pyoe.Constraint(t, rule=lambda model, tx: self._co2_emissions[tx] == self._output[tx] * self.co2_intensity)
         model.add_component('{}_eq03'.format(self.name), self._eq03)
-        for tx in t:
-            self._eq03.add(self._co2_emissions[tx] == self._output[tx] * self.co2_intensity)
 
         # calculate peak power
-        self._eq04=pyoe.ConstraintList()
+        self._eq04=pyoe.Constraint(t, rule=lambda model, tx: self._output[tx] <= self._max_power)
         model.add_component('{}_eq04'.format(self.name), self._eq04)
-        for tx in t:
-            self._eq04.add(self._output[tx] <= self._max_power)
 
-        return model
\ No newline at end of file
+        return model
+
+    def _energy_prices(self) -> np.ndarray | float:
+        """Returns the energy price as an array of hourly prices, if a price profile is given,
+        or as the scalar price otherwise.
+
+        Returns
+        -------
+        np.ndarray | float
+            Energy prices [€/kWh]
+        """
+
+        if self.energy_price_profile is None:
+            return self.energy_price_scalar
+
+        return self.energy_price_profile.to_numpy(dtype=float)
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) obtained electrical energy [kW]
+        self._output = model.add_variable(
+            f"{self.name}_output", indexed=True, bounds=(0.0, None)
+        )
+
+        # peak power [kW] purchased
+        self._max_power = model.add_variable(f"{self.name}_max_power", bounds=(0.0, None))
+
+        # calculated cost [€], without regard to the optimization criteria
+        self._purchase_cost = model.add_variable(f"{self.name}_purchase_cost")
+
+        # calculated amount of co2 emissions [grams]
+        self._co2_emissions = model.add_variable(
+            f"{self.name}_co2_emissions", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity")
+
+        self.bilance_variables.output[self.energy_type] = self._output
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating the total cost by applying the price to the imported electricity
+        model.add_constraint(
+            f"{self.name}_eq01", [(self._annuity, 1), (self._purchase_cost, -1)], "=="
+        )
+
+        model.add_constraint(
+            f"{self.name}_eq02",
+            [
+                (self._purchase_cost, 1),
+                (self._output, -self._energy_prices()),
+                (self._max_power, -self.power_price),
+            ],
+            "==",
+        )
+
+        model.add_constraints(
+            f"{self.name}_eq03",
+            [(self._co2_emissions, 1), (self._output, -self.co2_intensity)],
+            "==",
+        )
+
+        # calculate peak power
+        model.add_constraints(
+            f"{self.name}_eq04", [(self._output, 1), (self._max_power, -1)], "<="
+        )
+
+        return model
@@ -2,11 +2,17 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
+from typing import ClassVar
+
+import numpy as np
 import pandas as pd
 from pydantic import Field
 
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..utils.calc_cops import calc_cops
 from ..data_models.enums import EnergyType
 from ..data_models.weather_data import (
@@ -15,6 +21,9 @@ from ..data_models.weather_data import (
 )
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class HeatPump(InvestmentComponent):
     """Component that uses electrical energy and a low temperature heat source to generate higher temperature heat.
 
@@ -54,6 +63,10 @@ class HeatPump(InvestmentComponent):
         WeatherDataHeightUnspecific | WeatherDataHeightSpecific | None
     ) = Field(default=None, exclude=True)
 
+    _preprocessing_inputs: ClassVar[dict[str, tuple[str, ...]]] = {
+        "cop_series": ("supply_temperature_heat", "quality_grade", "source_temperature_series")
+    }
+
     def __init__(self, **data):
         super().__init__(**data)
 
@@ -67,26 +80,25 @@ class HeatPump(InvestmentComponent):
             if isinstance(self.source_temperature_series, WeatherDataHeightSpecific):
                 source_temperature_series = self.source_temperature_series.series[
                     0
-                ].to_list()
+                ].to_numpy()
 
             if isinstance(self.source_temperature_series, WeatherDataHeightUnspecific):
                 source_temperature_series = (
-                    self.source_temperature_series.series.to_list()
+                    self.source_temperature_series.series.to_numpy()
                 )
 
             if self.cop_series is None:
-                self.cop_series = calc_cops(
-                    temp_high=[self.supply_temperature_heat],
-                    temp_low=source_temperature_series,
-                    quality_grade=self.quality_grade,
-                    mode="heat_pump",
-                )
+                with self._timed_preprocessing():
+                    self.cop_series = calc_cops(
+                        temp_high=[self.supply_temperature_heat],
+                        temp_low=source_temperature_series,
+                        quality_grade=self.quality_grade,
+                        mode="heat_pump",
+                    ).tolist()
 
     def _load_params(self, model: pyoe.Model, t: pyoe.RangeSet) -> pyoe.Model:
 
-        self._cop_heating = pyoe.Param(
-            t, initialize={tx: self.cop_series[tx - 1] for tx in t}
-        )
+        self._cop_heating = self._time_series_param(self.cop_series, t)
         model.add_component(f"{self.name}_cop_heating", self._cop_heating)
 
         return model
@@ -140,19 +152,18 @@ class HeatPump(InvestmentComponent):
         model.add_component("{}_eq01".format(self.name), self._eq01)
 
         # calculating the thermal power output from the electrical consumption
-        self._eq02 = pyoe.ConstraintList()
+        self._eq02 = pyoe.Constraint(
+            t,
+            rule=lambda model, tx: self._output_thermal[tx]
+            == self._cop_heating[tx] * self._input_electrical[tx],
+        )
         model.add_component("{}_eq02".format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(
-                self._output_thermal[tx]
-                == self._cop_heating[tx] * self._input_electrical[tx]
-            )
 
         # setting peak thermal power
-        self._eq03 = pyoe.ConstraintList()
+        self._eq03 = pyoe.Constraint(
+            t, rule=lambda model, tx: self._output_thermal[tx] <= self._advised_power
+        )
         model.add_component("{}_eq03".format(self.name), self._eq03)
-        for tx in t:
-            self._eq03.add(self._output_thermal[tx] <= self._advised_power)
 
         # calculate the annual running cost
         self._eq05 = pyoe.Constraint(
@@ -168,6 +179,88 @@ class HeatPump(InvestmentComponent):
 
         return model
 
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) thermal power [kW]
+        self._output_thermal = model.add_variable(
+            f"{self.name}_output_thermal", indexed=True, bounds=(0.0, None)
+        )
+
+        # (Input) electrical consumption [kW]
+        self._input_electrical = model.add_variable(
+            f"{self.name}_input_electrical", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        # peak thermal power [kWp], necessary to be installed
+        self._advised_power = model.add_variable(
+            f"{self.name}_advised_power",
+            bounds=(self.installed_power, self.potential_power),
+        )
+
+        self.bilance_variables.input[EnergyType.ELECTRICAL] = self._input_electrical
+        self.bilance_variables.output[EnergyType.THERMAL] = self._output_thermal
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, depending on peak thermal power
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating the thermal power output from the electrical consumption
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [
+                (self._output_thermal, 1),
+                (self._input_electrical, -np.asarray(self.cop_series, dtype=float)),
+            ],
+            "==",
+        )
+
+        # setting peak thermal power
+        model.add_constraints(
+            f"{self.name}_eq03",
+            [(self._output_thermal, 1), (self._advised_power, -1)],
+            "<=",
+        )
+
+        # calculate the annual running cost
+        model.add_constraint(
+            f"{self.name}_eq05",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate the one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq06",
+            [(self._investment_cost, 1), (self._advised_power, -self.capex)],
+            "==",
+        )
+
+        return model
+
 
 class HeatPumpAir(HeatPump):
     """Air source heat pump
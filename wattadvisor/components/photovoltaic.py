@@ -2,14 +2,17 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-from typing import Literal
+from __future__ import annotations
+
+from typing import ClassVar, Literal
 
-import pyomo.environ as pyoe
 import pandas as pd
 from pydantic import Field, field_validator
 
 from ..utils.feedin_tools import calculate_pv_feedin
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..data_models.enums import EnergyType
 from ..data_models.weather_data import (
     WeatherDataHeightUnspecific,
@@ -17,6 +20,9 @@ from ..data_models.weather_data import (
 )
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class Photovoltaik(InvestmentComponent):
     """Component to purchase electrical energy via a PPA from a
     Photovoltaic plant that produces electricity from solar radiation.
@@ -106,6 +112,23 @@ class Photovoltaik(InvestmentComponent):
     )
     dni: WeatherDataHeightUnspecific | None = Field(default=None, exclude=True)
 
+    _preprocessing_inputs: ClassVar[dict[str, tuple[str, ...]]] = {
+        "normed_production": (
+            "latitude",
+            "longitude",
+            "azimuth",
+            "tilt",
+            "elevation",
+            "ghi",
+            "dhi",
+            "surface_type",
+            "module_type",
+            "racking_model",
+            "air_temperature",
+            "dni",
+        )
+    }
+
     def __init__(self, **data):
         super().__init__(**data)
 
@@ -121,20 +144,21 @@ class Photovoltaik(InvestmentComponent):
                     "If no normed production profile given, weather data must be given!"
                 )
 
-            self.normed_production = calculate_pv_feedin(
-                ghi=self.ghi,
-                dhi=self.dhi,
-                latitude=self.latitude,
-                longitude=self.longitude,
-                azimuth=self.azimuth,
-                tilt=self.tilt,
-                surface_type=self.surface_type,
-                elevation=self.elevation,
-                module_type=self.module_type,
-                racking_model=self.racking_model,
-                dni=self.dni,
-                air_temperature=self.air_temperature,
-            )
+            with self._timed_preprocessing():
+                self.normed_production = calculate_pv_feedin(
+                    ghi=self.ghi,
+                    dhi=self.dhi,
+                    latitude=self.latitude,
+                    longitude=self.longitude,
+                    azimuth=self.azimuth,
+                    tilt=self.tilt,
+                    surface_type=self.surface_type,
+                    elevation=self.elevation,
+                    module_type=self.module_type,
+                    racking_model=self.racking_model,
+                    dni=self.dni,
+                    air_temperature=self.air_temperature,
+                )
 
     @field_validator("normed_production")
     @classmethod
@@ -146,9 +170,7 @@ class Photovoltaik(InvestmentComponent):
 
     def _load_params(self, model: pyoe.Model, t: pyoe.RangeSet) -> pyoe.Model:
 
-        self._normed_production = pyoe.Param(
-            t, initialize=self.normed_production.clip(0).set_axis(t).to_dict()
-        )
+        self._normed_production = self._time_series_param(self.normed_production.clip(0), t)
         model.add_component(f"{self.name}_normed_production", self._normed_production)
 
         return model
@@ -197,13 +219,12 @@ class Photovoltaik(InvestmentComponent):
         model.add_component("{}_eq01".format(self.name), self._eq01)
 
         # calculating electrical output by applying the peak power to the standard profile
-        self._eq02 = pyoe.ConstraintList()
+        self._eq02 = pyoe.Constraint(
+            t,
+            rule=lambda model, tx: self._output_electrical[tx]
+            == self._advised_power * self._normed_production[tx],
+        )
         model.add_component("{}_eq02".format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(
-                self._output_electrical[tx]
-                == self._advised_power * self._normed_production[tx]
-            )
 
         # calculate the annual running cost
         self._eq04 = pyoe.Constraint(
@@ -219,6 +240,75 @@ class Photovoltaik(InvestmentComponent):
 
         return model
 
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) electrical power [kW]
+        self._output_electrical = model.add_variable(
+            f"{self.name}_output_electrical", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        # peak power [kWp], that needs to be installed
+        self._advised_power = model.add_variable(
+            f"{self.name}_advised_power",
+            bounds=(self.installed_power, self.potential_power),
+        )
+
+        self.bilance_variables.output[EnergyType.ELECTRICAL] = self._output_electrical
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, costs depending on peak power and eventually co2 emissions
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating electrical output by applying the peak power to the standard profile
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [
+                (self._output_electrical, 1),
+                (self._advised_power, -self.normed_production.clip(0).to_numpy(dtype=float)),
+            ],
+            "==",
+        )
+
+        # calculate the annual running cost
+        model.add_constraint(
+            f"{self.name}_eq04",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate the one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq05",
+            [(self._investment_cost, 1), (self._advised_power, -self.capex)],
+            "==",
+        )
+
+        return model
+
 
 class PhotovoltaikRoof(Photovoltaik):
     pass
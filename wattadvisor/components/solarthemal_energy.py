@@ -2,15 +2,23 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
+from typing import ClassVar
+
 import pandas as pd
 from pydantic import Field, field_validator
 
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..data_models.enums import EnergyType
 from ..data_models.weather_data import WeatherDataHeightUnspecific
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class SolarthermalEnergy(InvestmentComponent):
     """Component to generate thermal energy from solar energy.
 
@@ -44,6 +52,8 @@ class SolarthermalEnergy(InvestmentComponent):
     normed_production: pd.Series | None = Field(default=None, exclude=True)
     eff: float | None = Field(ge=0, default=None)
 
+    _preprocessing_inputs: ClassVar[dict[str, tuple[str, ...]]] = {"normed_production": ("ghi", "eff")}
+
     def __init__(self, **data):
         super().__init__(**data)
         
@@ -55,7 +65,8 @@ class SolarthermalEnergy(InvestmentComponent):
             if self.eff is None:
                 raise ValueError("If no normed production profile given, plant efficiency must be given!")        
 
-            self.normed_production = self.ghi.series / 1000 * self.eff
+            with self._timed_preprocessing():
+                self.normed_production = self.ghi.series / 1000 * self.eff
 
     @field_validator('normed_production')
     @classmethod
@@ -66,7 +77,7 @@ class SolarthermalEnergy(InvestmentComponent):
         return value
 
     def _load_params(self, model: pyoe.Model, t: pyoe.RangeSet) -> pyoe.Model:
-        self._normed_production = pyoe.Param(t, initialize=self.normed_production.set_axis(t).to_dict())
+        self._normed_production = self._time_series_param(self.normed_production, t)
         model.add_component(f'{self.name}_normed_production', self._normed_production)
 
         return model
@@ -104,10 +115,8 @@ class SolarthermalEnergy(InvestmentComponent):
         model.add_component('{}_eq01'.format(self.name), self._eq01)
 
         # calculating thermal output by applying the peak power to the standard profile
-        self._eq02=pyoe.ConstraintList()
+        self._eq02=pyoe.Constraint(t, rule=lambda model, tx: self._output_thermal[tx] == self._advised_area * self.eff * self._normed_production[tx])
         model.add_component('{}_eq02'.format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(self._output_thermal[tx] == self._advised_area * self.eff * self._normed_production[tx])
 
         #calculate the annual running cost
         self._eq04=pyoe.Constraint(expr=self._operational_cost == self._investment_cost * self.opex/100)
@@ -117,4 +126,73 @@ class SolarthermalEnergy(InvestmentComponent):
         self._eq05=pyoe.Constraint(expr=self._investment_cost == self._advised_area * self.capex)
         model.add_component('{}_eq05'.format(self.name), self._eq05)
 
-        return model
\ No newline at end of file
+        return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) thermal power in kWh
+        self._output_thermal = model.add_variable(
+            f"{self.name}_output_thermal", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        # collector size [m²] that has to be installed at maximum
+        self._advised_area = model.add_variable(
+            f"{self.name}_advised_area",
+            bounds=(self.installed_area, self.potential_area),
+        )
+
+        self.bilance_variables.output[EnergyType.THERMAL] = self._output_thermal
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, costs depending on peak power and eventually co2 emissions
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating thermal output by applying the peak power to the standard profile
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [
+                (self._output_thermal, 1),
+                (self._advised_area, -self.eff * self.normed_production.to_numpy(dtype=float)),
+            ],
+            "==",
+        )
+
+        # calculate the annual running cost
+        model.add_constraint(
+            f"{self.name}_eq04",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate the one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq05",
+            [(self._investment_cost, 1), (self._advised_area, -self.capex)],
+            "==",
+        )
+
+        return model
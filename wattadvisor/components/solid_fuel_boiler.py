@@ -2,13 +2,19 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
 from pydantic import Field
 
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..data_models.enums import EnergyType
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class SolidFuelBoiler(InvestmentComponent):
     """Component to turn an energy carrying medium like gas into thermal power.
 
@@ -70,16 +76,12 @@ class SolidFuelBoiler(InvestmentComponent):
         model.add_component('{}_eq01'.format(self.name), self._eq01)
 
         # calculating thermal power, by applying efficiency to gas input
-        self._eq02=pyoe.ConstraintList()
+        self._eq02=pyoe.Constraint(t, rule=lambda model, tx: self._input_solid_fuel[tx] * self.eff == self._output_thermal[tx])
         model.add_component('{}_eq02'.format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(self._input_solid_fuel[tx] * self.eff == self._output_thermal[tx])
 
         # setting peak power
-        self._eq03=pyoe.ConstraintList()
+        self._eq03=pyoe.Constraint(t, rule=lambda model, tx: self._output_thermal[tx] <= self._advised_power)
         model.add_component('{}_eq03'.format(self.name), self._eq03)
-        for tx in t:
-            self._eq03.add(self._output_thermal[tx] <= self._advised_power)
 
         #calculate the annual running cost
         self._eq04=pyoe.Constraint(expr=self._operational_cost == self._investment_cost * self.opex/100)
@@ -89,4 +91,83 @@ class SolidFuelBoiler(InvestmentComponent):
         self._eq05=pyoe.Constraint(expr=self._investment_cost == self._advised_power * self.capex)
         model.add_component('{}_eq05'.format(self.name), self._eq05)
 
-        return model
\ No newline at end of file
+        return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) thermal power [kW]
+        self._output_thermal = model.add_variable(
+            f"{self.name}_output_thermal", indexed=True, bounds=(0.0, None)
+        )
+
+        # (Input) solid fuel consumption [kW]
+        self._input_solid_fuel = model.add_variable(
+            f"{self.name}_input_solid_fuel", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        # peak power [kWp], necessary to install
+        self._advised_power = model.add_variable(
+            f"{self.name}_advised_power",
+            bounds=(self.installed_power, self.potential_power),
+        )
+
+        self.bilance_variables.input[EnergyType.SOLID_FUEL] = self._input_solid_fuel
+        self.bilance_variables.output[EnergyType.THERMAL] = self._output_thermal
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, depending on peak power
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating thermal power, by applying efficiency to solid fuel input
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [(self._input_solid_fuel, self.eff), (self._output_thermal, -1)],
+            "==",
+        )
+
+        # setting peak power
+        model.add_constraints(
+            f"{self.name}_eq03",
+            [(self._output_thermal, 1), (self._advised_power, -1)],
+            "<=",
+        )
+
+        # calculate the annual running cost
+        model.add_constraint(
+            f"{self.name}_eq04",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate the one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq05",
+            [(self._investment_cost, 1), (self._advised_power, -self.capex)],
+            "==",
+        )
+
+        return model
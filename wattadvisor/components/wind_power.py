@@ -2,16 +2,24 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
-import pyomo.environ as pyoe
+from __future__ import annotations
+
+from typing import ClassVar
+
 import pandas as pd
 from pydantic import Field, field_validator
 
 from ..utils.feedin_tools import calculate_windpower_feedin
 from .investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from ..utils.lazy_import import lazy_import
 from ..data_models.enums import EnergyType
 from ..data_models.weather_data import WeatherDataHeightSpecific
 
 
+pyoe = lazy_import("pyomo.environ")
+
+
 class WindPower(InvestmentComponent):
     """Component to generate electrical energy from wind energy.
 
@@ -65,6 +73,19 @@ class WindPower(InvestmentComponent):
     pressure: WeatherDataHeightSpecific | None = Field(default=None, exclude=True)
     density: WeatherDataHeightSpecific | None = Field(default=None, exclude=True)
 
+    _preprocessing_inputs: ClassVar[dict[str, tuple[str, ...]]] = {
+        "normed_production": (
+            "latitude",
+            "longitude",
+            "hub_height",
+            "wind_speed",
+            "roughness_length",
+            "air_temperature",
+            "pressure",
+            "density",
+        )
+    }
+
     def __init__(self, **data):
         super().__init__(**data)
 
@@ -79,16 +100,17 @@ class WindPower(InvestmentComponent):
                     "If no normed production profile given, weather data must be given!"
                 )
 
-            self.normed_production = calculate_windpower_feedin(
-                self.wind_speed,
-                self.roughness_length,
-                self.latitude,
-                self.longitude,
-                self.hub_height,
-                self.air_temperature,
-                self.pressure,
-                self.density,
-            )
+            with self._timed_preprocessing():
+                self.normed_production = calculate_windpower_feedin(
+                    self.wind_speed,
+                    self.roughness_length,
+                    self.latitude,
+                    self.longitude,
+                    self.hub_height,
+                    self.air_temperature,
+                    self.pressure,
+                    self.density,
+                )
 
     @field_validator("normed_production")
     @classmethod
@@ -100,9 +122,7 @@ class WindPower(InvestmentComponent):
 
     def _load_params(self, model: pyoe.Model, t: pyoe.RangeSet) -> pyoe.Model:
 
-        self._normed_production = pyoe.Param(
-            t, initialize=self.normed_production.set_axis(t).to_dict()
-        )
+        self._normed_production = self._time_series_param(self.normed_production, t)
         model.add_component(f"{self.name}_normed_production", self._normed_production)
 
         return model
@@ -151,13 +171,12 @@ class WindPower(InvestmentComponent):
         model.add_component("{}_eq01".format(self.name), self._eq01)
 
         # calculating electrical output by applying the installed power to the standard profile
-        self._eq02 = pyoe.ConstraintList()
+        self._eq02 = pyoe.Constraint(
+            t,
+            rule=lambda model, tx: self._output_electrical[tx]
+            == self._advised_power * self._normed_production[tx],
+        )
         model.add_component("{}_eq02".format(self.name), self._eq02)
-        for tx in t:
-            self._eq02.add(
-                self._output_electrical[tx]
-                == self._advised_power * self._normed_production[tx]
-            )
 
         # calculate the annual running cost
         self._eq04 = pyoe.Constraint(
@@ -172,3 +191,72 @@ class WindPower(InvestmentComponent):
         model.add_component("{}_eq05".format(self.name), self._eq05)
 
         return model
+
+    def _add_sparse_variables(self, model: SparseModel) -> SparseModel:
+
+        # (Output) electrical power [kW]
+        self._output_electrical = model.add_variable(
+            f"{self.name}_output_electrical", indexed=True, bounds=(0.0, None)
+        )
+
+        # total cost, which is evaluated in the target function
+        self._annuity = model.add_variable(f"{self.name}_annuity", bounds=(0.0, None))
+
+        # annual running cost
+        self._operational_cost = model.add_variable(
+            f"{self.name}_operational_cost", bounds=(0.0, None)
+        )
+
+        # one-time installation cost
+        self._investment_cost = model.add_variable(
+            f"{self.name}_investment_cost", bounds=(0.0, None)
+        )
+
+        # peak power [kWp], that needs to be installed
+        self._advised_power = model.add_variable(
+            f"{self.name}_advised_power",
+            bounds=(self.installed_power, self.potential_power),
+        )
+
+        self.bilance_variables.output[EnergyType.ELECTRICAL] = self._output_electrical
+
+        return model
+
+    def _add_sparse_constraints(self, model: SparseModel) -> SparseModel:
+
+        # calculating total cost, costs depending on peak power and eventually co2 emissions
+        model.add_constraint(
+            f"{self.name}_eq01",
+            [
+                (self._annuity, 1),
+                (self._investment_cost, -self.annuity_factor),
+                (self._operational_cost, -1),
+            ],
+            "==",
+        )
+
+        # calculating electrical output by applying the installed power to the standard profile
+        model.add_constraints(
+            f"{self.name}_eq02",
+            [
+                (self._output_electrical, 1),
+                (self._advised_power, -self.normed_production.to_numpy(dtype=float)),
+            ],
+            "==",
+        )
+
+        # calculate the annual running cost
+        model.add_constraint(
+            f"{self.name}_eq04",
+            [(self._operational_cost, 1), (self._investment_cost, -self.opex / 100)],
+            "==",
+        )
+
+        # calculate the one-time installation cost
+        model.add_constraint(
+            f"{self.name}_eq05",
+            [(self._investment_cost, 1), (self._advised_power, -self.capex)],
+            "==",
+        )
+
+        return model
@@ -5,24 +5,26 @@ Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reser
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
+from typing import Any
+
 from pydantic import Field, field_serializer
 
 from ..data_models.enums import EnergyType
 from ..data_models.base_model import BaseModelCustom
-from pyomo.core.base import indexed_component
 
 
 class BilanceVariables(BaseModelCustom):
-
-    input: dict[EnergyType, indexed_component.IndexedComponent] = Field(
+    # values are indexed pyomo variables or parameters or `SparseVariable` objects of a sparse model,
+    # not typed by their classes so that pyomo is only imported when a pyomo model is built
+    input: dict[EnergyType, Any] = Field(
         default_factory=dict
     )
-    output: dict[EnergyType, indexed_component.IndexedComponent] = Field(
+    output: dict[EnergyType, Any] = Field(
         default_factory=dict
     )
 
     @field_serializer("input", "output")
     def _serialize(
-        self, value: dict[EnergyType, indexed_component.IndexedComponent]
+        self, value: dict[EnergyType, Any]
     ) -> dict[EnergyType, str]:
         return {key: x.name for key, x in value.items()}
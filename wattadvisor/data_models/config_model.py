@@ -9,7 +9,7 @@ from pathlib import Path
 
 from pydantic import BaseModel, Field, field_validator
 
-from .enums import SupportedSolver, WeatherDataSource
+from .enums import SupportedSolver, WeatherDataSource, ModelBackend
 
 
 class ConfigModelWeatherDataPathCsv(BaseModel):
@@ -53,6 +53,7 @@ class ConfigModelSolver(BaseModel):
     use_solver: SupportedSolver
     timeout: int
     executable_path: str | None
+    backend: ModelBackend = ModelBackend.PYOMO
 
 
 class ConfigModel(BaseModel):
@@ -88,6 +88,23 @@ class SupportedSolver(enum.Enum):
     HIGHS = "highs"
     GUROBI = "gurobi"
 
+class ModelBackend(enum.Enum):
+    """Supported backends to build and solve the optimization model
+
+    """
+
+    PYOMO = "pyomo"
+    SPARSE = "sparse"
+
+class DetailedResultsFormat(enum.Enum):
+    """Supported file formats to export detailed results with time series to
+
+    """
+
+    EXCEL = "xlsx"
+    CSV = "csv"
+    PARQUET = "parquet"
+
 class WeatherDataType(enum.Enum):
     air_temperature_2meters = "AIR_TEMPERATURE_2METERS"
     soil_temperature_level4 = "SOIL_TEMPERATURE_LEVEL4"
@@ -0,0 +1,20 @@
+"""Contains the definition of a pydantic model
+representing the status of a job of the optimization service.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from datetime import datetime
+
+from pydantic import Field
+
+from ..data_models.base_model import BaseModelCustom
+from .enums import OptimizationStatus
+
+
+class OptimizationJobStatus(BaseModelCustom):
+    job_id: str
+    status: OptimizationStatus
+    error_message: None | str = Field(default=None)
+    submitted: datetime
@@ -0,0 +1,30 @@
+"""Contains the definition of pydantic models
+representing an optimization request submitted to the optimization service.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from pydantic import ConfigDict, Field
+
+from ..data_models.base_model import BaseModelCustom
+from .enums import ModelBackend, SupportedSolver
+
+
+class OptimizationRequestOptions(BaseModelCustom):
+    model_config = ConfigDict(extra="forbid")
+
+    use_solver: SupportedSolver = SupportedSolver.HIGHS
+    backend: ModelBackend = ModelBackend.PYOMO
+    n_typical_periods: int | None = Field(gt=0, default=None)
+    typical_period_length: int = Field(gt=0, default=24)
+    validate_time_aggregation: bool = False
+    model_statistics: bool = False
+    warm_start: bool = False
+
+
+class OptimizationRequest(BaseModelCustom):
+    model_config = ConfigDict(extra="forbid")
+
+    components: list[dict] = Field(min_length=1)
+    options: OptimizationRequestOptions = Field(default_factory=OptimizationRequestOptions)
@@ -9,9 +9,13 @@ from pydantic import Field
 from ..data_models.base_model import BaseModelCustom
 from .optimization_results_status import OptimizationResultsStatus
 from .optimization_results_scenario import OptimizationResultsScenario
+from .optimization_results_time_aggregation import OptimizationResultsTimeAggregation
+from .optimization_results_performance import OptimizationResultsPerformance
 
 
 class OptimizationResults(BaseModelCustom):
     status: OptimizationResultsStatus
     current_scenario: None | OptimizationResultsScenario = Field(default=None)
-    target_scenario: None | OptimizationResultsScenario = Field(default=None)
\ No newline at end of file
+    target_scenario: None | OptimizationResultsScenario = Field(default=None)
+    time_aggregation: None | OptimizationResultsTimeAggregation = Field(default=None)
+    performance: None | OptimizationResultsPerformance = Field(default=None)
@@ -0,0 +1,31 @@
+"""Contains the definition of pydantic models
+representing the time spent in the phases of an optimization and the size of the optimization model.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from pydantic import Field
+
+from ..data_models.base_model import BaseModelCustom
+
+
+class OptimizationResultsPhaseTiming(BaseModelCustom):
+    name: str
+    wall_time: float
+    cpu_time: float
+
+
+class OptimizationResultsModelSize(BaseModelCustom):
+    n_variables: int
+    n_constraints: int
+    n_nonzeros: int
+
+
+class OptimizationResultsModelStatistics(OptimizationResultsModelSize):
+    components: dict[str, OptimizationResultsModelSize]
+
+
+class OptimizationResultsPerformance(BaseModelCustom):
+    phases: list[OptimizationResultsPhaseTiming] = Field(default_factory=list)
+    model_statistics: None | OptimizationResultsModelStatistics = Field(default=None)
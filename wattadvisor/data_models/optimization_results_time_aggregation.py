@@ -0,0 +1,24 @@
+"""Contains the definition of a pydantic model
+representing the time aggregation an optimization was performed with.
+The profile errors describe how well the aggregated input time series reproduce the full resolution time series.
+If the time aggregation was validated, the objective of the aggregated model is compared to the objective
+of the full resolution model with the advised sizes of the aggregated model fixed.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from pydantic import Field
+
+from ..data_models.base_model import BaseModelCustom
+
+
+class OptimizationResultsTimeAggregation(BaseModelCustom):
+    n_periods: int
+    period_length: int
+    n_time_steps: int
+    max_profile_error: float
+    profile_errors: dict[str, float]
+    objective: None | float = Field(default=None)
+    validation_objective: None | float = Field(default=None)
+    objective_error: None | float = Field(default=None)
@@ -7,6 +7,7 @@ Use of this source code is governed by a BSD-style license that can be found in
 
 from pydantic import Field, field_validator
 from enum import Enum
+import numpy as np
 import pandas as pd
 from ..data_models.enums import WeatherDataSource
 from .base_model import BaseModelCustom
@@ -39,6 +40,50 @@ class WeatherDataHeightUnspecific(BaseModelCustom):
 
         return value
 
+    @classmethod
+    def from_array(
+        cls,
+        values: np.ndarray,
+        index: pd.DatetimeIndex,
+        source: WeatherDataSource,
+        type: WeatherDataType,
+        name: str | int | None = None,
+        dtype: np.dtype | None = np.float32,
+    ) -> "WeatherDataHeightUnspecific":
+        """Creates weather data whose series is backed by `values` without copying them,
+        so that e.g. a memory-mapped array or an index shared with other weather data can be used.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values of every time step
+        index : pd.DatetimeIndex
+            Time index of the values
+        source : WeatherDataSource
+            Source of the weather data
+        type : WeatherDataType
+            Type of the weather data
+        name : str | int | None, optional
+            Name of the series, by default None
+        dtype : np.dtype | None, optional
+            Data type the values are converted to (which copies them if they are of another type),
+            by default np.float32. If None, the data type of `values` is kept.
+
+        Returns
+        -------
+        WeatherDataHeightUnspecific
+            Weather data backed by `values`
+        """
+
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+
+        return cls(
+            series=pd.Series(values, index=index, name=name, copy=False),
+            source=source,
+            type=type,
+        )
+
 
 class WeatherDataHeightSpecific(BaseModelCustom):
 
@@ -56,6 +101,62 @@ class WeatherDataHeightSpecific(BaseModelCustom):
 
         return value
 
+    @classmethod
+    def from_array(
+        cls,
+        values: np.ndarray,
+        index: pd.DatetimeIndex,
+        source: WeatherDataSource,
+        height_measured_at: list[float],
+        type: WeatherDataType,
+        names: list[str | int | None] | None = None,
+        dtype: np.dtype | None = np.float32,
+    ) -> "WeatherDataHeightSpecific":
+        """Creates weather data whose series are backed by the rows of the matrix `values` without copying them,
+        so that e.g. a memory-mapped array or an index shared with other weather data can be used.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Matrix of shape (heights, time steps) with the values of every height in one row
+        index : pd.DatetimeIndex
+            Time index of the values
+        source : WeatherDataSource
+            Source of the weather data
+        height_measured_at : list[float]
+            Height of every row of `values`
+        type : WeatherDataType
+            Type of the weather data
+        names : list[str | int | None] | None, optional
+            Name of the series of every height, by default None
+        dtype : np.dtype | None, optional
+            Data type the values are converted to (which copies them if they are of another type),
+            by default np.float32. If None, the data type of `values` is kept.
+
+        Returns
+        -------
+        WeatherDataHeightSpecific
+            Weather data backed by `values`
+        """
+
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+
+        values = np.ascontiguousarray(values)
+
+        if names is None:
+            names = [None] * len(values)
+
+        return cls(
+            series=[
+                pd.Series(row, index=index, name=name, copy=False)
+                for row, name in zip(values, names)
+            ],
+            source=source,
+            height_measured_at=height_measured_at,
+            type=type,
+        )
+
     def __init__(self, **data):
         super().__init__(**data)
 
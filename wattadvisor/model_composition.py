@@ -2,22 +2,64 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING, Callable
 
-import pyomo.environ as pyoe
-from pyomo.core.base.PyomoModel import Model
-from pyomo.core.base.set import RangeSet
-from pyomo.core.util import quicksum
+import numpy as np
 
 import wattadvisor.data_models.enums as enums
 
 from .components.component import Component
+from .sparse_model import SparseModel, SparseParameter
+from .utils.build_profiler import build_phase
+from .utils.lazy_import import lazy_import
+from .utils.time_aggregation import TimeAggregation
+
+if TYPE_CHECKING:
+    from pyomo.core.base.PyomoModel import Model
+    from pyomo.core.base.set import RangeSet
 
+pyoe = lazy_import("pyomo.environ")
 logger = logging.getLogger()
 
+def _balance_rule(energy_type: enums.EnergyType,
+                  bilance_vars_output: list,
+                  bilance_vars_input: list) -> Callable:
+    """Creates the rule of the time-indexed bilance constraint of one energy type.
+    The electrical bilance has to be met exactly, all other energy types may be overproduced.
+
+    Parameters
+    ----------
+    energy_type : enums.EnergyType
+        Energy type the bilance constraint is built for
+    bilance_vars_output : list
+        Bilance variables or parameters of all components putting out energy of `energy_type`
+    bilance_vars_input : list
+        Bilance variables or parameters of all components consuming energy of `energy_type`
+
+    Returns
+    -------
+    Callable
+        Rule returning the bilance equation for a single time step
+    """
+
+    def rule(model: Model, tx: int):
+        production = pyoe.quicksum(var[tx] for var in bilance_vars_output)
+        consumption = pyoe.quicksum(var[tx] for var in bilance_vars_input)
+
+        if energy_type == enums.EnergyType.ELECTRICAL:
+            return production == consumption
+
+        return production >= consumption
+
+    return rule
+
 def compose(input_components: list[Component],
             pyomo_model: Model,
-            t: RangeSet) -> Model:
+            t: RangeSet,
+            time_aggregation: TimeAggregation | None = None) -> Model:
     """Adds all relevant components to the pyomo optimization model `pyomo_model` based on the parameterization of the components in `input_components` and creates the objective.
 
     Parameters
@@ -28,6 +70,8 @@ def compose(input_components: list[Component],
         Pyomo model to add the components and objective to
     t : RangeSet
         Time set to use for variable, parameter and constraint creation
+    time_aggregation : TimeAggregation | None, optional
+        Time aggregation the time set `t` represents, by default None
 
     Returns
     -------
@@ -41,7 +85,7 @@ def compose(input_components: list[Component],
     """
         
     for component in input_components:
-        pyomo_model = component.add_to_model(pyomo_model, t)
+        pyomo_model = component.add_to_model(pyomo_model, t, time_aggregation)
 
     for energy_type in enums.EnergyType:
 
@@ -51,47 +95,98 @@ def compose(input_components: list[Component],
         if len(bilance_vars_input) == 0 and len(bilance_vars_output) == 0:
             continue
 
-        elif len(bilance_vars_output) == 0 and len(bilance_vars_input) > 0:
-            msg = f"Missing production component to build bilance constraint for energy type {energy_type}. Restrict consumption component(s)."
-            # neue Constraint einfügen, die festlegt, dass die Werte der Variablen in bilance_vars_input immer 0 sein müssen
-            balance = pyoe.ConstraintList()
-            pyomo_model.add_component(f'balance_{energy_type.value}', balance)
-            try:
-                for tx in t:
-                    balance.add(
-                        quicksum(var[tx] for var in bilance_vars_input) == 0
-                    )
-            except ValueError:
-                raise ValueError(f"Cannot built bilance for energy type {energy_type} due to missing production component(s) to fulfill the given demand.")
+        with build_phase("Balance", f"balance_{energy_type.value}", "add_constraints", pyomo_model):
+            if len(bilance_vars_output) == 0 and len(bilance_vars_input) > 0:
+                msg = f"Missing production component to build bilance constraint for energy type {energy_type}. Restrict consumption component(s)."
+                # neue Constraint einfügen, die festlegt, dass die Werte der Variablen in bilance_vars_input immer 0 sein müssen
+                balance = pyoe.Constraint(t, rule=lambda model, tx: pyoe.quicksum(var[tx] for var in bilance_vars_input) == 0)
+                try:
+                    pyomo_model.add_component(f'balance_{energy_type.value}', balance)
+                except ValueError:
+                    raise ValueError(f"Cannot built bilance for energy type {energy_type} due to missing production component(s) to fulfill the given demand.")
         
-        elif len(bilance_vars_output) > 0 and len(bilance_vars_input) == 0:
-            msg = f"Missing consumption component for energy type {energy_type}. Build empty bilance."
-            # neue Constraint einfügen, die festlegt, dass die Werte der Variablen in bilance_vars_output größer gleich 0 sein können
-            balance = pyoe.ConstraintList()
-            pyomo_model.add_component(f'balance_{energy_type.value}', balance)
-            for tx in t:
-                balance.add(
-                    quicksum(var[tx] for var in bilance_vars_output) >= 0
-                )
-
-        else:
-            balance = pyoe.ConstraintList()
-            pyomo_model.add_component(f'balance_{energy_type.value}', balance)
-            for tx in t:
-                if energy_type == enums.EnergyType.ELECTRICAL:
-                    equation = quicksum(var[tx] for var in bilance_vars_output) == quicksum(var[tx] for var in bilance_vars_input)
-                else:
-                    equation = quicksum(var[tx] for var in bilance_vars_output) >= quicksum(var[tx] for var in bilance_vars_input)
-                
-                balance.add(equation)
-            msg = f"Built bilance constraint for energy type {energy_type}."
+            elif len(bilance_vars_output) > 0 and len(bilance_vars_input) == 0:
+                msg = f"Missing consumption component for energy type {energy_type}. Build empty bilance."
+                # neue Constraint einfügen, die festlegt, dass die Werte der Variablen in bilance_vars_output größer gleich 0 sein können
+                balance = pyoe.Constraint(t, rule=lambda model, tx: pyoe.quicksum(var[tx] for var in bilance_vars_output) >= 0)
+                pyomo_model.add_component(f'balance_{energy_type.value}', balance)
+
+            else:
+                balance = pyoe.Constraint(t, rule=_balance_rule(energy_type, bilance_vars_output, bilance_vars_input))
+                pyomo_model.add_component(f'balance_{energy_type.value}', balance)
+                msg = f"Built bilance constraint for energy type {energy_type}."
         
         logger.info(msg)   
 
     objective_parts = [x._annuity for x in input_components if hasattr(x, '_annuity')]
 
     pyomo_model.add_component("Objective", pyoe.Objective(expr=
-                quicksum(objective_parts),
+                pyoe.quicksum(objective_parts),
                 sense=pyoe.minimize))
 
-    return pyomo_model
\ No newline at end of file
+    return pyomo_model
+
+def compose_sparse(input_components: list[Component],
+                   sparse_model: SparseModel) -> SparseModel:
+    """Adds all relevant components to the sparse optimization model `sparse_model` based on the parameterization of the components in `input_components` and creates the objective.
+    Builds the same bilance constraints as ``compose``, constant time series like demands are moved to the right hand side.
+
+    Parameters
+    ----------
+    input_components : list[Component]
+        List of components that should be added to the optimization model including their parameterization
+    sparse_model : SparseModel
+        Sparse model to add the components and objective to
+
+    Returns
+    -------
+    SparseModel
+        The optimization model with all components added
+
+    Raises
+    ------
+    ValueError
+        If for one energy type a demand but no production component is parameterized, the bilance for this energy type cannot be built
+    """
+
+    for component in input_components:
+        sparse_model = component.add_to_sparse_model(sparse_model)
+
+    for energy_type in enums.EnergyType:
+
+        bilance_vars_input = [x.bilance_variables.input.get(energy_type) for x in input_components if x.has_input(energy_type)]
+        bilance_vars_output = [x.bilance_variables.output.get(energy_type) for x in input_components if x.has_output(energy_type)]
+
+        if len(bilance_vars_input) == 0 and len(bilance_vars_output) == 0:
+            continue
+
+        with build_phase("Balance", f"balance_{energy_type.value}", "add_constraints", sparse_model):
+            terms = [(var, 1) for var in bilance_vars_output if not isinstance(var, SparseParameter)]
+            terms += [(var, -1) for var in bilance_vars_input if not isinstance(var, SparseParameter)]
+
+            rhs = sum((var.values for var in bilance_vars_input if isinstance(var, SparseParameter)), np.zeros(sparse_model.n_time_steps))
+            rhs -= sum((var.values for var in bilance_vars_output if isinstance(var, SparseParameter)), np.zeros(sparse_model.n_time_steps))
+
+            if len(bilance_vars_output) == 0 and len(bilance_vars_input) > 0:
+                msg = f"Missing production component to build bilance constraint for energy type {energy_type}. Restrict consumption component(s)."
+                if len(terms) == 0:
+                    raise ValueError(f"Cannot built bilance for energy type {energy_type} due to missing production component(s) to fulfill the given demand.")
+                sense = "=="
+
+            elif len(bilance_vars_output) > 0 and len(bilance_vars_input) == 0:
+                msg = f"Missing consumption component for energy type {energy_type}. Build empty bilance."
+                sense = ">="
+
+            else:
+                msg = f"Built bilance constraint for energy type {energy_type}."
+                sense = "==" if energy_type == enums.EnergyType.ELECTRICAL else ">="
+
+            sparse_model.add_constraints(f'balance_{energy_type.value}', terms, sense, rhs)
+
+        logger.info(msg)
+
+    objective_parts = [x._annuity for x in input_components if hasattr(x, '_annuity')]
+
+    sparse_model.set_objective([(var, 1) for var in objective_parts])
+
+    return sparse_model
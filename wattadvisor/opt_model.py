@@ -2,31 +2,55 @@
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
+from __future__ import annotations
+
 import logging
-import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import pyomo.environ as pyoe
-from pyomo.opt import SolverFactory, TerminationCondition
+import numpy as np
 
-from .data_models.enums import SupportedSolver, OptimizationStatus
+from .data_models.enums import SupportedSolver, OptimizationStatus, ModelBackend, DetailedResultsFormat
 from .data_models.optimization_results_model import OptimizationResults
-from .model_composition import compose
+from .data_models.optimization_results_scenario import OptimizationResultsScenario
+from .model_composition import compose, compose_sparse
+from .sparse_model import SparseModel
 from .components.component import Component
-from .utils.results_composition import generate_results_object, write_detailed_results
+from .utils.results_composition import (
+    check_detailed_results_format,
+    compose_results_object,
+    fix_current_scenario_variables,
+    generate_results_object,
+    generate_scenario_results,
+    write_detailed_results,
+)
+from .utils.performance import PerformanceRecorder, collect_model_statistics, cpu_time
+from .utils.result_cache import ResultCache
+from .utils.lazy_import import lazy_import
+from .utils.time_aggregation import TimeAggregation
+from .utils.warm_start import WarmStart, WarmStartStore
 
 
-logging.basicConfig(
-    level=logging.INFO,  # at least INFO-Level
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Format with time stamp
-)
+highspy = lazy_import("highspy")
+pyoe = lazy_import("pyomo.environ")
 logger = logging.getLogger()
 
+# the in-process solver interfaces of pyomo redirect the file descriptors of the process while loading
+# and solving a model, so that these calls of models solved concurrently in threads have to be serialized
+_in_process_solver_lock = threading.Lock()
+
 
 class OptModel:
     def __init__(self, input_components: list[Component]):
         """Creates the basic template to calculate an optimization model.
 
+        All state of a model is held by the instance, so several models can be built and solved
+        concurrently in the threads of one process. The components of every model should then be created
+        in their own `ModelScope`, which numbers unnamed components and provides their parameters.
+        Solves of the pyomo backend with HiGHS or gurobipy run one at a time, since pyomo redirects
+        the output of the whole process while solving. Models of the sparse backend are solved concurrently.
+
         Parameters
         ----------
         input_components : list[Component]
@@ -35,8 +59,16 @@ class OptModel:
 
         self.input_components = input_components
         self.pyomo_model = None
+        self.sparse_model = None
+        self.backend = ModelBackend.PYOMO
+        self.solver_threads = None
+        self.time_aggregation = None
         self.t = None
         self.components_list = None
+        self._solver = None
+        self._changed_variables = []
+        self._warm_start = None
+        self.performance = PerformanceRecorder()
 
     def run_calculation(
         self,
@@ -44,20 +76,237 @@ class OptModel:
         export_detailed_results_path: None | Path = None,
         use_solver: SupportedSolver = SupportedSolver.HIGHS,
         solver_executable: str | None = None,
+        backend: ModelBackend = ModelBackend.PYOMO,
+        n_typical_periods: int | None = None,
+        typical_period_length: int = 24,
+        validate_time_aggregation: bool = False,
+        parallel_scenarios: bool = False,
+        export_detailed_results_format: DetailedResultsFormat = DetailedResultsFormat.EXCEL,
+        model_statistics: bool = False,
+        log_performance: bool = False,
+        solver_threads: int | None = None,
+        warm_start: bool = False,
     ) -> OptimizationResults:
         """Starts the calculation of an optimization model including
         building of the pyomo model, solution by calling solver and building result output.
+        If the `utils.result_cache.ResultCache` is configured, successful results are stored and returned
+        for later calculations with identical components and options without building and solving the model.
+        The components of `input_components` are not solved in place in this case.
 
         Parameters
         ----------
         export_detailed_results : bool, optional
-            Whether detailed result time series should be exported to an Excel file, by default False
+            Whether detailed result time series should be exported to a file, by default False
         export_detailed_results_path : None | Path, optional
-            Path of the Excel file to write detailed results with time series to, by default None
+            Path of the file to write detailed results with time series to, by default None
         use_solver : SupportedSolver, optional
             Solver to be used for the optimization, by default SupportedSolver.HIGHS
         solver_executable : str | None, optional
             Path of the solver's executable, by default None
+        backend : ModelBackend, optional
+            Backend used to build the optimization model, by default ModelBackend.PYOMO.
+            ``ModelBackend.SPARSE`` assembles the model directly as a sparse matrix
+            without pyomo expressions and can only be solved with HiGHS.
+        n_typical_periods : int | None, optional
+            If given, the time series of all components are clustered into this number of
+            representative periods and the model is only built over these periods, by default None
+        typical_period_length : int, optional
+            Number of hours of one representative period if `n_typical_periods` is given,
+            by default 24 (typical days)
+        validate_time_aggregation : bool, optional
+            Whether the advised sizes of the aggregated model are validated at full resolution, by default False.
+            After the current scenario, a model over all time steps is solved with the advised sizes
+            of the target scenario fixed, and its objective and the relative error of the objective of the aggregated
+            model are added to the attribute ``time_aggregation`` of the results. Requires `n_typical_periods`
+            and is not supported if `parallel_scenarios` is True. The components of `input_components` hold
+            the solution of the full resolution model afterwards.
+        parallel_scenarios : bool, optional
+            If True, target and current scenario are built and solved concurrently on independent
+            model instances in two worker processes, by default False.
+            The components of `input_components` are not solved in place in this case.
+        export_detailed_results_format : DetailedResultsFormat, optional
+            File format of the exported detailed results, by default DetailedResultsFormat.EXCEL.
+            CSV and Parquet are streamed one time series at a time in a long table (see `write_detailed_results`).
+        model_statistics : bool, optional
+            Whether the number of variables, constraints and nonzeros in total and per component
+            is added to the performance record of the results, by default False.
+            Counting the nonzeros of a pyomo model takes a few seconds.
+        log_performance : bool, optional
+            Whether the wall and CPU time of all phases is logged, by default False.
+            The times are always returned in the attribute ``performance`` of the results.
+        solver_threads : int | None, optional
+            Maximum number of threads the solver may use, by default None (default of the solver).
+            Limits the load if several optimizations run on the same host.
+        warm_start : bool, optional
+            Whether the target scenario is solved starting from the solution of the most similar previously
+            solved model with the same structure (see `utils.warm_start.WarmStartStore`), by default False.
+            HiGHS starts from the simplex basis, Gurobi and CBC from the variable values as MIP start.
+            The solution of the target scenario is stored for later calculations.
+            Is not used if `parallel_scenarios` is True.
+
+        Returns
+        -------
+        OptimizationResults
+            Results object which is returned by the service as response
+        """
+
+        if backend == ModelBackend.SPARSE and use_solver != SupportedSolver.HIGHS:
+            raise ValueError(f"Model backend {backend} is only supported with solver {SupportedSolver.HIGHS}.")
+
+        if backend == ModelBackend.SPARSE and n_typical_periods is not None:
+            raise ValueError(f"Model backend {backend} does not support time aggregation.")
+
+        if validate_time_aggregation and (n_typical_periods is None or parallel_scenarios):
+            raise ValueError("Validation of the time aggregation requires n_typical_periods and sequential scenarios.")
+
+        if export_detailed_results:
+            check_detailed_results_format(export_detailed_results_format)
+
+        self.backend = backend
+        self.solver_threads = solver_threads
+        self.performance = PerformanceRecorder()
+        self._record_preprocessing()
+
+        # results are only taken from the cache if no detailed results have to be exported
+        cache_key = None
+        if ResultCache.is_enabled() and not export_detailed_results:
+            with self.performance.phase("result_cache"):
+                cache_key = ResultCache.create_key(
+                    self.input_components,
+                    {
+                        "use_solver": use_solver,
+                        "backend": backend,
+                        "n_typical_periods": n_typical_periods,
+                        "typical_period_length": None if n_typical_periods is None else typical_period_length,
+                        "validate_time_aggregation": validate_time_aggregation,
+                    },
+                )
+                cached_results = ResultCache.get(cache_key)
+
+            if cached_results is not None:
+                logger.info("Optimization results loaded from cache")
+                cached_results.performance = self.performance.to_results()
+
+                if log_performance:
+                    self.performance.log()
+
+                return cached_results
+
+        if n_typical_periods is not None:
+            with self.performance.phase("time_aggregation"):
+                self.time_aggregation = TimeAggregation(
+                    self.input_components, n_typical_periods, typical_period_length
+                )
+
+        if parallel_scenarios:
+            results = self._run_scenarios_parallel(
+                export_detailed_results,
+                export_detailed_results_path,
+                export_detailed_results_format,
+                use_solver,
+                solver_executable,
+                model_statistics,
+            )
+
+        else:
+            results = self._run_scenarios_sequential(
+                export_detailed_results,
+                export_detailed_results_path,
+                export_detailed_results_format,
+                use_solver,
+                solver_executable,
+                model_statistics,
+                warm_start,
+                validate_time_aggregation,
+            )
+
+        if cache_key is not None and results.status.status == OptimizationStatus.SUCCESS:
+            with self.performance.phase("result_cache"):
+                ResultCache.put(cache_key, results)
+
+        results.performance = self.performance.to_results()
+
+        if log_performance:
+            self.performance.log()
+
+        return results
+
+    async def run_calculation_async(self, timeout: float | None = None, **kwargs) -> OptimizationResults:
+        """Asynchronous variant of `run_calculation`, which builds and solves the optimization model
+        in a separate worker process, so that the event loop is not blocked while the solver runs.
+        If the awaiting task is cancelled or the timeout is exceeded, the worker process is terminated.
+        Use `optimization_job.OptimizationJob` directly to observe the status of the calculation.
+
+        Parameters
+        ----------
+        timeout : float | None, optional
+            Time in seconds after which the calculation is aborted and an error is returned, by default None
+        **kwargs
+            Keyword arguments of `run_calculation`
+
+        Returns
+        -------
+        OptimizationResults
+            Results object which is returned by the service as response
+        """
+
+        from .optimization_job import OptimizationJob
+
+        return await OptimizationJob(self.input_components, timeout=timeout, **kwargs).run()
+
+    def _record_preprocessing(self) -> None:
+        """Records the time the components spent preprocessing their time series
+        (e.g. feed-in, demand or COP profiles) as phase ``preprocessing``. Components which did not preprocess
+        time series (e.g. given profiles or copies of a parameter sweep) are skipped."""
+
+        preprocessing_times = [
+            component._preprocessing_time
+            for component in self.input_components
+            if getattr(component, "_preprocessing_time", None) is not None
+        ]
+
+        if len(preprocessing_times) > 0:
+            self.performance.add_phase(
+                "preprocessing",
+                sum(wall_time for wall_time, _ in preprocessing_times),
+                sum(cpu_time for _, cpu_time in preprocessing_times),
+            )
+
+    def _run_scenarios_sequential(
+        self,
+        export_detailed_results: bool,
+        export_detailed_results_path: None | Path,
+        export_detailed_results_format: DetailedResultsFormat,
+        use_solver: SupportedSolver,
+        solver_executable: str | None,
+        model_statistics: bool,
+        warm_start: bool = False,
+        validate_time_aggregation: bool = False,
+    ) -> OptimizationResults:
+        """Builds and solves the target scenario and re-solves the same model instance
+        with the advised sizes fixed to the installed sizes for the current scenario.
+        If requested, the advised sizes of the target scenario are validated at full resolution afterwards.
+
+        Parameters
+        ----------
+        export_detailed_results : bool
+            Whether detailed result time series of the target scenario should be exported to a file
+        export_detailed_results_path : None | Path
+            Path of the file to write detailed results with time series to
+        export_detailed_results_format : DetailedResultsFormat
+            File format of the exported detailed results
+        use_solver : SupportedSolver
+            Solver to be used for the optimization
+        solver_executable : str | None
+            Path of the solver's executable
+        model_statistics : bool
+            Whether the size of the model is added to the performance record
+        warm_start : bool, optional
+            Whether the target scenario is solved starting from the solution of the most similar
+            previously solved model, by default False
+        validate_time_aggregation : bool, optional
+            Whether the advised sizes of the aggregated target scenario are validated at full resolution,
+            by default False
 
         Returns
         -------
@@ -66,20 +315,43 @@ class OptModel:
         """
 
         # initialize model
-        self._build()
+        with self.performance.phase("build"):
+            self._build()
+
+        if model_statistics:
+            with self.performance.phase("model_statistics"):
+                self.performance.model_statistics = collect_model_statistics(self.model, self.input_components)
+
+        if warm_start:
+            with self.performance.phase("warm_start"):
+                warm_start_key, warm_start_features = self._warm_start_case(use_solver)
+                self._warm_start = WarmStartStore.get(warm_start_key, warm_start_features)
 
         # Transfer to optimization
-        status, calculation_time = self._optimize(
-            solver=use_solver, solver_executable=solver_executable
-        )
+        with self.performance.phase("solve_target"):
+            status, calculation_time = self._optimize(
+                solver=use_solver, solver_executable=solver_executable
+            )
+
+        if warm_start and status == OptimizationStatus.SUCCESS:
+            with self.performance.phase("warm_start"):
+                WarmStartStore.put(warm_start_key, warm_start_features, self._solution_warm_start(use_solver))
+
+        # the advised sizes are taken before the current scenario fixes them to the installed sizes
+        validation_sizes = None
+        if validate_time_aggregation and status == OptimizationStatus.SUCCESS:
+            validation_sizes = self._advised_sizes()
+            objective = self.pyomo_model.Objective.expr()
 
         if status == OptimizationStatus.SUCCESS and export_detailed_results:
-            write_detailed_results(
-                self.pyomo_model,
-                self.input_components,
-                calculation_time,
-                filename=export_detailed_results_path,
-            )
+            with self.performance.phase("export"):
+                write_detailed_results(
+                    self.model,
+                    self.input_components,
+                    calculation_time,
+                    filename=export_detailed_results_path,
+                    file_format=export_detailed_results_format,
+                )
 
         logger.info("Write optimization results")
         results = generate_results_object(
@@ -92,6 +364,170 @@ class OptModel:
 
         logger.info("Optimization results written")
 
+        if validation_sizes is not None:
+            with self.performance.phase("validate_time_aggregation"):
+                validation_objective = self._validate_time_aggregation(
+                    validation_sizes, use_solver, solver_executable
+                )
+
+            results.time_aggregation.objective = objective
+
+            if validation_objective is not None:
+                results.time_aggregation.validation_objective = validation_objective
+                results.time_aggregation.objective_error = (
+                    (objective - validation_objective) / abs(validation_objective) if validation_objective != 0 else None
+                )
+
+                logger.info(
+                    f"Objective of the aggregated model {objective:.2f}, at full resolution {validation_objective:.2f}"
+                )
+
+        return results
+
+    def _advised_sizes(self) -> dict[str, float]:
+        """Returns the advised power, capacity and area of all components of the solved model.
+
+        Returns
+        -------
+        dict[str, float]
+            Advised sizes by the names of their variables
+        """
+
+        sizes = {}
+        for component in self.input_components:
+            for size in ["power", "capacity", "area"]:
+                value = getattr(component, f"advised_{size}")
+                if value is not None:
+                    sizes[f"{component.name}_advised_{size}"] = value
+
+        return sizes
+
+    def _validate_time_aggregation(
+        self,
+        advised_sizes: dict[str, float],
+        use_solver: SupportedSolver,
+        solver_executable: str | None,
+    ) -> float | None:
+        """Solves the components over all time steps with the advised sizes of the aggregated model fixed,
+        so that only the operation of the components is optimized. The objective of this model is the cost
+        the advised sizes would cause at full resolution, to which the objective of the aggregated model is compared.
+
+        Parameters
+        ----------
+        advised_sizes : dict[str, float]
+            Advised sizes of the aggregated model by the names of their variables
+        use_solver : SupportedSolver
+            Solver to be used for the optimization
+        solver_executable : str | None
+            Path of the solver's executable
+
+        Returns
+        -------
+        float | None
+            Objective of the full resolution model or None if it could not be solved
+        """
+
+        logger.info("Validate time aggregation at full resolution")
+
+        validation_model = OptModel(self.input_components)
+        validation_model.backend = self.backend
+        validation_model.solver_threads = self.solver_threads
+        validation_model._build()
+
+        for name, value in advised_sizes.items():
+            validation_model.fix_variable(name, value)
+
+        try:
+            status, _ = validation_model._optimize(solver=use_solver, solver_executable=solver_executable)
+
+        except RuntimeError:
+            status = OptimizationStatus.ERROR
+
+        if status != OptimizationStatus.SUCCESS:
+            logger.warning("Could not validate time aggregation. The advised sizes cannot fulfil the demands at full resolution.")
+            return None
+
+        return validation_model.pyomo_model.Objective.expr()
+
+    def _run_scenarios_parallel(
+        self,
+        export_detailed_results: bool,
+        export_detailed_results_path: None | Path,
+        export_detailed_results_format: DetailedResultsFormat,
+        use_solver: SupportedSolver,
+        solver_executable: str | None,
+        model_statistics: bool,
+    ) -> OptimizationResults:
+        """Builds and solves the target and the current scenario concurrently in two worker processes,
+        each on its own model instance, and merges both into the results object.
+
+        Parameters
+        ----------
+        export_detailed_results : bool
+            Whether detailed result time series of the target scenario should be exported to a file
+        export_detailed_results_path : None | Path
+            Path of the file to write detailed results with time series to
+        export_detailed_results_format : DetailedResultsFormat
+            File format of the exported detailed results
+        use_solver : SupportedSolver
+            Solver to be used for the optimization
+        solver_executable : str | None
+            Path of the solver's executable
+        model_statistics : bool
+            Whether the size of the model is added to the performance record
+
+        Returns
+        -------
+        OptimizationResults
+            Results object which is returned by the service as response
+        """
+
+        with self.performance.phase("parallel_scenarios"), ProcessPoolExecutor(max_workers=2) as executor:
+            target_future = executor.submit(
+                _solve_scenario,
+                self.input_components,
+                False,
+                self.backend,
+                self.time_aggregation,
+                use_solver,
+                solver_executable,
+                self.solver_threads,
+                export_detailed_results,
+                export_detailed_results_path,
+                export_detailed_results_format,
+                model_statistics,
+            )
+            current_future = executor.submit(
+                _solve_scenario,
+                self.input_components,
+                True,
+                self.backend,
+                self.time_aggregation,
+                use_solver,
+                solver_executable,
+                self.solver_threads,
+            )
+
+            status, target_scenario, target_performance = target_future.result()
+            self.performance.merge(target_performance)
+
+            try:
+                current_status, current_scenario, current_performance = current_future.result()
+                self.performance.merge(current_performance)
+
+            except RuntimeError:
+                current_status, current_scenario = None, None
+
+        if status == OptimizationStatus.SUCCESS and current_status != OptimizationStatus.SUCCESS:
+            logger.warning("Could not determine current scenario results. Probably given energy demand cannot be fulfilled by the existing components and tariffs.")
+
+        logger.info("Write optimization results")
+        results = compose_results_object(
+            status, target_scenario, current_scenario, self.time_aggregation
+        )
+
+        logger.info("Optimization results written")
+
         return results
 
     def _optimize(
@@ -114,71 +550,127 @@ class OptModel:
         Returns
         -------
         tuple[OptimizationStatus, float]
-            Status of the completed solve process and time in seconds the solver took to solve the model
+            Status of the completed solve process and CPU time in seconds the solver took to solve the model,
+            including the time of solver executables run as child processes
         """        
 
         logger.info("Optimizing model")
         logger.debug(f"Using {solver.value} solver")
 
+        # solution values extracted from a previous solve are outdated
+        for component in self.input_components:
+            component.clear_solution_values()
+
+        if self.backend == ModelBackend.SPARSE:
+            return self._optimize_sparse(solver_timeout=solver_timeout)
+
         ################### Define Solver ##########################################################
         if solver == SupportedSolver.HIGHS:
 
-            slv = SolverFactory("appsi_highs")
-            slv.config.stream_solver = True
+            with _in_process_solver_lock:
+                if self._solver is None:
+                    # persistent solver interface, which keeps the model loaded between solves
+                    self._solver = pyoe.SolverFactory("appsi_highs")
+                    self._solver.config.stream_solver = True
+                    # pass fixed variables as bounds, so that fixing a variable later only changes its bounds
+                    self._solver.update_config.treat_fixed_vars_as_params = False
+
+                    if self.solver_threads is not None:
+                        self._solver.highs_options["threads"] = self.solver_threads
 
-            start = time.process_time()
-            results = slv.solve(self.pyomo_model)
-            calculation_time = time.process_time() - start
+                    if self._warm_start is not None and self._warm_start.basis is not None:
+                        # load the model before the solve, so that the basis can be passed to HiGHS
+                        self._solver.set_instance(self.pyomo_model)
+                        self._disable_persistent_updates()
+                        self._set_highs_basis(self._solver._solver_model, self._warm_start.basis)
+                else:
+                    self._update_persistent_solver()
+
+                self._warm_start = None
+
+                start = cpu_time()
+                results = self._solver.solve(self.pyomo_model)
+                calculation_time = cpu_time() - start
 
         elif solver == SupportedSolver.CBC:
             ################### CBC-Solver #############################################################
 
             # try to call CBC solver by specifying the path to the executable (useful under Windows)
-            slv = SolverFactory(solver.value, executable=solver_executable)
+            slv = pyoe.SolverFactory(solver.value, executable=solver_executable)
 
             if isinstance(slv, pyoe.UnknownSolver):
                 # try to call CBC solver by its path saved in an environment variable (useful under Linux or Mac OS)
-                slv = SolverFactory(solver.value)
+                slv = pyoe.SolverFactory(solver.value)
 
             # slv.options['allowableGap'] = 0.01
-            slv.options["threads"] = 8
+            slv.options["threads"] = 8 if self.solver_threads is None else self.solver_threads
             slv.options["seconds"] = solver_timeout  # 1 Stunde Timeout
             slv.options["ratio"] = 1e-2
             slv.options["maxIterations"] = 99999999
 
-            start = time.process_time()
+            warm_start = self._apply_variable_values()
+
+            start = cpu_time()
             ################### Start Solver ###########################################################
-            results = slv.solve(self.pyomo_model, tee=True)
-            calculation_time = time.process_time() - start
+            results = slv.solve(self.pyomo_model, tee=True, warmstart=warm_start)
+            calculation_time = cpu_time() - start
+
+        elif solver == SupportedSolver.GUROBI and self._gurobi_persistent_available():
+
+            with _in_process_solver_lock:
+                if self._solver is None:
+                    # persistent solver interface via gurobipy, which keeps the model loaded between solves
+                    self._solver = pyoe.SolverFactory("gurobi_persistent")
+                    self._solver.set_instance(self.pyomo_model)
+
+                    if self.solver_threads is not None:
+                        self._solver.set_gurobi_param("Threads", self.solver_threads)
+                else:
+                    for variable in self._changed_variables:
+                        self._solver.update_var(variable)
+                    self._changed_variables = []
+
+                # the persistent interface always starts from the current variable values
+                self._apply_variable_values()
+
+                start = cpu_time()
+                ################### Start Solver ###########################################################
+                results = self._solver.solve(tee=True, warmstart=True)
+                calculation_time = cpu_time() - start
 
         elif solver == SupportedSolver.GUROBI:
-            slv = SolverFactory(solver.value, executable=solver_executable)
+            slv = pyoe.SolverFactory(solver.value, executable=solver_executable)
 
             if isinstance(slv, pyoe.UnknownSolver):
                 # try to call CBC solver by its path saved in an environment variable (useful under Linux or Mac OS)
-                slv = SolverFactory(solver.value)
+                slv = pyoe.SolverFactory(solver.value)
+
+            if self.solver_threads is not None:
+                slv.options["Threads"] = self.solver_threads
 
-            start = time.process_time()
+            warm_start = self._apply_variable_values()
+
+            start = cpu_time()
             ################### Start Solver ###########################################################
-            results = slv.solve(self.pyomo_model, tee=True)
-            calculation_time = time.process_time() - start
+            results = slv.solve(self.pyomo_model, tee=True, warmstart=warm_start)
+            calculation_time = cpu_time() - start
 
         if results.solver.termination_condition in [
-            TerminationCondition.infeasible,
-            TerminationCondition.invalidProblem,
-            TerminationCondition.solverFailure,
-            TerminationCondition.internalSolverError,
-            TerminationCondition.error,
-            TerminationCondition.userInterrupt,
-            TerminationCondition.resourceInterrupt,
-            TerminationCondition.infeasibleOrUnbounded,
+            pyoe.TerminationCondition.infeasible,
+            pyoe.TerminationCondition.invalidProblem,
+            pyoe.TerminationCondition.solverFailure,
+            pyoe.TerminationCondition.internalSolverError,
+            pyoe.TerminationCondition.error,
+            pyoe.TerminationCondition.userInterrupt,
+            pyoe.TerminationCondition.resourceInterrupt,
+            pyoe.TerminationCondition.infeasibleOrUnbounded,
         ]:
             logger.error("Solver raises Error")
             logger.debug(results.solver.termination_condition)
             status = OptimizationStatus.ERROR
             return status, calculation_time
 
-        elif results.solver.termination_condition == TerminationCondition.unbounded:
+        elif results.solver.termination_condition == pyoe.TerminationCondition.unbounded:
             logger.error("Problem is unbounded")
             logger.debug(results.solver.termination_condition)
             status = OptimizationStatus.UNBOUNDED
@@ -189,12 +681,337 @@ class OptModel:
             logger.info("Optimization successfully completed")
             return status, calculation_time
 
+    def fix_variable(self, name: str, value: float) -> bool:
+        """Fixes the scalar variable `name` of the built model to `value`. If the model is already
+        loaded into a persistent solver, the change is pushed to the solver with the next call of ``_optimize``.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable
+        value : float
+            Value to fix the variable to
+
+        Returns
+        -------
+        bool
+            True if the model contains a variable named `name`, else False
+        """
+
+        variable = self.model.find_component(name)
+        if variable is None:
+            return False
+
+        variable.fix(value)
+
+        if self.backend == ModelBackend.PYOMO:
+            self._changed_variables.append(variable)
+
+        return True
+
+    def _update_persistent_solver(self) -> None:
+        """Pushes the variables fixed since the last solve to the persistent HiGHS interface.
+        Automatic detection of model changes is turned off, as only variable bounds change between solves."""
+
+        self._disable_persistent_updates()
+
+        if len(self._changed_variables) > 0:
+            self._solver.update_variables(self._changed_variables)
+            self._changed_variables = []
+
+        # HiGHS skips presolve if a basis of the previous solve exists, which makes the re-solve with fixed
+        # capacities much slower than presolving the updated model, so the previous solution is discarded
+        highs = getattr(self._solver, "_solver_model", None)
+        if highs is not None:
+            highs.clearSolver()
+
+    def _disable_persistent_updates(self) -> None:
+        """Turns off the automatic detection of model changes by the persistent HiGHS interface."""
+
+        update_config = self._solver.update_config
+        update_config.check_for_new_or_removed_constraints = False
+        update_config.check_for_new_or_removed_vars = False
+        update_config.check_for_new_or_removed_params = False
+        update_config.check_for_new_objective = False
+        update_config.update_constraints = False
+        update_config.update_vars = False
+        update_config.update_params = False
+        update_config.update_named_expressions = False
+        update_config.update_objective = False
+
+    def _warm_start_case(self, solver: SupportedSolver) -> tuple[str, np.ndarray]:
+        """Returns the structure key and the features of the built model, by which solutions
+        of previously solved models are looked up in the `WarmStartStore`.
+
+        Parameters
+        ----------
+        solver : SupportedSolver
+            Solver to be used for the optimization
+
+        Returns
+        -------
+        tuple[str, np.ndarray]
+            Structure key and features of the model
+        """
+
+        if self.backend == ModelBackend.SPARSE:
+            model_size = (self.sparse_model.n_columns, self.sparse_model.n_rows)
+        else:
+            model_size = (self.pyomo_model.nvariables(), self.pyomo_model.nconstraints())
+
+        options = {"backend": self.backend.value, "solver": solver.value, "n_time_steps": 0 if self.t is None else len(self.t)}
+
+        return (
+            WarmStartStore.structure_key(self.input_components, options, model_size),
+            WarmStartStore.features(self.input_components),
+        )
+
+    def _solution_warm_start(self, solver: SupportedSolver) -> WarmStart:
+        """Returns the solution of the solved model in the form the solver can use as a warm start:
+        the simplex basis for HiGHS and the variable values for Gurobi and CBC.
+
+        Parameters
+        ----------
+        solver : SupportedSolver
+            Solver the model was solved with
+
+        Returns
+        -------
+        WarmStart
+            Solution of the model
+        """
+
+        if self.backend == ModelBackend.SPARSE:
+            return WarmStart(basis=self.sparse_model.get_basis())
+
+        if solver == SupportedSolver.HIGHS:
+            highs = getattr(self._solver, "_solver_model", None)
+            basis = None if highs is None else highs.getBasis()
+            return WarmStart(basis=basis if basis is not None and basis.valid else None)
+
+        values = np.array(
+            [np.nan if var.value is None else var.value for var in self.pyomo_model.component_data_objects(pyoe.Var)],
+            dtype=np.float64,
+        )
+
+        return WarmStart(values=values)
+
+    def _apply_variable_values(self) -> bool:
+        """Sets the variable values of the warm start, if any, as initial values of the pyomo model.
+
+        Returns
+        -------
+        bool
+            True if variable values were set
+        """
+
+        warm_start, self._warm_start = self._warm_start, None
+
+        if warm_start is None or warm_start.values is None:
+            return False
+
+        for var, value in zip(self.pyomo_model.component_data_objects(pyoe.Var), warm_start.values):
+            if not var.fixed and not np.isnan(value):
+                var.set_value(value, skip_validation=True)
+
+        return True
+
+    @staticmethod
+    def _set_highs_basis(highs: highspy.Highs, basis: highspy.HighsBasis) -> None:
+        """Passes the basis of a warm start to HiGHS, which starts the simplex method from it."""
+
+        if highs.setBasis(basis) != highspy.HighsStatus.kOk:
+            logger.warning("Basis of warm start could not be set")
+
+    def _gurobi_persistent_available(self) -> bool:
+        """Checks whether the persistent gurobi interface (gurobipy) can be used.
+
+        Returns
+        -------
+        bool
+            True if gurobipy is available
+        """
+
+        if self._solver is not None:
+            return True
+
+        return pyoe.SolverFactory("gurobi_persistent").available(exception_flag=False)
+
+    def _optimize_sparse(self, solver_timeout: float = 3600) -> tuple[OptimizationStatus, float]:
+        """Solves the sparse optimization model directly with HiGHS.
+
+        Parameters
+        ----------
+        solver_timeout : float, optional
+            Time in seconds after which the optimization should be aborted if no result was found before, by default 3600
+
+        Returns
+        -------
+        tuple[OptimizationStatus, float]
+            Status of the completed solve process and time in seconds the solver took to solve the model
+        """
+
+        basis = None if self._warm_start is None else self._warm_start.basis
+        self._warm_start = None
+
+        start = cpu_time()
+        model_status = self.sparse_model.solve(
+            stream_solver=True, time_limit=solver_timeout, threads=self.solver_threads, basis=basis
+        )
+        calculation_time = cpu_time() - start
+
+        if model_status == highspy.HighsModelStatus.kOptimal:
+            status = OptimizationStatus.SUCCESS
+            logger.info("Optimization successfully completed")
+
+        elif model_status == highspy.HighsModelStatus.kUnbounded:
+            logger.error("Problem is unbounded")
+            logger.debug(model_status)
+            status = OptimizationStatus.UNBOUNDED
+
+        elif (
+            model_status
+            in [
+                highspy.HighsModelStatus.kTimeLimit,
+                highspy.HighsModelStatus.kIterationLimit,
+            ]
+            and self.sparse_model.objective_value is not None
+        ):
+            status = OptimizationStatus.SUCCESS
+            logger.info("Optimization stopped at limit with feasible solution")
+
+        else:
+            logger.error("Solver raises Error")
+            logger.debug(model_status)
+            status = OptimizationStatus.ERROR
+
+        return status, calculation_time
+
+    @property
+    def model(self) -> pyoe.ConcreteModel | SparseModel | None:
+        """Returns the optimization model of the selected backend.
+
+        Returns
+        -------
+        pyoe.ConcreteModel | SparseModel | None
+            The pyomo model or the sparse model, None if the model is not built yet
+        """
+
+        if self.backend == ModelBackend.SPARSE:
+            return self.sparse_model
+
+        return self.pyomo_model
+
     def _build(self) -> None:
-        """Builds the pyomo model by creating a blank ``pyomo.Concretemodel``, the time set `self.t` and by calling `model_composition.compose` function."""
+        """Builds the optimization model of the selected backend. For pyomo, a blank ``pyomo.Concretemodel`` and the time set `self.t`,
+        which covers the representative periods if a time aggregation is set, are created and the `model_composition.compose` function is called. For the sparse backend, a blank ``SparseModel`` is filled by `model_composition.compose_sparse`."""
 
         logger.info("Create model instance")
 
+        self._solver = None
+        self._changed_variables = []
+
+        if self.backend == ModelBackend.SPARSE:
+            self.sparse_model = SparseModel(24 * 365)
+            self.sparse_model = compose_sparse(self.input_components, self.sparse_model)
+            return
+
         self.pyomo_model = pyoe.ConcreteModel()
-        self.t = pyoe.RangeSet(24 * 365)
 
-        self.pyomo_model = compose(self.input_components, self.pyomo_model, self.t)
+        if self.time_aggregation is None:
+            self.t = pyoe.RangeSet(24 * 365)
+        else:
+            self.t = pyoe.RangeSet(self.time_aggregation.n_aggregated_time_steps)
+
+        self.pyomo_model = compose(self.input_components, self.pyomo_model, self.t, self.time_aggregation)
+
+
+def _solve_scenario(
+    input_components: list[Component],
+    current_scenario: bool,
+    backend: ModelBackend,
+    time_aggregation: TimeAggregation | None,
+    use_solver: SupportedSolver,
+    solver_executable: str | None,
+    solver_threads: int | None = None,
+    export_detailed_results: bool = False,
+    export_detailed_results_path: None | Path = None,
+    export_detailed_results_format: DetailedResultsFormat = DetailedResultsFormat.EXCEL,
+    model_statistics: bool = False,
+) -> tuple[OptimizationStatus, OptimizationResultsScenario | None, PerformanceRecorder]:
+    """Builds and solves one scenario on an independent model instance.
+    Runs in a worker process, so that target and current scenario can be solved concurrently.
+
+    Parameters
+    ----------
+    input_components : list[Component]
+        Components of the optimization model
+    current_scenario : bool
+        Whether the current scenario (advised sizes fixed to the installed sizes)
+        or the target scenario is solved
+    backend : ModelBackend
+        Backend used to build the optimization model
+    time_aggregation : TimeAggregation | None
+        Time aggregation the model is built with
+    use_solver : SupportedSolver
+        Solver to be used for the optimization
+    solver_executable : str | None
+        Path of the solver's executable
+    solver_threads : int | None, optional
+        Maximum number of threads the solver may use, by default None
+    export_detailed_results : bool, optional
+        Whether detailed result time series should be exported to a file, by default False
+    export_detailed_results_path : None | Path, optional
+        Path of the file to write detailed results with time series to, by default None
+    export_detailed_results_format : DetailedResultsFormat, optional
+        File format of the exported detailed results, by default DetailedResultsFormat.EXCEL
+    model_statistics : bool, optional
+        Whether the size of the model is added to the performance record, by default False
+
+    Returns
+    -------
+    tuple[OptimizationStatus, OptimizationResultsScenario | None, PerformanceRecorder]
+        Status of the optimization, the results of the scenario, which are None
+        if the optimization was not successful, and the times of the phases of the scenario
+    """
+
+    scenario = "current" if current_scenario else "target"
+
+    opt_model = OptModel(input_components)
+    opt_model.backend = backend
+    opt_model.solver_threads = solver_threads
+    opt_model.time_aggregation = time_aggregation
+    performance = opt_model.performance
+
+    with performance.phase(f"build_{scenario}"):
+        opt_model._build()
+
+    if model_statistics:
+        with performance.phase("model_statistics"):
+            performance.model_statistics = collect_model_statistics(opt_model.model, opt_model.input_components)
+
+    if current_scenario:
+        fix_current_scenario_variables(opt_model, opt_model.input_components)
+
+    with performance.phase(f"solve_{scenario}"):
+        status, calculation_time = opt_model._optimize(
+            solver=use_solver, solver_executable=solver_executable
+        )
+
+    if status != OptimizationStatus.SUCCESS:
+        return status, None, performance
+
+    if export_detailed_results:
+        with performance.phase("export"):
+            write_detailed_results(
+                opt_model.model,
+                opt_model.input_components,
+                calculation_time,
+                filename=export_detailed_results_path,
+                file_format=export_detailed_results_format,
+            )
+
+    with performance.phase(f"results_{scenario}"):
+        scenario_results = generate_scenario_results(opt_model.model, opt_model.input_components)
+
+    return status, scenario_results, performance
@@ -0,0 +1,253 @@
+"""Contains the asynchronous execution of optimizations in separate worker processes,
+which can be awaited, cancelled and aborted after a timeout.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from multiprocessing.connection import Connection
+
+from .components.component import Component
+from .data_models.enums import OptimizationStatus
+from .data_models.optimization_results_model import OptimizationResults
+from .data_models.optimization_results_status import OptimizationResultsStatus
+from .opt_model import OptModel
+
+
+logger = logging.getLogger()
+
+
+def _run_job(input_components: list[Component], run_kwargs: dict, connection: Connection):
+    """Runs an optimization in the worker process of a job and sends the status
+    ``PROCESSING`` when the calculation starts and the results when it is finished.
+
+    Parameters
+    ----------
+    input_components : list[Component]
+        Components of the optimization model
+    run_kwargs : dict
+        Keyword arguments passed to `OptModel.run_calculation`
+    connection : Connection
+        Sending end of the pipe to the job
+    """
+
+    # the worker leads its own process group, so that the job can terminate it together with
+    # the processes it starts (e.g. for parallel scenarios), which would otherwise survive it
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+    connection.send((OptimizationStatus.PROCESSING, None))
+
+    try:
+        results = OptModel(input_components).run_calculation(**run_kwargs)
+
+    except Exception as e:
+        logger.exception("Optimization failed")
+        results = OptimizationResults(
+            status=OptimizationResultsStatus(status=OptimizationStatus.ERROR, error_message=str(e))
+        )
+
+    connection.send((results.status.status, results))
+    connection.close()
+
+
+class OptimizationJob:
+    def __init__(
+        self,
+        input_components: list[Component],
+        timeout: float | None = None,
+        poll_interval: float = 0.1,
+        **run_kwargs,
+    ):
+        """Optimization which is built and solved in a separate worker process, so that the event loop
+        of the caller is not blocked and the solver can be stopped at any time. The progress is exposed
+        in the attribute `status`, which changes from ``NEW`` to ``PROCESSING`` when the worker starts
+        the calculation and to the status of the results when it is finished.
+
+        .. code-block:: python
+
+            job = OptimizationJob(components, timeout=600, n_typical_periods=12)
+            results = await job.run()
+
+        Parameters
+        ----------
+        input_components : list[Component]
+            Components of the optimization model
+        timeout : float | None, optional
+            Time in seconds after which the worker process is terminated and an error is returned,
+            by default None (no timeout)
+        poll_interval : float, optional
+            Time in seconds between two checks of the worker process, by default 0.1
+        **run_kwargs
+            Keyword arguments passed to `OptModel.run_calculation`, e.g. ``use_solver`` or ``backend``
+        """
+
+        self.input_components = input_components
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.run_kwargs = run_kwargs
+        self.status = OptimizationStatus.NEW
+        self.results: OptimizationResults | None = None
+        self._process = None
+        self._cancelled = False
+
+    async def run(self) -> OptimizationResults:
+        """Starts the worker process and waits for the results. If the awaiting task is cancelled,
+        the worker process is terminated and the cancellation is propagated.
+
+        Returns
+        -------
+        OptimizationResults
+            Results of the optimization, with status ``ERROR`` if the calculation failed,
+            the worker process died, the timeout was exceeded or the job was cancelled via `cancel`
+
+        Raises
+        ------
+        RuntimeError
+            If the job was already started
+        """
+
+        if self.status != OptimizationStatus.NEW or self._cancelled:
+            raise RuntimeError("Optimization job was already started.")
+
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+
+        # no daemon process, so that the worker can solve the scenarios in parallel processes itself
+        self._process = context.Process(target=_run_job, args=(self.input_components, self.run_kwargs, sender))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        started = loop.run_in_executor(None, self._process.start)
+
+        try:
+            # starting blocks until the worker has unpickled the components and imported their modules
+            await asyncio.shield(started)
+            sender.close()
+
+            while True:
+                if self._cancelled:
+                    return self._fail("Optimization was cancelled.")
+
+                try:
+                    while receiver.poll():
+                        status, results = receiver.recv()
+                        self.status = status
+
+                        if results is not None:
+                            self.results = results
+                            return results
+
+                except EOFError:
+                    return self._fail(f"Worker process terminated unexpectedly with exit code {self._process.exitcode}.")
+
+                if not self._process.is_alive() and not receiver.poll():
+                    return self._fail(f"Worker process terminated unexpectedly with exit code {self._process.exitcode}.")
+
+                if self.timeout is not None and loop.time() - start > self.timeout:
+                    return self._fail(f"Optimization exceeded the timeout of {self.timeout} s.")
+
+                await asyncio.sleep(self.poll_interval)
+
+        except asyncio.CancelledError:
+            self._fail("Optimization was cancelled.")
+            raise
+
+        finally:
+            # waiting for the worker processes to exit would block the event loop
+            if started.done():
+                loop.run_in_executor(None, self._terminate, sender)
+            else:
+                # cancelled while the worker is starting, so it is terminated as soon as it has started
+                started.add_done_callback(lambda _: loop.run_in_executor(None, self._terminate, sender))
+
+            receiver.close()
+
+    def cancel(self):
+        """Cancels the job and terminates its worker processes. A waiting `run` returns results with status ``ERROR``.
+        If called from a running event loop, the processes are terminated in a thread of its default executor."""
+
+        self._cancelled = True
+
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            self._terminate()
+            return
+
+        loop.run_in_executor(None, self._terminate)
+
+    def _fail(self, message: str) -> OptimizationResults:
+        """Sets the status of the job to ``ERROR`` and creates the corresponding results.
+
+        Parameters
+        ----------
+        message : str
+            Description of the error
+
+        Returns
+        -------
+        OptimizationResults
+            Results without scenarios containing the error message
+        """
+
+        logger.warning(message)
+
+        self.status = OptimizationStatus.ERROR
+        self.results = OptimizationResults(
+            status=OptimizationResultsStatus(status=OptimizationStatus.ERROR, error_message=message)
+        )
+
+        return self.results
+
+    def _terminate(self, sender: Connection | None = None):
+        """Terminates the worker process and all processes it started, waiting up to 5 s for them
+        to exit before killing them. Blocks, so it is called in a thread from the event loop.
+
+        Parameters
+        ----------
+        sender : Connection | None, optional
+            Sending end of the pipe to the job, which is closed afterwards, by default None
+        """
+
+        if self._process is not None and self._process.pid is not None:
+            self._signal(signal.SIGTERM)
+            self._process.join(5)
+
+            # processes started by the worker may outlive it
+            self._signal(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+            self._process.join()
+
+        if sender is not None:
+            sender.close()
+
+    def _signal(self, signal_number: int):
+        """Sends a signal to the process group of the worker process. Falls back to the worker process alone
+        if the platform has no process groups or the worker has not yet created its group.
+
+        Parameters
+        ----------
+        signal_number : int
+            Number of the signal, e.g. ``signal.SIGTERM``
+        """
+
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self._process.pid, signal_number)
+                return
+
+            except ProcessLookupError:
+                # the worker has not yet created its group or all processes of the group have exited
+                pass
+
+        if self._process.is_alive():
+            if signal_number == signal.SIGTERM:
+                self._process.terminate()
+            else:
+                self._process.kill()
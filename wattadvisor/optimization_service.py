@@ -0,0 +1,751 @@
+"""Contains a local HTTP service, which accepts optimization requests with component definitions as JSON,
+queues them and solves them on a pool of pre-warmed worker processes.
+
+Usage::
+
+    python -m wattadvisor.optimization_service --port 8080 --workers 2 --solver-threads 2
+
+Endpoints:
+
+- ``POST /jobs``: submits an `OptimizationRequest`, returns the status of the new job
+- ``GET /jobs/<job_id>``: returns the status of a job
+- ``GET /jobs/<job_id>/results``: returns the `OptimizationResults` of a finished job
+- ``DELETE /jobs/<job_id>``: cancels a job which is not yet processed
+- ``GET /health``: returns the configuration and state of the worker pool and the number of jobs
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import argparse
+import functools
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import typing
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+from pydantic import ValidationError
+
+# component modules are imported, so that all component types can be created from their class names
+from .components import (  # noqa: F401
+    combined_heat_power,
+    electrical_energy_storage,
+    electrode_boiler,
+    energy_demand,
+    energy_feedin,
+    energy_purchase,
+    gas_boiler,
+    heat_pump,
+    photovoltaic,
+    solarthemal_energy,
+    solid_fuel_boiler,
+    thermal_energy_storage,
+    wind_power,
+)
+from .components.component import Component
+from .data_models.enums import OptimizationStatus
+from .data_models.optimization_job_status import OptimizationJobStatus
+from .data_models.optimization_request import OptimizationRequest
+from .data_models.optimization_results_model import OptimizationResults
+from .data_models.optimization_results_status import OptimizationResultsStatus
+from .opt_model import OptModel
+from .utils.model_scope import ModelScope
+from .utils.result_cache import ResultCache
+
+
+logger = logging.getLogger()
+
+# modules imported by every worker process on start-up, so that the first job does not pay for them
+WARM_UP_MODULES = [
+    "pyomo.environ",
+    "pyomo.contrib.appsi.solvers.highs",
+    "highspy",
+    "scipy.sparse",
+    "scipy.cluster.hierarchy",
+    "pvlib",
+    "feedinlib",
+    "windpowerlib",
+    "demandlib",
+    "holidays",
+    "xarray",
+]
+
+# environment variables limiting the threads of numerical libraries in the worker processes
+THREAD_LIMIT_VARIABLES = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"]
+
+
+def _component_classes(cls: type[Component] = Component) -> dict[str, type[Component]]:
+    """Returns all subclasses of `cls` by their class name."""
+
+    classes = {}
+
+    for subclass in cls.__subclasses__():
+        classes[subclass.__name__] = subclass
+        classes.update(_component_classes(subclass))
+
+    return classes
+
+
+def _is_series_field(annotation: typing.Any) -> bool:
+    """Checks whether a field annotation accepts a ``pd.Series``."""
+
+    return annotation is pd.Series or pd.Series in typing.get_args(annotation)
+
+
+def components_from_definitions(definitions: list[dict]) -> list[Component]:
+    """Creates the components of an optimization request. Every definition contains the class name
+    of the component as key ``type`` and its fields, e.g.
+    ``{"type": "GasBoiler", "lifespan": 20, "eff": 0.75}``. Time series (e.g. ``normed_production``
+    or ``demand_profile``) are given as lists of 8760 hourly values.
+
+    Parameters
+    ----------
+    definitions : list[dict]
+        Definitions of the components
+
+    Returns
+    -------
+    list[Component]
+        Components of the optimization model
+
+    Raises
+    ------
+    ValueError
+        If a definition contains no or an unknown component type
+    """
+
+    classes = _component_classes()
+    components = []
+
+    for definition in definitions:
+        fields = dict(definition)
+        component_type = fields.pop("type", None)
+
+        if component_type not in classes:
+            raise ValueError(f"Unknown component type {component_type}.")
+
+        component_class = classes[component_type]
+
+        for field_name, value in fields.items():
+            field = component_class.model_fields.get(field_name)
+            if field is not None and isinstance(value, list) and _is_series_field(field.annotation):
+                fields[field_name] = pd.Series(value, dtype=float)
+
+        components.append(component_class(**fields))
+
+    return components
+
+
+def _initialize_worker(result_cache_directory: Path | None, result_cache_ttl: float | None):
+    """Imports the heavy dependencies in a new worker process and configures the result cache.
+    Missing optional modules are skipped.
+
+    Parameters
+    ----------
+    result_cache_directory : Path | None
+        Directory of the result cache shared by all workers, None to disable the cache
+    result_cache_ttl : float | None
+        Time in seconds after which cached results expire
+    """
+
+    if result_cache_directory is not None:
+        ResultCache.configure(result_cache_directory, ttl=result_cache_ttl)
+
+    for module in WARM_UP_MODULES:
+        try:
+            importlib.import_module(module)
+
+        except Exception:
+            logger.debug(f"Module {module} could not be imported by worker process")
+
+
+def _worker_ready() -> int:
+    """Returns the process ID of the worker, used to start all worker processes of the pool."""
+
+    return os.getpid()
+
+
+def _run_request(request: OptimizationRequest, solver_threads: int | None) -> OptimizationResults:
+    """Creates the components of a request and runs the optimization in a worker process.
+
+    Parameters
+    ----------
+    request : OptimizationRequest
+        Validated optimization request
+    solver_threads : int | None
+        Maximum number of threads of the solver
+
+    Returns
+    -------
+    OptimizationResults
+        Results of the optimization, with status ``ERROR`` if the components are invalid or the calculation failed
+    """
+
+    try:
+        # names of components without a name are numbered per request, independent of previous jobs of the worker
+        with ModelScope():
+            components = components_from_definitions(request.components)
+
+            return OptModel(components).run_calculation(
+                **request.options.model_dump(), solver_threads=solver_threads
+            )
+
+    except Exception as e:
+        logger.exception("Optimization failed")
+
+        return OptimizationResults(
+            status=OptimizationResultsStatus(status=OptimizationStatus.ERROR, error_message=str(e))
+        )
+
+
+@contextmanager
+def _thread_limits(n_threads: int | None) -> Iterator[None]:
+    """Context manager setting the thread limits of numerical libraries in the environment,
+    which is inherited by worker processes started within the context."""
+
+    if n_threads is None:
+        yield
+        return
+
+    previous = {variable: os.environ.get(variable) for variable in THREAD_LIMIT_VARIABLES}
+    os.environ.update({variable: str(n_threads) for variable in THREAD_LIMIT_VARIABLES})
+
+    try:
+        yield
+
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                os.environ.pop(variable)
+            else:
+                os.environ[variable] = value
+
+
+class _Job:
+    def __init__(self, job_id: str, request: OptimizationRequest):
+        self.job_id = job_id
+        self.request = request
+        self.future: Future | None = None
+        self.cancelled = False
+        self.submitted = datetime.now(timezone.utc)
+
+    @property
+    def finished(self) -> bool:
+        return self.cancelled or (self.future is not None and self.future.done())
+
+
+class OptimizationService:
+    def __init__(
+        self,
+        n_workers: int | None = None,
+        solver_threads: int | None = 1,
+        max_finished_jobs: int = 1000,
+        result_cache_directory: str | Path | None = None,
+        result_cache_ttl: float | None = None,
+    ):
+        """Queues optimization requests and solves them on a pool of worker processes. The workers are started
+        and import the heavy dependencies (pyomo, HiGHS, pvlib, feedinlib, ...) when the service is started,
+        so that submitted jobs only pay for preprocessing, building and solving. At most `n_workers` jobs
+        are processed at the same time, each solver with at most `solver_threads` threads.
+        If a worker process dies (e.g. killed for lack of memory), its jobs fail and the pool is restarted
+        for the queued jobs.
+
+        .. code-block:: python
+
+            with OptimizationService(n_workers=2) as service:
+                service.serve("127.0.0.1", 8080)
+
+        Parameters
+        ----------
+        n_workers : int | None, optional
+            Number of worker processes, by default None (number of CPUs divided by `solver_threads`)
+        solver_threads : int | None, optional
+            Maximum number of threads of every solver and numerical library in the workers, by default 1.
+            None uses the defaults of the solver, which may oversubscribe the host.
+        max_finished_jobs : int, optional
+            Number of finished jobs whose results are kept, by default 1000. If exceeded,
+            the oldest finished jobs are removed.
+        result_cache_directory : str | Path | None, optional
+            Directory of a `ResultCache` shared by all workers, which returns stored results
+            for repeated requests, by default None (no cache)
+        result_cache_ttl : float | None, optional
+            Time in seconds after which cached results expire, by default None (results do not expire)
+        """
+
+        if n_workers is None:
+            n_workers = max(1, (os.cpu_count() or 1) // (solver_threads or 1))
+
+        self.n_workers = n_workers
+        self.solver_threads = solver_threads
+        self.max_finished_jobs = max_finished_jobs
+        self.result_cache_directory = result_cache_directory
+        self.result_cache_ttl = result_cache_ttl
+        self._executor = None
+        self._jobs: OrderedDict[str, _Job] = OrderedDict()
+        # jobs are queued here instead of in the executor, which would report queued jobs as running
+        self._queue: deque[_Job] = deque()
+        self._n_processing = 0
+        self._n_restarts = 0
+        # set if the worker pool broke and could not be restarted
+        self._broken = False
+        # reentrant, as a callback of a finished future may be called while dispatching
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> "OptimizationService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def start(self):
+        """Starts the worker processes and waits until all of them have imported the heavy dependencies."""
+
+        if self._executor is not None:
+            return
+
+        logger.info(f"Start {self.n_workers} worker processes")
+
+        with _thread_limits(self.solver_threads):
+            self._executor = self._create_executor()
+
+            # submitting one task per worker at once starts all worker processes
+            wait([self._executor.submit(_worker_ready) for _ in range(self.n_workers)])
+
+        self._broken = False
+
+        logger.info("Worker processes ready")
+
+    def shutdown(self):
+        """Cancels all queued jobs and stops the worker processes after the running jobs are finished."""
+
+        with self._lock:
+            for job in self._queue:
+                job.cancelled = True
+                job.request = None
+
+            self._queue.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def submit(self, request: OptimizationRequest) -> OptimizationJobStatus:
+        """Queues an optimization request.
+
+        Parameters
+        ----------
+        request : OptimizationRequest
+            Validated optimization request
+
+        Returns
+        -------
+        OptimizationJobStatus
+            Status of the new job
+
+        Raises
+        ------
+        RuntimeError
+            If the service is not started or its worker pool is broken
+        """
+
+        if self._executor is None:
+            raise RuntimeError("Optimization service is not started.")
+
+        if self._broken:
+            raise RuntimeError("Worker pool of the optimization service is broken.")
+
+        job = _Job(uuid.uuid4().hex, request)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._queue.append(job)
+            self._remove_finished_jobs()
+            self._dispatch()
+
+        logger.info(f"Job {job.job_id} submitted")
+
+        return self._job_status(job)
+
+    def status(self, job_id: str) -> OptimizationJobStatus | None:
+        """Returns the status of a job, which is ``NEW`` while it is queued,
+        ``PROCESSING`` while it is processed and the status of the results if it is finished.
+
+        Parameters
+        ----------
+        job_id : str
+            ID of the job
+
+        Returns
+        -------
+        OptimizationJobStatus | None
+            Status of the job, None if the job is unknown
+        """
+
+        job = self._jobs.get(job_id)
+
+        return None if job is None else self._job_status(job)
+
+    def results(self, job_id: str) -> OptimizationResults | None:
+        """Returns the results of a finished job.
+
+        Parameters
+        ----------
+        job_id : str
+            ID of the job
+
+        Returns
+        -------
+        OptimizationResults | None
+            Results of the job, None if the job is unknown or not finished
+        """
+
+        job = self._jobs.get(job_id)
+
+        if job is None or not job.finished:
+            return None
+
+        return self._job_results(job)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a job which is still queued. Running jobs cannot be cancelled.
+
+        Parameters
+        ----------
+        job_id : str
+            ID of the job
+
+        Returns
+        -------
+        bool
+            True if the job was cancelled
+        """
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+            if job is None or job not in self._queue:
+                return False
+
+            self._queue.remove(job)
+            job.cancelled = True
+            job.request = None
+
+        logger.info(f"Job {job_id} cancelled")
+
+        return True
+
+    def health(self) -> dict:
+        """Returns the configuration and state of the worker pool and the number of jobs per status.
+        ``broken`` is true if a worker process died and the pool could not be restarted,
+        ``worker_restarts`` counts the restarts of the pool after a worker process died."""
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+
+        n_jobs = {status.value: 0 for status in OptimizationStatus}
+        for job in jobs:
+            n_jobs[self._job_status(job).status.value] += 1
+
+        return {
+            "running": self._executor is not None and not self._broken,
+            "broken": self._broken,
+            "worker_restarts": self._n_restarts,
+            "n_workers": self.n_workers,
+            "solver_threads": self.solver_threads,
+            "n_jobs": n_jobs,
+        }
+
+    def create_server(self, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+        """Creates an HTTP server handling the requests to the service.
+
+        Parameters
+        ----------
+        host : str, optional
+            Host to listen on, by default "127.0.0.1"
+        port : int, optional
+            Port to listen on, by default 8080
+
+        Returns
+        -------
+        ThreadingHTTPServer
+            Server, which handles requests after calling ``serve_forever``
+        """
+
+        server = ThreadingHTTPServer((host, port), _RequestHandler)
+        server.daemon_threads = True
+        server.service = self
+
+        return server
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        """Starts the service if necessary and handles HTTP requests until interrupted.
+
+        Parameters
+        ----------
+        host : str, optional
+            Host to listen on, by default "127.0.0.1"
+        port : int, optional
+            Port to listen on, by default 8080
+        """
+
+        self.start()
+
+        with self.create_server(host, port) as server:
+            logger.info(f"Optimization service listening on http://{host}:{server.server_address[1]}")
+
+            try:
+                server.serve_forever()
+
+            except KeyboardInterrupt:
+                logger.info("Optimization service stopped")
+
+    def _job_status(self, job: _Job) -> OptimizationJobStatus:
+        """Derives the status of a job from the state of its future."""
+
+        if not job.finished:
+            status = OptimizationStatus.NEW if job.future is None else OptimizationStatus.PROCESSING
+
+            return OptimizationJobStatus(job_id=job.job_id, status=status, submitted=job.submitted)
+
+        results_status = self._job_results(job).status
+
+        return OptimizationJobStatus(
+            job_id=job.job_id,
+            status=results_status.status,
+            error_message=results_status.error_message,
+            submitted=job.submitted,
+        )
+
+    def _job_results(self, job: _Job) -> OptimizationResults:
+        """Returns the results of a finished job, which contain an error if it was cancelled or its worker failed."""
+
+        if job.cancelled:
+            message = "Optimization was cancelled."
+
+        elif job.future.exception() is not None:
+            message = f"Worker process failed: {job.future.exception()}"
+
+        else:
+            return job.future.result()
+
+        return OptimizationResults(
+            status=OptimizationResultsStatus(status=OptimizationStatus.ERROR, error_message=message)
+        )
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Creates the pool of worker processes, which are started on demand."""
+
+        return ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.result_cache_directory, self.result_cache_ttl),
+        )
+
+    def _dispatch(self):
+        """Submits queued jobs to the executor while fewer than `n_workers` jobs are processed. Requires `_lock`."""
+
+        while self._n_processing < self.n_workers and len(self._queue) > 0 and not self._broken:
+            job = self._queue[0]
+            executor = self._executor
+
+            try:
+                future = executor.submit(_run_request, job.request, self.solver_threads)
+
+            except BrokenProcessPool:
+                # a worker died before the callbacks of its jobs were called
+                self._restart_executor(executor)
+                continue
+
+            # the request is kept until it is submitted, so that it can be resubmitted to a restarted pool
+            self._queue.popleft()
+            job.future = future
+            job.request = None
+            self._n_processing += 1
+            job.future.add_done_callback(functools.partial(self._job_done, executor))
+
+    def _job_done(self, executor: ProcessPoolExecutor, future: Future):
+        """Restarts the worker pool if a worker process died and dispatches the next queued job when a job is finished."""
+
+        with self._lock:
+            self._n_processing -= 1
+
+            if self._executor is None:
+                return
+
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self._restart_executor(executor)
+
+            self._dispatch()
+
+    def _restart_executor(self, broken_executor: ProcessPoolExecutor):
+        """Replaces a broken worker pool by a new one. The jobs processed by the broken pool fail,
+        queued jobs are submitted to the new pool. If the pool cannot be restarted, the queued jobs fail
+        and the service rejects new jobs. Requires `_lock`.
+
+        Parameters
+        ----------
+        broken_executor : ProcessPoolExecutor
+            Pool whose worker process died, nothing is done if it has already been replaced
+        """
+
+        if self._executor is not broken_executor or self._broken:
+            return
+
+        logger.error("A worker process died, restart the worker pool")
+
+        # called by a thread of the broken pool, which must not wait for itself
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+
+        try:
+            with _thread_limits(self.solver_threads):
+                self._executor = self._create_executor()
+
+            self._n_restarts += 1
+
+        except Exception as e:
+            logger.exception("Worker pool could not be restarted")
+            self._broken = True
+
+            for job in self._queue:
+                job.future = Future()
+                job.future.set_exception(BrokenProcessPool(f"Worker pool could not be restarted: {e}"))
+                job.request = None
+
+            self._queue.clear()
+
+    def _remove_finished_jobs(self):
+        """Removes the oldest finished jobs if more than `max_finished_jobs` are kept. Requires `_lock`."""
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+
+        for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: ThreadingHTTPServer
+
+    def do_GET(self):
+        service: OptimizationService = self.server.service
+
+        if self.path == "/health":
+            return self._send_json(HTTPStatus.OK, json.dumps(service.health()))
+
+        match = re.fullmatch(r"/jobs/([0-9a-f]+)(/results)?", self.path)
+        if match is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+        job_id, results = match.groups()
+        status = service.status(job_id)
+
+        if status is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+
+        if results is None:
+            return self._send_json(HTTPStatus.OK, status.model_dump_json())
+
+        if status.status in [OptimizationStatus.NEW, OptimizationStatus.PROCESSING]:
+            return self._send_error(HTTPStatus.CONFLICT, f"Job {job_id} is not finished")
+
+        self._send_json(HTTPStatus.OK, service.results(job_id).model_dump_json())
+
+    def do_POST(self):
+        service: OptimizationService = self.server.service
+
+        if self.path != "/jobs":
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            request = OptimizationRequest.model_validate_json(body)
+
+        except (ValueError, ValidationError) as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+
+        classes = _component_classes()
+        unknown_types = [definition.get("type") for definition in request.components if definition.get("type") not in classes]
+
+        if len(unknown_types) > 0:
+            return self._send_error(HTTPStatus.BAD_REQUEST, f"Unknown component types {unknown_types}")
+
+        try:
+            status = service.submit(request)
+
+        except RuntimeError as e:
+            return self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+
+        self._send_json(HTTPStatus.ACCEPTED, status.model_dump_json())
+
+    def do_DELETE(self):
+        service: OptimizationService = self.server.service
+
+        match = re.fullmatch(r"/jobs/([0-9a-f]+)", self.path)
+        if match is None or service.status(match.group(1)) is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+        if not service.cancel(match.group(1)):
+            return self._send_error(HTTPStatus.CONFLICT, f"Job {match.group(1)} is already processed")
+
+        self._send_json(HTTPStatus.OK, service.status(match.group(1)).model_dump_json())
+
+    def _send_json(self, status: HTTPStatus, body: str):
+        """Sends a response with a JSON body."""
+
+        data = body.encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        """Sends a response with an error message as JSON body."""
+
+        self._send_json(status, json.dumps({"error": message}))
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def main(args: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Local HTTP service solving WattAdvisor optimization requests.")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--solver-threads", type=int, default=1, help="maximum number of threads per solver")
+    parser.add_argument("--result-cache", type=Path, default=None, help="directory to cache results in")
+    parser.add_argument("--result-cache-ttl", type=float, default=None, help="time in seconds cached results expire after")
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    with OptimizationService(
+        n_workers=args.workers,
+        solver_threads=args.solver_threads,
+        result_cache_directory=args.result_cache,
+        result_cache_ttl=args.result_cache_ttl,
+    ) as service:
+        service.serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
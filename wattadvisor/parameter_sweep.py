@@ -0,0 +1,278 @@
+"""Contains the execution of parameter sweeps, which optimize a base set of components
+for a number of cases with varying parameter values in a process pool.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pandas as pd
+
+from .components.component import Component
+from .data_models.bilance_variables import BilanceVariables
+from .data_models.enums import SupportedSolver, OptimizationStatus, ModelBackend
+from .data_models.optimization_results_model import OptimizationResults
+from .data_models.optimization_results_scenario_kpis import OptimizationResultsScenarioKpis
+from .data_models.optimization_results_status import OptimizationResultsStatus
+from .opt_model import OptModel
+
+
+logger = logging.getLogger()
+
+# components of the sweep, which are sent to every worker process only once
+_base_components: list[Component] = []
+
+
+def parameter_grid(grid: dict[str, dict[str, list]]) -> list[dict[str, dict[str, Any]]]:
+    """Creates the cases of a parameter sweep from all combinations of the given parameter values.
+
+    Parameters
+    ----------
+    grid : dict[str, dict[str, list]]
+        Values to combine for every attribute of every component, e.g.
+        ``{"pv": {"capex": [800, 1000]}, "grid": {"energy_price_scalar": [0.3, 0.4]}}``
+
+    Returns
+    -------
+    list[dict[str, dict[str, Any]]]
+        Overrides of every case in the form ``{"pv": {"capex": 800}, "grid": {"energy_price_scalar": 0.3}}``
+    """
+
+    keys = [(name, attribute) for name, attributes in grid.items() for attribute in attributes]
+    value_lists = [grid[name][attribute] for name, attribute in keys]
+
+    cases = []
+    for values in itertools.product(*value_lists):
+        case = {}
+        for (name, attribute), value in zip(keys, values):
+            case.setdefault(name, {})[attribute] = value
+
+        cases.append(case)
+
+    return cases
+
+
+def _copy_component(component: Component, overrides: dict[str, Any] | None = None) -> Component:
+    """Creates an unbuilt copy of a component with some of its attributes overridden.
+    The copy is created without calling ``__init__``, so that preprocessed time series
+    (e.g. feed-in or demand profiles) are reused instead of being calculated again and overrides
+    are not replaced by values of the parameter file. The overrides are validated like assigned attributes.
+    Attributes the preprocessed time series are calculated from (see ``Component._preprocessing_inputs``)
+    cannot be overridden, as the time series would not change. The time series itself can be overridden instead.
+
+    Parameters
+    ----------
+    component : Component
+        Component to copy
+    overrides : dict[str, Any] | None, optional
+        New values of attributes of the component, by default None
+
+    Returns
+    -------
+    Component
+        Copy of the component
+
+    Raises
+    ------
+    ValueError
+        If an overridden attribute is not a field of the component, is used to calculate
+        a preprocessed time series or its value is invalid
+    """
+
+    component_class = type(component)
+    fields = component_class.model_fields
+
+    values = {field: getattr(component, field) for field in fields}
+    values["bilance_variables"] = BilanceVariables()
+
+    copy = component_class.model_construct(**values)
+
+    for attribute, value in (overrides or {}).items():
+        if attribute not in fields:
+            raise ValueError(f"Component {component.name} has no attribute {attribute} to override.")
+
+        for series, inputs in component_class._preprocessing_inputs.items():
+            if attribute in inputs:
+                raise ValueError(
+                    f"Attribute {attribute} of component {component.name} cannot be overridden, "
+                    f"as it is used to calculate {series}. Override {series} instead."
+                )
+
+        component_class.__pydantic_validator__.validate_assignment(copy, attribute, value)
+
+    return copy
+
+
+def _init_worker(components: list[Component]):
+    """Stores the components of the sweep in the worker process.
+
+    Parameters
+    ----------
+    components : list[Component]
+        Unbuilt components of the sweep
+    """
+
+    global _base_components
+    _base_components = components
+
+
+def _solve_case(overrides: dict[str, dict[str, Any]], run_kwargs: dict) -> OptimizationResults:
+    """Optimizes one case of the sweep in a worker process.
+
+    Parameters
+    ----------
+    overrides : dict[str, dict[str, Any]]
+        Overridden attributes per component name
+    run_kwargs : dict
+        Keyword arguments passed to `OptModel.run_calculation`
+
+    Returns
+    -------
+    OptimizationResults
+        Results of the case, with status ``ERROR`` if the case could not be optimized
+    """
+
+    try:
+        components = [_copy_component(component, overrides.get(component.name)) for component in _base_components]
+
+        return OptModel(components).run_calculation(**run_kwargs)
+
+    # a failing case must not discard the results of the other cases
+    except Exception as e:
+        logger.exception(f"Case {overrides} could not be optimized")
+        return OptimizationResults(
+            status=OptimizationResultsStatus(status=OptimizationStatus.ERROR, error_message=str(e))
+        )
+
+
+class ParameterSweep:
+    def __init__(self, input_components: list[Component], cases: list[dict[str, dict[str, Any]]]):
+        """Creates a parameter sweep, which optimizes a set of components once for every case
+        with some of the component attributes (e.g. ``capex``, ``energy_price_scalar``,
+        ``interest_rate`` or ``potential_power``) overridden.
+
+        The components are preprocessed only once. Every case works on copies of them, so that
+        feed-in, demand and COP time series are shared by all cases.
+
+        Parameters
+        ----------
+        input_components : list[Component]
+            Base components of all cases
+        cases : list[dict[str, dict[str, Any]]]
+            Overridden attributes per component name for every case, e.g. created by `parameter_grid`
+
+        Raises
+        ------
+        ValueError
+            If a case refers to a component name or attribute which does not exist or cannot be overridden,
+            or overrides an attribute with an invalid value
+        """
+
+        self.input_components = [_copy_component(component) for component in input_components]
+        self.cases = cases
+        self.results = []
+
+        names = {component.name: component for component in self.input_components}
+        for case in cases:
+            for name, overrides in case.items():
+                if name not in names:
+                    raise ValueError(f"No component with name {name} to override.")
+
+                _copy_component(names[name], overrides)
+
+    def run(
+        self,
+        max_workers: int | None = None,
+        use_solver: SupportedSolver = SupportedSolver.HIGHS,
+        solver_executable: str | None = None,
+        backend: ModelBackend = ModelBackend.PYOMO,
+        n_typical_periods: int | None = None,
+        typical_period_length: int = 24,
+        warm_start: bool = False,
+    ) -> pd.DataFrame:
+        """Optimizes all cases in a process pool and summarizes their KPIs.
+        The results of every case are stored in the attribute `results` in the order of the cases.
+
+        Parameters
+        ----------
+        max_workers : int | None, optional
+            Number of worker processes, by default None (number of available cores)
+        use_solver : SupportedSolver, optional
+            Solver to be used for the optimization, by default SupportedSolver.HIGHS
+        solver_executable : str | None, optional
+            Path of the solver's executable, by default None
+        backend : ModelBackend, optional
+            Backend used to build the optimization models, by default ModelBackend.PYOMO
+        n_typical_periods : int | None, optional
+            Number of representative periods to aggregate the time series to, by default None
+        typical_period_length : int, optional
+            Number of hours of one representative period, by default 24
+        warm_start : bool, optional
+            Whether every worker process starts the solver from the solution of the most similar case
+            it has already solved, by default False
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per case containing the overridden values (columns ``<component>.<attribute>``),
+            the optimization status, the KPIs of the target scenario and the KPIs of the
+            current scenario (columns prefixed with ``current_``)
+        """
+
+        if max_workers is None:
+            max_workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+
+        run_kwargs = {
+            "use_solver": use_solver,
+            "solver_executable": solver_executable,
+            "backend": backend,
+            "n_typical_periods": n_typical_periods,
+            "typical_period_length": typical_period_length,
+            "warm_start": warm_start,
+        }
+
+        logger.info(f"Run parameter sweep with {len(self.cases)} cases on {max_workers} worker processes")
+
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, max(len(self.cases), 1)),
+            initializer=_init_worker,
+            initargs=(self.input_components,),
+        ) as executor:
+            self.results = list(
+                executor.map(_solve_case, self.cases, itertools.repeat(run_kwargs))
+            )
+
+        return self.summary()
+
+    def summary(self) -> pd.DataFrame:
+        """Summarizes the overridden values, status and KPIs of all solved cases in a table.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per case
+        """
+
+        kpi_names = list(OptimizationResultsScenarioKpis.model_fields)
+
+        rows = []
+        for case, results in zip(self.cases, self.results):
+            row = {
+                f"{name}.{attribute}": value
+                for name, overrides in case.items()
+                for attribute, value in overrides.items()
+            }
+            row["status"] = results.status.status.value
+
+            for prefix, scenario in [("", results.target_scenario), ("current_", results.current_scenario)]:
+                for kpi_name in kpi_names:
+                    row[f"{prefix}{kpi_name}"] = None if scenario is None else getattr(scenario.kpis, kpi_name)
+
+            rows.append(row)
+
+        return pd.DataFrame(rows)
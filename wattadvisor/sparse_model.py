@@ -0,0 +1,560 @@
+"""Contains a linear program representation which is assembled from sparse
+coefficient blocks contributed by the components and solved directly with HiGHS,
+bypassing the creation of pyomo expression objects.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Literal
+
+import numpy as np
+
+from .utils.lazy_import import lazy_import
+
+
+highspy = lazy_import("highspy")
+sparse = lazy_import("scipy.sparse")
+logger = logging.getLogger()
+
+
+class SparseVariable:
+    """Group of columns of a ``SparseModel``, either a single scalar column
+    or one column per time step.
+
+    Mimics the parts of the pyomo variable interface which are used for result
+    generation (``value``, ``extract_values()``, ``fix()`` and ``name``).
+
+    Parameters
+    ----------
+    model : SparseModel
+        Model the columns belong to
+    name : str
+        Name of the variable
+    columns : np.ndarray
+        Indices of the columns in the model, ``-1`` marks a missing column
+    indexed : bool
+        Whether the variable holds one column per time step
+    """
+
+    def __init__(self, model: SparseModel, name: str, columns: np.ndarray, indexed: bool):
+        self._model = model
+        self.name = name
+        self.columns = columns
+        self.indexed = indexed
+
+    @property
+    def values(self) -> np.ndarray:
+        """Returns the solution values of all columns of the variable.
+
+        Returns
+        -------
+        np.ndarray
+            Solution values, ``nan`` if the model has not been solved yet
+        """
+
+        return self._model.get_column_values(self.columns)
+
+    @property
+    def value(self) -> float | None:
+        """Returns the solution value of a scalar variable.
+
+        Returns
+        -------
+        float | None
+            Solution value or None if the model has not been solved yet
+        """
+
+        value = self.values[0]
+
+        if np.isnan(value):
+            return None
+
+        return float(value)
+
+    def extract_values(self) -> dict[int, float]:
+        """Returns the solution values of the variable indexed by time step,
+        starting at 1 like the pyomo time set.
+
+        Returns
+        -------
+        dict[int, float]
+            Solution value per time step
+        """
+
+        return dict(zip(range(1, len(self.columns) + 1), self.values.tolist()))
+
+    def fix(self, value: float) -> None:
+        """Fixes all columns of the variable to the given value.
+
+        Parameters
+        ----------
+        value : float
+            Value to fix the columns to
+        """
+
+        self._model.change_column_bounds(self.columns, value, value)
+
+    def lag(self, first: SparseVariable | None = None) -> SparseVariable:
+        """Returns a view on the columns of the previous time step.
+
+        Parameters
+        ----------
+        first : SparseVariable | None, optional
+            Scalar variable used in place of the previous time step for the first time step.
+            If None, the first time step has no previous column, by default None
+
+        Returns
+        -------
+        SparseVariable
+            Unregistered variable view with the shifted columns
+        """
+
+        first_column = -1 if first is None else first.columns[0]
+        columns = np.concatenate(([first_column], self.columns[:-1]))
+
+        return SparseVariable(self._model, f"{self.name}_lag", columns, True)
+
+
+class SparseParameter:
+    """Time series of constant values used on the bilance side of a ``SparseModel``,
+    e.g. an energy demand. Mimics ``extract_values()`` and ``name`` of pyomo parameters.
+
+    Parameters
+    ----------
+    name : str
+        Name of the parameter
+    values : np.ndarray
+        Value per time step
+    """
+
+    def __init__(self, name: str, values: np.ndarray):
+        self.name = name
+        self.values = values
+
+    def extract_values(self) -> dict[int, float]:
+        """Returns the values of the parameter indexed by time step, starting at 1.
+
+        Returns
+        -------
+        dict[int, float]
+            Value per time step
+        """
+
+        return dict(zip(range(1, len(self.values) + 1), self.values.tolist()))
+
+
+class SparseModel:
+    """Linear program which is built from blocks of sparse coefficients
+    and passed as a CSR matrix directly to HiGHS.
+
+    Parameters
+    ----------
+    n_time_steps : int
+        Number of time steps of all time-indexed variables
+    """
+
+    def __init__(self, n_time_steps: int):
+        self.n_time_steps = n_time_steps
+        self.variables: dict[str, SparseVariable] = {}
+        self.parameters: dict[str, SparseParameter] = {}
+        self.constraints: dict[str, slice] = {}
+        self.objective_value: float | None = None
+
+        self._n_columns = 0
+        self._column_lower = []
+        self._column_upper = []
+        self._objective_terms = []
+        self._n_rows = 0
+        self._row_lower = []
+        self._row_upper = []
+        self._entries_rows = []
+        self._entries_columns = []
+        self._entries_values = []
+        self._solution = None
+        self._highs = None
+
+    @property
+    def n_columns(self) -> int:
+        """Number of columns (variables) of the model"""
+        return self._n_columns
+
+    @property
+    def n_rows(self) -> int:
+        """Number of rows (constraints) of the model"""
+        return self._n_rows
+
+    def row_nonzeros(self) -> np.ndarray:
+        """Returns the number of nonzero coefficients of every row.
+
+        Returns
+        -------
+        np.ndarray
+            Number of nonzeros per row
+        """
+
+        if len(self._entries_rows) == 0:
+            return np.zeros(self._n_rows, dtype=int)
+
+        return np.bincount(np.concatenate(self._entries_rows), minlength=self._n_rows)
+
+    def add_variable(
+        self,
+        name: str,
+        indexed: bool = False,
+        bounds: tuple[float | np.ndarray | None, float | np.ndarray | None] = (None, None),
+    ) -> SparseVariable:
+        """Adds a scalar or a time-indexed variable to the model.
+
+        Parameters
+        ----------
+        name : str
+            Unique name of the variable
+        indexed : bool, optional
+            Whether one column per time step should be created, by default False
+        bounds : tuple[float | np.ndarray | None, float | np.ndarray | None], optional
+            Lower and upper bound of the variable, None stands for unbounded, by default (None, None)
+
+        Returns
+        -------
+        SparseVariable
+            The added variable
+
+        Raises
+        ------
+        ValueError
+            If a variable with the same name already exists
+        """
+
+        if name in self.variables:
+            raise ValueError(f"Variable '{name}' already exists in the model.")
+
+        size = self.n_time_steps if indexed else 1
+        lower, upper = bounds
+
+        columns = np.arange(self._n_columns, self._n_columns + size)
+        self._n_columns += size
+        self._column_lower.append(_broadcast_bound(lower, size, -highspy.kHighsInf))
+        self._column_upper.append(_broadcast_bound(upper, size, highspy.kHighsInf))
+
+        variable = SparseVariable(self, name, columns, indexed)
+        self.variables[name] = variable
+
+        return variable
+
+    def add_parameter(self, name: str, values: np.ndarray) -> SparseParameter:
+        """Adds a time series of constant values to the model.
+
+        Parameters
+        ----------
+        name : str
+            Unique name of the parameter
+        values : np.ndarray
+            Value per time step
+
+        Returns
+        -------
+        SparseParameter
+            The added parameter
+        """
+
+        parameter = SparseParameter(name, np.ascontiguousarray(values, dtype=float))
+        self.parameters[name] = parameter
+
+        return parameter
+
+    def add_constraints(
+        self,
+        name: str,
+        terms: list[tuple[SparseVariable, float | np.ndarray]],
+        sense: Literal["==", "<=", ">="],
+        rhs: float | np.ndarray = 0,
+    ) -> None:
+        """Adds a family of constraints with one row per element of the
+        time-indexed variables in `terms`. Scalar variables are part of every row.
+
+        Parameters
+        ----------
+        name : str
+            Unique name of the constraint family
+        terms : list[tuple[SparseVariable, float | np.ndarray]]
+            Variables and their coefficients, either one for all rows or one per row
+        sense : Literal["==", "<=", ">="]
+            Relation between the weighted sum of `terms` and `rhs`
+        rhs : float | np.ndarray, optional
+            Right hand side, either one for all rows or one per row, by default 0
+        """
+
+        n_rows = 1
+        for variable, coefficient in terms:
+            if variable.indexed:
+                n_rows = max(n_rows, len(variable.columns))
+            n_rows = max(n_rows, np.size(coefficient))
+
+        row_indices = np.arange(self._n_rows, self._n_rows + n_rows)
+
+        for variable, coefficient in terms:
+            if variable.indexed:
+                columns = variable.columns
+            else:
+                columns = np.full(n_rows, variable.columns[0])
+
+            self._add_entries(row_indices, columns, coefficient)
+
+        self._add_rows(name, n_rows, sense, rhs)
+
+    def add_constraint(
+        self,
+        name: str,
+        terms: list[tuple[SparseVariable, float | np.ndarray]],
+        sense: Literal["==", "<=", ">="],
+        rhs: float = 0,
+    ) -> None:
+        """Adds a single constraint row in which all columns of the variables in `terms`
+        are summed up, e.g. to sum up time-indexed cost over the whole time span.
+
+        Parameters
+        ----------
+        name : str
+            Unique name of the constraint
+        terms : list[tuple[SparseVariable, float | np.ndarray]]
+            Variables and their coefficients, either one for all columns or one per column
+        sense : Literal["==", "<=", ">="]
+            Relation between the weighted sum of `terms` and `rhs`
+        rhs : float, optional
+            Right hand side, by default 0
+        """
+
+        for variable, coefficient in terms:
+            self._add_entries(
+                np.full(len(variable.columns), self._n_rows), variable.columns, coefficient
+            )
+
+        self._add_rows(name, 1, sense, rhs)
+
+    def set_objective(self, terms: list[tuple[SparseVariable, float | np.ndarray]]) -> None:
+        """Sets the cost vector of the objective, which is minimized.
+
+        Parameters
+        ----------
+        terms : list[tuple[SparseVariable, float | np.ndarray]]
+            Variables and their cost coefficients
+        """
+
+        self._objective_terms = terms
+
+    def find_component(self, name: str) -> SparseVariable | SparseParameter | None:
+        """Returns the variable or parameter of the given name.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable or parameter
+
+        Returns
+        -------
+        SparseVariable | SparseParameter | None
+            The variable or parameter, None if the model contains no object with this name
+        """
+
+        if name in self.variables:
+            return self.variables[name]
+
+        return self.parameters.get(name)
+
+    def get_column_values(self, columns: np.ndarray) -> np.ndarray:
+        """Returns the solution values of the given columns.
+
+        Parameters
+        ----------
+        columns : np.ndarray
+            Indices of the columns
+
+        Returns
+        -------
+        np.ndarray
+            Solution values, ``nan`` if the model has not been solved yet
+        """
+
+        if self._solution is None:
+            return np.full(len(columns), np.nan)
+
+        return self._solution[columns]
+
+    def get_basis(self) -> highspy.HighsBasis | None:
+        """Returns the basis of the last solve, which can be passed to ``solve`` of a model with the same structure.
+
+        Returns
+        -------
+        highspy.HighsBasis | None
+            Basis of the last solve, None if the model has not been solved yet or HiGHS has no valid basis
+        """
+
+        if self._highs is None:
+            return None
+
+        basis = self._highs.getBasis()
+
+        return basis if basis.valid else None
+
+    def change_column_bounds(self, columns: np.ndarray, lower: float, upper: float) -> None:
+        """Changes the bounds of the given columns, also on an already created solver instance,
+        so that a subsequent call to ``solve`` does not need to pass the model again.
+
+        Parameters
+        ----------
+        columns : np.ndarray
+            Indices of the columns
+        lower : float
+            New lower bound
+        upper : float
+            New upper bound
+        """
+
+        column_lower = np.concatenate(self._column_lower)
+        column_upper = np.concatenate(self._column_upper)
+        column_lower[columns] = lower
+        column_upper[columns] = upper
+        self._column_lower = [column_lower]
+        self._column_upper = [column_upper]
+
+        if self._highs is not None:
+            for column in columns:
+                self._highs.changeColBounds(int(column), lower, upper)
+
+    def to_highs_lp(self) -> highspy.HighsLp:
+        """Assembles all coefficient blocks into one CSR matrix and creates the HiGHS model.
+
+        Returns
+        -------
+        highspy.HighsLp
+            The linear program
+        """
+
+        matrix = sparse.csr_matrix(
+            (
+                np.concatenate(self._entries_values),
+                (np.concatenate(self._entries_rows), np.concatenate(self._entries_columns)),
+            ),
+            shape=(self._n_rows, self._n_columns),
+        )
+
+        cost = np.zeros(self._n_columns)
+        for variable, coefficient in self._objective_terms:
+            cost[variable.columns] += coefficient
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = self._n_columns
+        lp.num_row_ = self._n_rows
+        lp.col_cost_ = cost
+        lp.col_lower_ = np.concatenate(self._column_lower)
+        lp.col_upper_ = np.concatenate(self._column_upper)
+        lp.row_lower_ = np.concatenate(self._row_lower)
+        lp.row_upper_ = np.concatenate(self._row_upper)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.num_col_ = self._n_columns
+        lp.a_matrix_.num_row_ = self._n_rows
+        lp.a_matrix_.start_ = matrix.indptr
+        lp.a_matrix_.index_ = matrix.indices
+        lp.a_matrix_.value_ = matrix.data
+
+        return lp
+
+    def solve(
+        self,
+        stream_solver: bool = True,
+        time_limit: float | None = None,
+        warm_start: bool = False,
+        threads: int | None = None,
+        basis: highspy.HighsBasis | None = None,
+    ) -> highspy.HighsModelStatus:
+        """Solves the model with HiGHS. The first call passes the assembled model to a new solver instance,
+        subsequent calls reuse this instance including all bound changes made in between.
+
+        Parameters
+        ----------
+        stream_solver : bool, optional
+            Whether the solver output should be printed, by default True
+        time_limit : float | None, optional
+            Time in seconds after which the solver should be aborted, by default None
+        warm_start : bool, optional
+            Whether a subsequent call should start from the basis of the previous solve. HiGHS skips
+            presolve if a basis exists, which is usually slower after bounds of investment variables
+            were fixed, by default False
+        threads : int | None, optional
+            Maximum number of threads HiGHS may use, by default None (default of HiGHS)
+        basis : highspy.HighsBasis | None, optional
+            Basis of a similar model to start the simplex method from, e.g. from `get_basis`
+            of a previously solved model with the same structure, by default None
+
+        Returns
+        -------
+        highspy.HighsModelStatus
+            Status of the solver after the solve
+        """
+
+        if self._highs is None:
+            self._highs = highspy.Highs()
+            self._highs.passModel(self.to_highs_lp())
+        elif not warm_start:
+            self._highs.clearSolver()
+
+        self._highs.setOptionValue("log_to_console", stream_solver)
+        if time_limit is not None:
+            self._highs.setOptionValue("time_limit", float(time_limit))
+        if threads is not None:
+            self._highs.setOptionValue("threads", int(threads))
+        if basis is not None and self._highs.setBasis(basis) != highspy.HighsStatus.kOk:
+            logger.warning("Basis could not be set")
+
+        self._highs.run()
+        status = self._highs.getModelStatus()
+
+        if self._highs.getInfo().primal_solution_status == highspy.SolutionStatus.kSolutionStatusFeasible:
+            self._solution = np.asarray(self._highs.getSolution().col_value)
+            self.objective_value = self._highs.getInfo().objective_function_value
+        else:
+            self._solution = None
+            self.objective_value = None
+
+        logger.debug(f"HiGHS finished with status '{self._highs.modelStatusToString(status)}'")
+
+        return status
+
+    def _add_entries(self, rows: np.ndarray, columns: np.ndarray, coefficient: float | np.ndarray) -> None:
+        values = np.broadcast_to(np.asarray(coefficient, dtype=float), rows.shape)
+        mask = (columns >= 0) & (values != 0)
+
+        self._entries_rows.append(rows[mask])
+        self._entries_columns.append(columns[mask])
+        self._entries_values.append(values[mask])
+
+    def _add_rows(self, name: str, n_rows: int, sense: Literal["==", "<=", ">="], rhs: float | np.ndarray) -> None:
+        if name in self.constraints:
+            raise ValueError(f"Constraint '{name}' already exists in the model.")
+
+        rhs = np.broadcast_to(np.asarray(rhs, dtype=float), (n_rows,))
+
+        if sense == "==":
+            lower, upper = rhs, rhs
+        elif sense == "<=":
+            lower, upper = np.full(n_rows, -highspy.kHighsInf), rhs
+        elif sense == ">=":
+            lower, upper = rhs, np.full(n_rows, highspy.kHighsInf)
+        else:
+            raise ValueError(f"Unknown constraint sense '{sense}'.")
+
+        self._row_lower.append(lower)
+        self._row_upper.append(upper)
+        self.constraints[name] = slice(self._n_rows, self._n_rows + n_rows)
+        self._n_rows += n_rows
+
+
+def _broadcast_bound(bound: float | np.ndarray | None, size: int, default: float) -> np.ndarray:
+    if bound is None:
+        return np.full(size, default)
+
+    return np.broadcast_to(np.asarray(bound, dtype=float), (size,)).copy()
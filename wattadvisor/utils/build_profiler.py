@@ -0,0 +1,204 @@
+"""Contains a profiler for the build of optimization models, which records the time, the allocated memory
+and the number of created model objects of every build phase per component.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator
+
+import pandas as pd
+
+from ..sparse_model import SparseModel
+
+if TYPE_CHECKING:
+    import pyomo.environ as pyoe
+
+
+logger = logging.getLogger()
+
+# profiler the build phases are currently reported to
+_active_profiler: ContextVar[BuildProfiler | None] = ContextVar("_active_profiler", default=None)
+
+
+@contextmanager
+def build_phase(
+    component_class: str, component_name: str, phase: str, model: pyoe.Model | SparseModel
+) -> Iterator[None]:
+    """Context manager around a phase of the model build (e.g. ``_add_variables`` of a component),
+    which reports the phase to the active `BuildProfiler`. Does nothing if no profiler is active.
+
+    Parameters
+    ----------
+    component_class : str
+        Class name of the component the phase belongs to, e.g. ``HeatPumpAir``
+    component_name : str
+        Name of the component instance
+    phase : str
+        Name of the build phase, e.g. ``load_params``
+    model : pyoe.Model | SparseModel
+        Model which is built
+    """
+
+    profiler = _active_profiler.get()
+
+    if profiler is None:
+        yield
+        return
+
+    with profiler.phase(component_class, component_name, phase, model):
+        yield
+
+
+def _count_objects(model: pyoe.Model | SparseModel) -> tuple[int, int]:
+    """Returns the number of objects of a model and the number of their elements
+    (e.g. pyomo components and their indices or sparse variables and their columns)."""
+
+    if isinstance(model, SparseModel):
+        return (
+            len(model.variables) + len(model.parameters) + len(model.constraints),
+            model.n_columns + model.n_rows,
+        )
+
+    objects = list(model.component_objects(descend_into=False))
+
+    return len(objects), sum(len(obj) if obj.is_indexed() else 1 for obj in objects)
+
+
+class BuildProfiler:
+    def __init__(self, trace_memory: bool = True):
+        """Profiles the build of optimization models. While the profiler is active, every build phase
+        of every component (loading parameters, adding variables, adding constraints) and the energy balances
+        are recorded with their wall time, net allocated memory and number of created model objects.
+
+        .. code-block:: python
+
+            with BuildProfiler() as profiler:
+                OptModel(components).run_calculation()
+
+            print(profiler.report())
+
+        Parameters
+        ----------
+        trace_memory : bool, optional
+            Whether allocated memory is traced with ``tracemalloc``, by default True.
+            Tracing slows down the build considerably.
+        """
+
+        self.trace_memory = trace_memory
+        self.records: list[dict] = []
+        self._token = None
+        self._started_tracing = False
+
+    def __enter__(self) -> BuildProfiler:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        self._token = _active_profiler.set(self)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_profiler.reset(self._token)
+        self._token = None
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(
+        self, component_class: str, component_name: str, phase: str, model: pyoe.Model | SparseModel
+    ) -> Iterator[None]:
+        """Context manager recording one build phase.
+
+        Parameters
+        ----------
+        component_class : str
+            Class name of the component the phase belongs to
+        component_name : str
+            Name of the component instance
+        phase : str
+            Name of the build phase
+        model : pyoe.Model | SparseModel
+            Model which is built
+        """
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+
+        objects_start, elements_start = _count_objects(model)
+        memory_start = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+
+        yield
+
+        wall_time = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] - memory_start if tracing else float("nan")
+        objects_end, elements_end = _count_objects(model)
+
+        self.records.append(
+            {
+                "component_class": component_class,
+                "component_name": component_name,
+                "phase": phase,
+                "wall_time": wall_time,
+                "memory": memory,
+                "n_objects": objects_end - objects_start,
+                "n_elements": elements_end - elements_start,
+            }
+        )
+
+    def report(self, by: str = "component_class") -> pd.DataFrame:
+        """Aggregates the recorded build phases, sorted by descending wall time.
+
+        Parameters
+        ----------
+        by : str, optional
+            Column to aggregate by, either ``component_class``, ``component_name`` or ``phase``,
+            by default ``component_class``
+
+        Returns
+        -------
+        pd.DataFrame
+            Wall time [s], net allocated memory [bytes] (``nan`` if memory is not traced), number of created
+            model objects and their elements, number of profiled component instances and share of the total
+            wall time per group
+        """
+
+        columns = ["wall_time", "memory", "n_objects", "n_elements"]
+
+        records = pd.DataFrame(
+            self.records, columns=["component_class", "component_name", "phase"] + columns
+        )
+
+        report = records.groupby(by).agg(
+            wall_time=("wall_time", "sum"),
+            memory=("memory", lambda memory: memory.sum(min_count=1)),
+            n_objects=("n_objects", "sum"),
+            n_elements=("n_elements", "sum"),
+            n_instances=("component_name", "nunique"),
+        )
+
+        total_wall_time = report["wall_time"].sum()
+        report["wall_time_share"] = report["wall_time"] / total_wall_time if total_wall_time > 0 else 0.0
+
+        return report.sort_values("wall_time", ascending=False)
+
+    def log_report(self, by: str = "component_class"):
+        """Logs the aggregated build phases, see `report`.
+
+        Parameters
+        ----------
+        by : str, optional
+            Column to aggregate by, by default ``component_class``
+        """
+
+        logger.info(f"Model build profile:\n{self.report(by).to_string()}")
@@ -4,11 +4,12 @@ Use of this source code is governed by a BSD-style license that can be found in
 
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 
 
-def calc_cops(mode: Literal["heat_pump", "chiller"], temp_high: list | pd.Series, temp_low: list | pd.Series, quality_grade: float, temp_threshold_icing: float = 2,
-              factor_icing: float | None = None) -> list:
+def calc_cops(mode: Literal["heat_pump", "chiller"], temp_high: list | pd.Series | np.ndarray, temp_low: list | pd.Series | np.ndarray, quality_grade: float, temp_threshold_icing: float = 2,
+              factor_icing: float | None = None) -> np.ndarray:
 
     r"""
     Calculates the Coefficient of Performance (COP) of heat pumps and chillers
@@ -38,9 +39,9 @@ def calc_cops(mode: Literal["heat_pump", "chiller"], temp_high: list | pd.Series
 
     Parameters
     ----------
-    temp_high : list or pandas.Series of numerical values
+    temp_high : list, pandas.Series or numpy.ndarray of numerical values
         Temperature of the high temperature reservoir [°C]
-    temp_low : list or pandas.Series of numerical values
+    temp_low : list, pandas.Series or numpy.ndarray of numerical values
         Temperature of the low temperature reservoir [°C]
     quality_grade : numerical value
         Factor that scales down the efficiency of the real heat pump
@@ -57,18 +58,18 @@ def calc_cops(mode: Literal["heat_pump", "chiller"], temp_high: list | pd.Series
 
     Returns
     -------
-    cops : list of numerical values
-        List of Coefficients of Performance (COPs)
+    cops : numpy.ndarray of numerical values
+        Array of Coefficients of Performance (COPs)
 
 
     """
     # Check if input arguments have proper type and length
-    if not isinstance(temp_low, (list, pd.Series)):
-        raise TypeError("Argument 'temp_low' is not of type list or pd.Series!")
+    if not isinstance(temp_low, (list, pd.Series, np.ndarray)):
+        raise TypeError("Argument 'temp_low' is not of type list, pd.Series or np.ndarray!")
 
-    if not isinstance(temp_high, (list, pd.Series)):
+    if not isinstance(temp_high, (list, pd.Series, np.ndarray)):
         raise TypeError("Argument 'temp_high' is not of "
-                        "type list or pd.Series!")
+                        "type list, pd.Series or np.ndarray!")
 
     if len(temp_high) != len(temp_low):
         if (len(temp_high) != 1) and ((len(temp_low) != 1)):
@@ -76,46 +77,97 @@ def calc_cops(mode: Literal["heat_pump", "chiller"], temp_high: list | pd.Series
                              "have to be of same length or one has "
                              "to be of length 1 !")
 
-    # if factor_icing is not None and consider_icing is False:
-    #     raise ValueError('Argument factor_icing can not be used without '
-    #                      'setting consider_icing=True!')
-    #
-    # if factor_icing is None and consider_icing is True:
-    #     raise ValueError('Icing cannot be considered because argument '
-    #                      'factor_icing has value None!')
-
-    # Make temp_low and temp_high have the same length and
-    # convert unit to Kelvin.
-    length = max([len(temp_high), len(temp_low)])
-    if len(temp_high) == 1:
-        list_temp_high_K = [temp_high[0] + 273.15] * length
-    elif len(temp_high) == length:
-        list_temp_high_K = [t + 273.15 for t in temp_high]
-    if len(temp_low) == 1:
-        list_temp_low_K = [temp_low[0] + 273.15] * length
-    elif len(temp_low) == length:
-        list_temp_low_K = [t + 273.15 for t in temp_low]
+    # Convert unit to Kelvin, series of length 1 are broadcast to the length of the other one.
+    temp_high_K = np.asarray(temp_high, dtype=float).ravel() + 273.15
+    temp_low_K = np.asarray(temp_low, dtype=float).ravel() + 273.15
+
+    return _calc_cops_kelvin(mode, temp_high_K, temp_low_K, quality_grade, temp_threshold_icing, factor_icing)
+
+
+def calc_cops_batch(mode: Literal["heat_pump", "chiller"], temp_high: float | list | np.ndarray, temp_low: list | pd.Series | np.ndarray, quality_grade: float | list | np.ndarray,
+                    temp_threshold_icing: float = 2, factor_icing: float | None = None) -> np.ndarray:
+    """Calculates the COP time series of several heat pump or chiller variants at once,
+    which share the temperature series of the low temperature reservoir.
+    See `calc_cops` for the calculation.
+
+    Parameters
+    ----------
+    mode : Literal["heat_pump", "chiller"]
+        Two possible modes: "heat_pump" or "chiller"
+    temp_high : float | list | np.ndarray
+        Temperature of the high temperature reservoir [°C], either one value per variant (1-D)
+        or one time series per variant (2-D of shape (variants, time steps))
+    temp_low : list | pd.Series | np.ndarray
+        Temperature series of the low temperature reservoir [°C]
+    quality_grade : float | list | np.ndarray
+        Quality grade of all variants or one quality grade per variant
+    temp_threshold_icing : float, optional
+        Temperature [°C] below which icing at heat exchanger occurs, by default 2
+    factor_icing : float | None, optional
+        Relative COP drop caused by icing, by default None
+
+    Returns
+    -------
+    np.ndarray
+        COPs of shape (variants, time steps)
+    """
+
+    temp_high_K = np.asarray(temp_high, dtype=float) + 273.15
+    if temp_high_K.ndim < 2:
+        temp_high_K = temp_high_K.reshape(-1, 1)
+
+    temp_low_K = np.asarray(temp_low, dtype=float).reshape(1, -1) + 273.15
+
+    quality_grade = np.asarray(quality_grade, dtype=float)
+    if quality_grade.ndim == 1:
+        quality_grade = quality_grade.reshape(-1, 1)
+
+    return _calc_cops_kelvin(mode, temp_high_K, temp_low_K, quality_grade, temp_threshold_icing, factor_icing)
+
+
+def _calc_cops_kelvin(mode: Literal["heat_pump", "chiller"], temp_high_K: np.ndarray, temp_low_K: np.ndarray, quality_grade: float | np.ndarray,
+                      temp_threshold_icing: float, factor_icing: float | None) -> np.ndarray:
+    """Calculates COPs from temperatures in Kelvin using NumPy broadcasting.
+
+    Parameters
+    ----------
+    mode : Literal["heat_pump", "chiller"]
+        Two possible modes: "heat_pump" or "chiller"
+    temp_high_K : np.ndarray
+        Temperature of the high temperature reservoir [K]
+    temp_low_K : np.ndarray
+        Temperature of the low temperature reservoir [K]
+    quality_grade : float | np.ndarray
+        Factor that scales down the efficiency of the real process from the ideal process
+    temp_threshold_icing : float
+        Temperature [°C] below which icing at heat exchanger occurs
+    factor_icing : float | None
+        Relative COP drop caused by icing
+
+    Returns
+    -------
+    np.ndarray
+        COPs broadcast to the shape of the given temperatures
+    """
 
     # Calculate COPs depending on selected mode (without icing).
     if factor_icing is None:
         if mode == "heat_pump":
-            cops = [quality_grade * t_h / (t_h - t_l) for
-                    t_h, t_l in zip(list_temp_high_K, list_temp_low_K)]
+            cops = quality_grade * temp_high_K / (temp_high_K - temp_low_K)
         elif mode == "chiller":
-            cops = [quality_grade * t_l / (t_h - t_l) for
-                    t_h, t_l in zip(list_temp_high_K, list_temp_low_K)]
+            cops = quality_grade * temp_low_K / (temp_high_K - temp_low_K)
 
     # Calculate COPs of a heat pump and lower COP when icing occurs.
-    elif factor_icing is not None:
+    else:
         if mode == "heat_pump":
-            cops = []
-            for t_h, t_l in zip(list_temp_high_K, list_temp_low_K):
-                if t_l < temp_threshold_icing + 273.15:
-                    f_icing = factor_icing
-                    cops = cops + [f_icing * quality_grade * t_h / (t_h - t_l)]
-                if t_l >= temp_threshold_icing + 273.15:
-                    cops = cops + [quality_grade * t_h / (t_h - t_l)]
+            icing = temp_low_K < temp_threshold_icing + 273.15
+            cops = np.where(
+                icing,
+                factor_icing * quality_grade * temp_high_K,
+                quality_grade * temp_high_K,
+            ) / (temp_high_K - temp_low_K)
         elif mode == "chiller":
             raise ValueError("Argument 'factor_icing' has "
                              "to be None for mode='chiller'!")
+
     return cops
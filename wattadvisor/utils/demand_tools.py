@@ -5,13 +5,18 @@ Use of this source code is governed by a BSD-style license that can be found in
 """
 
 import datetime
+from functools import lru_cache
 from typing import Literal
 
-import demandlib.bdew as bdew
-import holidays
 import pandas as pd
 
 from ..data_models.enums import Resolution
+from .lazy_import import lazy_import
+from .profile_cache import DemandProfileCache
+
+
+bdew = lazy_import("demandlib.bdew")
+holidays = lazy_import("holidays")
 
 
 def _generate_holiday_calendar(
@@ -37,6 +42,32 @@ def _generate_holiday_calendar(
     ValueError
         If unknown country code is submitted
     """
+
+    return dict(_country_holidays(year, country))
+
+
+@lru_cache(maxsize=64)
+def _country_holidays(year: int, country: str) -> dict[datetime.date, str]:
+    """Creates the holiday calendar for `_generate_holiday_calendar` once per year and country.
+
+    Parameters
+    ----------
+    year : int
+        Year to generate the calendar for
+    country : str
+        Country to generate the calendar for
+
+    Returns
+    -------
+    dict[datetime.date, str]
+        Holiday calendar, which must not be modified
+
+    Raises
+    ------
+    ValueError
+        If unknown country code is submitted
+    """
+
     try:
         holidays_dict = holidays.country_holidays(country, years=year)
     except NotImplementedError:
@@ -44,9 +75,7 @@ def _generate_holiday_calendar(
             f"Wrong Countrycode submitted. Calendar for Country '{country}' not found."
         )
 
-    holidays_dict = dict(holidays_dict)
-
-    return holidays_dict
+    return dict(holidays_dict)
 
 
 def generate_electrical_demand_profile(
@@ -71,6 +100,8 @@ def generate_electrical_demand_profile(
     target_resolution: Resolution = Resolution.R1H,
 ) -> pd.Series:
     """Generates an hourly electrical energy demand profile based on a yearly electrical energy demand sum.
+    Profiles are linear in the demand sum, so the profile normalized to a demand sum of 1 is generated
+    once per demand group, year and resolution, cached by `DemandProfileCache` and scaled.
 
     Parameters
     ----------
@@ -89,17 +120,32 @@ def generate_electrical_demand_profile(
         Hourly electrical energy demand profile
     """
 
-    demands = {demand_group: demand_amount}
+    cache_key = DemandProfileCache.create_key(
+        {
+            "profile": "electrical",
+            "demand_group": demand_group,
+            "year": year,
+            "resolution": target_resolution.value,
+        },
+        [],
+    )
+
+    demand_profile = DemandProfileCache.get(cache_key)
+
+    if demand_profile is None:
+        demands = {demand_group: 1.0}
 
-    holidays = _generate_holiday_calendar(year)
+        holidays = _generate_holiday_calendar(year)
 
-    slp = bdew.ElecSlp(year, holidays=holidays)
+        slp = bdew.ElecSlp(year, holidays=holidays)
 
-    demand_profile = slp.get_profile(demands)[demand_group]
+        demand_profile = slp.get_profile(demands)[demand_group]
 
-    demand_profile = demand_profile.resample(target_resolution.value).mean()
+        demand_profile = demand_profile.resample(target_resolution.value).mean()
 
-    return demand_profile
+        DemandProfileCache.put(cache_key, demand_profile)
+
+    return demand_profile * demand_amount
 
 
 def generate_heat_demand_profile(
@@ -126,6 +172,9 @@ def generate_heat_demand_profile(
     wind_class: int = 0,
 ) -> pd.Series:
     """Generates an hourly heat demand profile based on a yearly heat demand sum.
+    Profiles are linear in the demand sum, so the profile normalized to a demand sum of 1 is generated
+    once per demand group, year, temperature series, building class and wind class, cached by
+    `DemandProfileCache` and scaled.
 
     Parameters
     ----------
@@ -158,21 +207,37 @@ def generate_heat_demand_profile(
         if building_class < 0 or building_class > 11:
             raise ValueError("Parameter building_class must be between 1 and 11")
 
-    holidays = _generate_holiday_calendar(year)
-
-    index = pd.date_range(
-        datetime.datetime(year, 1, 1, 0), datetime.datetime(year, 12, 31, 23), freq="h"
+    cache_key = DemandProfileCache.create_key(
+        {
+            "profile": "heat",
+            "demand_group": demand_group,
+            "year": year,
+            "building_class": building_class,
+            "wind_class": wind_class,
+        },
+        [temperature_series],
     )
 
-    demand_profile = bdew.HeatBuilding(
-        index,
-        holidays=holidays,
-        temperature=temperature_series,
-        shlp_type=demand_group,
-        wind_class=wind_class,
-        annual_heat_demand=demand_amount,
-        ww_incl=True,
-        building_class=building_class,
-    ).get_bdew_profile()
-
-    return demand_profile
+    demand_profile = DemandProfileCache.get(cache_key)
+
+    if demand_profile is None:
+        holidays = _generate_holiday_calendar(year)
+
+        index = pd.date_range(
+            datetime.datetime(year, 1, 1, 0), datetime.datetime(year, 12, 31, 23), freq="h"
+        )
+
+        demand_profile = bdew.HeatBuilding(
+            index,
+            holidays=holidays,
+            temperature=temperature_series,
+            shlp_type=demand_group,
+            wind_class=wind_class,
+            annual_heat_demand=1.0,
+            ww_incl=True,
+            building_class=building_class,
+        ).get_bdew_profile()
+
+        DemandProfileCache.put(cache_key, demand_profile)
+
+    return demand_profile * demand_amount
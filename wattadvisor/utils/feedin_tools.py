@@ -5,16 +5,19 @@ Use of this source code is governed by a BSD-style license that can be found in
 import warnings
 from typing import Literal
 
-import pvlib
-from feedinlib import Photovoltaic, WindPowerPlant
 import pandas as pd
 
 from ..data_models.weather_data import (
     WeatherDataHeightUnspecific,
     WeatherDataHeightSpecific,
 )
+from .lazy_import import lazy_import
+from .profile_cache import FeedinCache
 
 
+feedinlib = lazy_import("feedinlib")
+pvlib = lazy_import("pvlib")
+
 warnings.filterwarnings("ignore")
 
 
@@ -94,6 +97,27 @@ def calculate_pv_feedin(
         time series of power generation values for given weather data time series in `weather_data_df`
     """
 
+    if FeedinCache.is_enabled():
+        cache_key = FeedinCache.create_key(
+            {
+                "plant": "photovoltaic",
+                "latitude": latitude,
+                "longitude": longitude,
+                "azimuth": azimuth,
+                "tilt": tilt,
+                "elevation": elevation,
+                "surface_type": surface_type,
+                "module_type": module_type,
+                "racking_model": racking_model,
+                "normalized": normalized,
+            },
+            [ghi, dhi, dni, air_temperature],
+        )
+
+        feedin = FeedinCache.get(cache_key)
+        if feedin is not None:
+            return feedin
+
     solpos = pvlib.solarposition.get_solarposition(
         ghi.series.index, latitude, longitude, elevation
     )
@@ -113,7 +137,7 @@ def calculate_pv_feedin(
         "racking_model": racking_model,
     }
 
-    pv_system = Photovoltaic(**system_data)
+    pv_system = feedinlib.Photovoltaic(**system_data)
 
     df_columns = [ghi.series, dhi.series, dni]
     df_names = ["ghi", "dhi", "dni"]
@@ -129,10 +153,12 @@ def calculate_pv_feedin(
     feedin = feedin.fillna(0)
 
     if normalized:
-        return feedin / pv_system.peak_power
+        feedin = feedin / pv_system.peak_power
 
-    else:
-        return feedin
+    if FeedinCache.is_enabled():
+        FeedinCache.put(cache_key, feedin)
+
+    return feedin
 
 
 def use_input_weather_data_wind(
@@ -215,6 +241,22 @@ def calculate_windpower_feedin(
         time series of power generation values for given weather data
     """    
 
+    if FeedinCache.is_enabled():
+        cache_key = FeedinCache.create_key(
+            {
+                "plant": "wind_power",
+                "latitude": latitude,
+                "longitude": longitude,
+                "hub_height": hub_height,
+                "normalized": normalized,
+            },
+            [wind_speed, roughness_length, air_temperature, pressure, density],
+        )
+
+        feedin = FeedinCache.get(cache_key)
+        if feedin is not None:
+            return feedin
+
     index_tuples, data = use_input_weather_data_wind(wind_speed, "wind_speed")
     index_tuples, data = use_input_weather_data_wind(
         roughness_length, "roughness_length", index_tuples, data
@@ -231,7 +273,7 @@ def calculate_windpower_feedin(
 
     # use default wind power plant model
     turbine_data = {"turbine_type": "E-101/3050", "hub_height": hub_height}
-    wind_turbine = WindPowerPlant(**turbine_data)
+    wind_turbine = feedinlib.WindPowerPlant(**turbine_data)
 
     new_columns = pd.MultiIndex.from_tuples(index_tuples, names=["variable", "height"])
 
@@ -245,7 +287,9 @@ def calculate_windpower_feedin(
     feedin = feedin.fillna(0)
 
     if normalized == True:
-        return feedin / wind_turbine.nominal_power
+        feedin = feedin / wind_turbine.nominal_power
 
-    else:
-        return feedin
+    if FeedinCache.is_enabled():
+        FeedinCache.put(cache_key, feedin)
+
+    return feedin
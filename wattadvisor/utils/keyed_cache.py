@@ -0,0 +1,253 @@
+"""Contains the base class of the content-addressed caches of WattAdvisor, which keeps entries
+in a least recently used memory and in a directory on disk.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger()
+
+
+class KeyedCache:
+    """Stores entries named by a key (e.g. a hash of the inputs they were calculated from).
+    Entries are kept in memory (up to `memory_size` entries) and, if a directory is configured, as files
+    on disk. If the number of entries in memory or the total size of all files exceeds its maximum,
+    the least recently used entries are deleted.
+
+    Subclasses implement the serialization of entries with `_copy`, `_read` and `_write`
+    and may let entries expire with `_is_expired`. Every subclass holds its own configuration
+    and memory, which are set with `configure`. The memory of a cache is shared by all threads
+    of the process and guarded by a lock.
+    """
+
+    # suffix of the files of the entries on disk
+    _suffix: str = ""
+    # maximum total size of the files on disk [bytes] if not configured
+    _default_max_size: int = 100 * 1024**2
+    _directory: Path | None = None
+    _max_size: int = _default_max_size
+    _memory_size: int = 0
+    _memory: OrderedDict = OrderedDict()
+    _lock: threading.RLock = threading.RLock()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._memory = OrderedDict()
+        cls._lock = threading.RLock()
+        cls._max_size = cls._default_max_size
+
+    @classmethod
+    def configure(
+        cls,
+        directory: str | Path | None = None,
+        max_size: int | None = None,
+        memory_size: int | None = None,
+    ):
+        """Sets the directory of the on-disk cache and the number of entries kept in memory.
+
+        Parameters
+        ----------
+        directory : str | Path | None, optional
+            Directory the cached entries are stored in. Is created if it does not exist.
+            If None, entries are not stored on disk. By default None
+        max_size : int | None, optional
+            Maximum total size of all cached entries on disk [bytes], by default None (default size of the cache)
+        memory_size : int | None, optional
+            Maximum number of entries kept in memory, by default None (unchanged)
+        """
+
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+
+        cls._directory = directory
+        cls._max_size = cls._default_max_size if max_size is None else max_size
+
+        with cls._lock:
+            if memory_size is not None:
+                cls._memory_size = memory_size
+
+            while len(cls._memory) > cls._memory_size:
+                cls._memory.popitem(last=False)
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """Returns whether entries are cached in memory or on disk.
+
+        Returns
+        -------
+        bool
+            True if the cache is enabled
+        """
+
+        return cls._directory is not None or cls._memory_size > 0
+
+    @classmethod
+    def clear(cls, disk: bool = True):
+        """Deletes all entries kept in memory and on disk.
+
+        Parameters
+        ----------
+        disk : bool, optional
+            Whether the entries on disk are deleted as well, by default True
+        """
+
+        with cls._lock:
+            cls._memory.clear()
+
+        if disk and cls._directory is not None:
+            for path in cls._directory.glob(f"*{cls._suffix}"):
+                path.unlink(missing_ok=True)
+
+    @classmethod
+    def get(cls, key: str) -> Any | None:
+        """Loads a cached entry and marks it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry
+
+        Returns
+        -------
+        Any | None
+            Copy of the cached entry or None if the cache contains no unexpired entry for `key`
+        """
+
+        with cls._lock:
+            if key in cls._memory:
+                created, value = cls._memory[key]
+
+                if not cls._is_expired(created):
+                    cls._memory.move_to_end(key)
+                    return cls._copy(value)
+
+                del cls._memory[key]
+
+        if cls._directory is None:
+            return None
+
+        path = cls._path(key)
+
+        try:
+            created, value = cls._read(path)
+
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return None
+
+        if cls._is_expired(created):
+            path.unlink(missing_ok=True)
+            return None
+
+        logger.debug(f"Entry {key} of {cls.__name__} loaded from disk")
+
+        cls._put_memory(key, created, value)
+
+        return cls._copy(value)
+
+    @classmethod
+    def put(cls, key: str, value: Any):
+        """Stores an entry and evicts expired and the least recently used entries
+        if the maximum size of the cache is exceeded.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry
+        value : Any
+            Entry to store
+        """
+
+        created = time.time()
+
+        cls._put_memory(key, created, cls._copy(value))
+
+        if cls._directory is None:
+            return
+
+        path = cls._path(key)
+        temporary_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+        cls._write(temporary_path, created, value)
+
+        # readers of other processes see either no file or the complete file
+        os.replace(temporary_path, path)
+
+        cls._evict()
+
+    @classmethod
+    def _path(cls, key: str) -> Path:
+        return cls._directory.joinpath(f"{key}{cls._suffix}")
+
+    @classmethod
+    def _is_expired(cls, created: float) -> bool:
+        """Returns whether an entry stored at the time `created` [s since epoch] is not used anymore."""
+
+        return False
+
+    @classmethod
+    def _copy(cls, value: Any) -> Any:
+        """Returns a copy of an entry, so that callers cannot change the cached entry."""
+
+        raise NotImplementedError
+
+    @classmethod
+    def _read(cls, path: Path) -> tuple[float, Any]:
+        """Reads the time an entry was stored [s since epoch] and the entry from a file."""
+
+        raise NotImplementedError
+
+    @classmethod
+    def _write(cls, path: Path, created: float, value: Any):
+        """Writes an entry and the time it was stored [s since epoch] to a file."""
+
+        raise NotImplementedError
+
+    @classmethod
+    def _put_memory(cls, key: str, created: float, value: Any):
+        with cls._lock:
+            if cls._memory_size <= 0:
+                return
+
+            cls._memory[key] = (created, value)
+            cls._memory.move_to_end(key)
+
+            while len(cls._memory) > cls._memory_size:
+                cls._memory.popitem(last=False)
+
+    @classmethod
+    def _evict(cls):
+        """Deletes expired entries on disk and the least recently used entries until the total size
+        of the cache is below its maximum size. Files are ordered by their modification time,
+        which is the time they were stored, or were last read if `_read` updates it."""
+
+        entries = []
+        for path in cls._directory.glob(f"*{cls._suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if cls._is_expired(stat.st_mtime):
+                path.unlink(missing_ok=True)
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total_size <= cls._max_size:
+                break
+
+            path.unlink(missing_ok=True)
+            total_size -= size
@@ -0,0 +1,73 @@
+"""Contains a helper to defer the import of heavy third-party modules until they are used,
+so that importing WattAdvisor and starting worker processes stays fast for code paths
+which do not need them (e.g. precomputed profiles do not need pvlib or demandlib).
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Placeholder of a module, which imports the module on the first access of one of its attributes."""
+
+    def __init__(self, name: str):
+        """Creates the placeholder of a module without importing it.
+
+        Parameters
+        ----------
+        name : str
+            Absolute name of the module, e.g. ``pyomo.environ``
+        """
+
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+
+        return module
+
+    def __getattr__(self, attribute: str):
+        value = getattr(self._load(), attribute)
+
+        # later accesses of the attribute are answered from the placeholder without calling __getattr__
+        self.__dict__[attribute] = value
+
+        return value
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Returns a module which is imported on the first access of one of its attributes.
+    If the module has already been imported, the module itself is returned.
+
+    Parameters
+    ----------
+    name : str
+        Absolute name of the module, e.g. ``pyomo.environ``
+
+    Returns
+    -------
+    types.ModuleType
+        The module or a placeholder importing it on first use
+    """
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    return LazyModule(name)
+
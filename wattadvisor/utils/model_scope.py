@@ -0,0 +1,104 @@
+"""Contains scopes which separate the state shared by the components of an optimization
+(automatically generated names and loaded parameters) from the components of other optimizations,
+so that several optimizations can be prepared and solved concurrently in one process.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+
+from .load_YAML import load_yaml
+
+
+# scope the components of the current thread or asyncio task are created in
+_active_scope: ContextVar[ModelScope | None] = ContextVar("_active_scope", default=None)
+
+
+class ModelScope:
+    def __init__(self, parameters: dict | str | Path | None = None):
+        """Creates a scope for the components of one optimization. Components created while the scope
+        is active are named with counters of the scope (e.g. ``Photovoltaik_1``) and get their parameters
+        from the parameter set of the scope instead of the parameter file loaded by `Parameters.load_parameter_file`.
+
+        A scope is active in the thread or asyncio task which entered it. The threads of a thread pool
+        do not inherit the scope of the submitting thread, so every task enters its own scope:
+
+        .. code-block:: python
+
+            def optimize(definition):
+                with ModelScope(parameters=parameters):
+                    components = create_components(definition)
+                    return OptModel(components).run_calculation()
+
+            with ThreadPoolExecutor() as executor:
+                results = list(executor.map(optimize, definitions))
+
+        Components created outside of any scope share one process-wide scope.
+
+        Parameters
+        ----------
+        parameters : dict | str | Path | None, optional
+            Parameters per component class name or path of a YAML parameter file,
+            by default None (parameters loaded by `Parameters.load_parameter_file` are used)
+        """
+
+        if isinstance(parameters, (str, Path)):
+            parameters = load_yaml(Path(parameters).resolve().as_posix())
+
+        self.parameters = parameters
+        self._names_counter: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._token = None
+
+    def __enter__(self) -> ModelScope:
+        self._token = _active_scope.set(self)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_scope.reset(self._token)
+        self._token = None
+
+    @classmethod
+    def current(cls) -> ModelScope:
+        """Returns the scope active in the current thread or asyncio task.
+
+        Returns
+        -------
+        ModelScope
+            Active scope or the process-wide scope if no scope is active
+        """
+
+        scope = _active_scope.get()
+
+        return _default_scope if scope is None else scope
+
+    def next_name(self, class_name: str) -> str:
+        """Returns the next automatically generated name of a component of a class,
+        which is numbered by the number of components of the class named in this scope.
+
+        Parameters
+        ----------
+        class_name : str
+            Name of the component class
+
+        Returns
+        -------
+        str
+            Name of the component, e.g. ``Photovoltaik_1``
+        """
+
+        with self._lock:
+            count = self._names_counter.get(class_name, 0) + 1
+            self._names_counter[class_name] = count
+
+        return f"{class_name}_{count}"
+
+
+# scope of all components which are created outside of an explicitly entered scope
+_default_scope = ModelScope()
@@ -8,6 +8,7 @@ Use of this source code is governed by a BSD-style license that can be found in
 
 from pathlib import Path
 from .load_YAML import load_yaml
+from .model_scope import ModelScope
 
 class Parameters:
     _all_parameters = {}
@@ -33,6 +34,7 @@ class Parameters:
     def get_parameters(cls, component_class_name: str) -> dict:
         """Returns all parameters of a given component class name from the 
         dict in the class variable ``_all_parameters`` containing the loaded parameters. 
+        If a `ModelScope` with its own parameters is active, its parameters are used instead.
         If the dict has no key given by ``component_class_name``, an empty dictionary is returned.
 
         Parameters
@@ -46,7 +48,12 @@ class Parameters:
             parameters of the component class
         """        
         
-        if component_class_name in cls._all_parameters:
-            return cls._all_parameters[component_class_name]
+        all_parameters = ModelScope.current().parameters
+
+        if all_parameters is None:
+            all_parameters = cls._all_parameters
+
+        if component_class_name in all_parameters:
+            return all_parameters[component_class_name]
         else:
             return dict()
\ No newline at end of file
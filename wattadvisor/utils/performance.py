@@ -0,0 +1,208 @@
+"""Contains the recording of the time spent in the phases of an optimization
+(preprocessing, model building, solving and results composition) and of the size of the optimization model.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+from ..data_models.optimization_results_performance import (
+    OptimizationResultsPerformance,
+    OptimizationResultsPhaseTiming,
+    OptimizationResultsModelSize,
+    OptimizationResultsModelStatistics,
+)
+from ..sparse_model import SparseModel
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from ..components.component import Component
+
+
+pyoe = lazy_import("pyomo.environ")
+pyomo_expr = lazy_import("pyomo.core.expr")
+logger = logging.getLogger()
+
+
+def cpu_time() -> float:
+    """Returns the CPU time of the current process including the CPU time of all terminated
+    child processes it has waited for, e.g. solver executables like CBC.
+
+    Returns
+    -------
+    float
+        CPU time [s]
+    """
+
+    times = os.times()
+
+    return time.process_time() + times.children_user + times.children_system
+
+
+class PerformanceRecorder:
+    """Records the wall and CPU time of the phases of an optimization and the size of the optimization model.
+    The times of phases which are recorded more than once under the same name are summed up."""
+
+    def __init__(self):
+        self.phases: dict[str, OptimizationResultsPhaseTiming] = {}
+        self.model_statistics: OptimizationResultsModelStatistics | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager recording the wall and CPU time spent in its body as phase `name`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase, e.g. ``build`` or ``solve_target``
+        """
+
+        wall_start = time.perf_counter()
+        cpu_start = cpu_time()
+
+        try:
+            yield
+
+        finally:
+            self.add_phase(name, time.perf_counter() - wall_start, cpu_time() - cpu_start)
+
+    def add_phase(self, name: str, wall_time: float, cpu_time: float):
+        """Adds the times of a phase measured elsewhere, e.g. in a worker process.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase
+        wall_time : float
+            Elapsed wall clock time [s]
+        cpu_time : float
+            Used CPU time [s]
+        """
+
+        if name in self.phases:
+            wall_time += self.phases[name].wall_time
+            cpu_time += self.phases[name].cpu_time
+
+        self.phases[name] = OptimizationResultsPhaseTiming(name=name, wall_time=wall_time, cpu_time=cpu_time)
+
+    def merge(self, other: PerformanceRecorder):
+        """Adds the phases and the model statistics recorded by `other`.
+
+        Parameters
+        ----------
+        other : PerformanceRecorder
+            Recorder, e.g. of a worker process
+        """
+
+        for phase in other.phases.values():
+            self.add_phase(phase.name, phase.wall_time, phase.cpu_time)
+
+        if other.model_statistics is not None:
+            self.model_statistics = other.model_statistics
+
+    def to_results(self) -> OptimizationResultsPerformance:
+        """Creates the performance record which is returned as part of the optimization results.
+
+        Returns
+        -------
+        OptimizationResultsPerformance
+            Recorded phases in the order they were started and model statistics
+        """
+
+        return OptimizationResultsPerformance(
+            phases=list(self.phases.values()),
+            model_statistics=self.model_statistics,
+        )
+
+    def log(self):
+        """Logs the recorded phases and the total model size."""
+
+        for phase in self.phases.values():
+            logger.info(f"Phase {phase.name}: {phase.wall_time:.3f} s wall time, {phase.cpu_time:.3f} s CPU time")
+
+        if self.model_statistics is not None:
+            logger.info(
+                f"Model size: {self.model_statistics.n_variables} variables, "
+                f"{self.model_statistics.n_constraints} constraints, "
+                f"{self.model_statistics.n_nonzeros} nonzeros"
+            )
+
+
+def _owner(name: str, component_names: list[str]) -> str:
+    """Returns the name of the component a variable or constraint belongs to, which is the
+    longest component name the variable or constraint name starts with. Variables and constraints
+    which belong to no component (e.g. the energy balances) are their own owner."""
+
+    for component_name in component_names:
+        if name.startswith(f"{component_name}_"):
+            return component_name
+
+    return name
+
+
+def collect_model_statistics(
+    model: pyoe.ConcreteModel | SparseModel, components_list: list[Component]
+) -> OptimizationResultsModelStatistics:
+    """Counts the variables, constraints and nonzero coefficients of the built optimization model
+    in total and per component. For a pyomo model, the nonzeros are determined by walking the expressions
+    of all constraints, which takes a few seconds for a model over the full time span.
+
+    Parameters
+    ----------
+    model : pyoe.ConcreteModel | SparseModel
+        Built pyomo or sparse optimization model
+    components_list : List[Component]
+        List of all optimization components added to the optimiziation model
+
+    Returns
+    -------
+    OptimizationResultsModelStatistics
+        Size of the model in total and per component
+    """
+
+    component_names = sorted([component.name for component in components_list], key=len, reverse=True)
+    sizes = {component.name: [0, 0, 0] for component in components_list}
+
+    if isinstance(model, SparseModel):
+        row_nonzeros = model.row_nonzeros()
+
+        for name, variable in model.variables.items():
+            sizes.setdefault(_owner(name, component_names), [0, 0, 0])[0] += len(variable.columns)
+
+        for name, rows in model.constraints.items():
+            size = sizes.setdefault(_owner(name, component_names), [0, 0, 0])
+            size[1] += rows.stop - rows.start
+            size[2] += int(row_nonzeros[rows].sum())
+
+    else:
+        for variable in model.component_objects(pyoe.Var, descend_into=True):
+            sizes.setdefault(_owner(variable.name, component_names), [0, 0, 0])[0] += len(variable)
+
+        for constraint in model.component_objects(pyoe.Constraint, active=True, descend_into=True):
+            size = sizes.setdefault(_owner(constraint.name, component_names), [0, 0, 0])
+
+            for constraint_data in constraint.values():
+                if not constraint_data.active:
+                    continue
+
+                size[1] += 1
+                size[2] += sum(1 for _ in pyomo_expr.identify_variables(constraint_data.body, include_fixed=True))
+
+    components = {
+        name: OptimizationResultsModelSize(n_variables=size[0], n_constraints=size[1], n_nonzeros=size[2])
+        for name, size in sizes.items()
+    }
+
+    return OptimizationResultsModelStatistics(
+        n_variables=sum(size.n_variables for size in components.values()),
+        n_constraints=sum(size.n_constraints for size in components.values()),
+        n_nonzeros=sum(size.n_nonzeros for size in components.values()),
+        components=components,
+    )
@@ -0,0 +1,178 @@
+"""Contains content-addressed caches for calculated time series profiles, e.g. normalized
+feed-in profiles of photovoltaic and wind power plants or standard load profiles.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..data_models.weather_data import (
+    WeatherDataHeightUnspecific,
+    WeatherDataHeightSpecific,
+)
+from .keyed_cache import KeyedCache
+
+
+logger = logging.getLogger()
+
+# increase if the calculation of profiles changes, so that existing entries are not used anymore
+CACHE_VERSION = 2
+
+
+class ProfileCache(KeyedCache):
+    """Stores calculated profiles named by a hash of the parameters and the time series they were
+    calculated from. Profiles are kept in memory (up to `memory_size` profiles) and, if a directory is
+    configured, as binary files on disk. If the number of profiles in memory or the total size of all
+    files exceeds its maximum, the least recently used profiles are deleted.
+
+    Every subclass holds its own configuration and memory, which are set with `configure`.
+    The memory of a cache is shared by all threads of the process and guarded by a lock.
+    """
+
+    _suffix: str = ".npz"
+
+    @classmethod
+    def create_key(cls, parameters: dict, time_series: list[pd.Series | None]) -> str:
+        """Creates the key of a profile from a hash of its parameters and the time series it is calculated from.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters of the profile, which have to be JSON serializable
+        time_series : list[pd.Series | None]
+            Time series the profile is calculated from
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 hash
+        """
+
+        hasher = hashlib.sha256()
+        hasher.update(
+            json.dumps({"version": CACHE_VERSION, "cache": cls.__name__, **parameters}, sort_keys=True).encode()
+        )
+
+        for series in time_series:
+            if series is None:
+                hasher.update(b"none")
+                continue
+
+            if isinstance(series.index, pd.DatetimeIndex):
+                hasher.update(str(series.index.tz).encode())
+                hasher.update(series.index.as_unit("ns").asi8.tobytes())
+            else:
+                hasher.update(str(list(series.index)).encode())
+
+            hasher.update(np.ascontiguousarray(series.to_numpy(dtype=np.float64)).tobytes())
+
+        return hasher.hexdigest()
+
+    @classmethod
+    def put(cls, key: str, profile: pd.Series):
+        """Stores a profile and evicts the least recently used profiles
+        if the maximum size of the cache is exceeded. Profiles without
+        a datetime index are only kept in memory.
+
+        Parameters
+        ----------
+        key : str
+            Key of the profile created by `create_key`
+        profile : pd.Series
+            Profile to store
+        """
+
+        if not isinstance(profile.index, pd.DatetimeIndex):
+            cls._put_memory(key, time.time(), profile.copy())
+            return
+
+        super().put(key, profile)
+
+    @classmethod
+    def _copy(cls, profile: pd.Series) -> pd.Series:
+        return profile.copy()
+
+    @classmethod
+    def _read(cls, path: Path) -> tuple[float, pd.Series]:
+        with np.load(path, allow_pickle=False) as data:
+            index = pd.DatetimeIndex(data["index"], freq="infer")
+            if str(data["tz"]) != "None":
+                index = index.tz_localize("UTC").tz_convert(str(data["tz"]))
+
+            name = str(data["name"]) if data["has_name"] else None
+            profile = pd.Series(data["values"], index=index, name=name)
+
+        # the modification time orders the files for the eviction of the least recently used profiles
+        os.utime(path)
+
+        return time.time(), profile
+
+    @classmethod
+    def _write(cls, path: Path, created: float, profile: pd.Series):
+        index = profile.index
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                values=profile.to_numpy(dtype=np.float64),
+                index=index.to_numpy(),
+                tz=str(profile.index.tz),
+                name=str(profile.name),
+                has_name=profile.name is not None,
+            )
+
+
+class FeedinCache(ProfileCache):
+    """Cache for normalized feed-in profiles of photovoltaic and wind power plants,
+    which is disabled until it is configured."""
+
+    @classmethod
+    def create_key(
+        cls,
+        parameters: dict,
+        weather_data: list[WeatherDataHeightUnspecific | WeatherDataHeightSpecific | None],
+    ) -> str:
+        """Creates the key of a feed-in profile from a hash of the plant parameters and the weather data.
+
+        Parameters
+        ----------
+        parameters : dict
+            Parameters of the plant (e.g. location, orientation or hub height), which have to be JSON serializable
+        weather_data : list[WeatherDataHeightUnspecific | WeatherDataHeightSpecific | None]
+            Weather data the profile is calculated from
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 hash
+        """
+
+        heights = []
+        time_series = []
+        for data in weather_data:
+            if isinstance(data, WeatherDataHeightSpecific):
+                heights.append(data.height_measured_at)
+                time_series.extend(data.series)
+            else:
+                heights.append(None)
+                time_series.append(None if data is None else data.series)
+
+        return super().create_key({**parameters, "heights": heights}, time_series)
+
+
+class DemandProfileCache(ProfileCache):
+    """Cache for standard load profiles normalized to a yearly demand of 1,
+    which keeps up to 128 profiles in memory by default."""
+
+    _memory_size: int = 128
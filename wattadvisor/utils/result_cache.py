@@ -0,0 +1,198 @@
+"""Contains a content-addressed cache for optimization results, keyed by a normalized
+representation of the components and the options of an optimization.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+import enum
+import hashlib
+import json
+import logging
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from ..components.component import Component
+from ..data_models.optimization_results_model import OptimizationResults
+from .keyed_cache import KeyedCache
+
+
+logger = logging.getLogger()
+
+# increase if the model formulation or the results change, so that existing entries are not used anymore
+CACHE_VERSION = 1
+
+# fields of components which hold the state of a built model instead of input data
+STATE_FIELDS = ["bilance_variables"]
+
+
+def _hash_array(values: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    """Converts a field value into a JSON serializable representation, in which time series
+    and arrays are replaced by hashes of their values.
+
+    Parameters
+    ----------
+    value : Any
+        Field value of a component
+
+    Returns
+    -------
+    Any
+        JSON serializable representation of the value
+    """
+
+    if isinstance(value, pd.Series):
+        if isinstance(value.index, pd.DatetimeIndex):
+            index = hashlib.sha256(str(value.index.tz).encode() + value.index.as_unit("ns").asi8.tobytes()).hexdigest()
+        else:
+            index = hashlib.sha256(str(list(value.index)).encode()).hexdigest()
+
+        return {"series": _hash_array(value.to_numpy(dtype=np.float64)), "index": index}
+
+    if isinstance(value, np.ndarray):
+        return {"array": _hash_array(value), "shape": list(value.shape)}
+
+    if isinstance(value, (list, tuple)) and len(value) > 0 and all(isinstance(v, (int, float)) for v in value):
+        return {"array": _hash_array(np.asarray(value, dtype=np.float64)), "shape": [len(value)]}
+
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+
+    if isinstance(value, BaseModel):
+        return {
+            "model": f"{type(value).__module__}.{type(value).__qualname__}",
+            "fields": {name: _normalize(getattr(value, name)) for name in type(value).model_fields},
+        }
+
+    if isinstance(value, enum.Enum):
+        return value.value
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    return repr(value)
+
+
+def _normalize_component(component: Component) -> dict:
+    """Returns the class and all input fields of a component in normalized form. Parameters loaded
+    from the parameter file are contained in the fields, as they are set when the component is created."""
+
+    component_class = type(component)
+
+    return {
+        "class": f"{component_class.__module__}.{component_class.__qualname__}",
+        "fields": {
+            name: _normalize(getattr(component, name))
+            for name in component_class.model_fields
+            if name not in STATE_FIELDS
+        },
+    }
+
+
+class ResultCache(KeyedCache):
+    """Stores optimization results named by a hash of the normalized components and options of the optimization.
+    Results are kept in memory (up to `memory_size` results) and, if a directory is configured, as JSON files
+    on disk. Results older than the time to live are not used anymore. If the number of results in memory or
+    the total size of all files exceeds its maximum, the oldest results are deleted.
+
+    The cache is disabled until it is configured with `configure`. The results in memory are shared
+    by all threads of the process and guarded by a lock.
+    """
+
+    _suffix: str = ".json"
+    _default_max_size: int = 500 * 1024**2
+    _ttl: float | None = None
+
+    @classmethod
+    def configure(
+        cls,
+        directory: str | Path | None = None,
+        ttl: float | None = None,
+        max_size: int | None = None,
+        memory_size: int | None = None,
+    ):
+        """Sets the directory of the on-disk cache, the time to live of results and the number of results kept in memory.
+
+        Parameters
+        ----------
+        directory : str | Path | None, optional
+            Directory the cached results are stored in. Is created if it does not exist.
+            If None, results are not stored on disk. By default None
+        ttl : float | None, optional
+            Time in seconds after which cached results expire, by default None (results do not expire)
+        max_size : int | None, optional
+            Maximum total size of all cached results on disk [bytes], by default None (500 MiB)
+        memory_size : int | None, optional
+            Maximum number of results kept in memory, by default None (unchanged)
+        """
+
+        cls._ttl = ttl
+
+        super().configure(directory, max_size=max_size, memory_size=memory_size)
+
+    @classmethod
+    def create_key(cls, components: list[Component], options: dict) -> str:
+        """Creates the key of the results of an optimization from a hash of the class and all input fields
+        of every component, with time series, arrays and COP series hashed by value,
+        and the options of the optimization (e.g. the solver). Component names are part of the key,
+        as they are part of the results.
+
+        Parameters
+        ----------
+        components : list[Component]
+            Components of the optimization model, in the order they are passed to the model
+        options : dict
+            Options of the optimization which change the results, e.g. the solver or the time aggregation
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 hash
+        """
+
+        description = {
+            "version": CACHE_VERSION,
+            "components": [_normalize_component(component) for component in components],
+            "options": _normalize(options),
+        }
+
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    @classmethod
+    def _is_expired(cls, created: float) -> bool:
+        return cls._ttl is not None and time.time() - created > cls._ttl
+
+    @classmethod
+    def _copy(cls, results: OptimizationResults) -> OptimizationResults:
+        return results.model_copy(deep=True)
+
+    @classmethod
+    def _read(cls, path: Path) -> tuple[float, OptimizationResults]:
+        with open(path, "r") as file:
+            data = json.load(file)
+
+        return data["created"], OptimizationResults.model_validate(data["results"])
+
+    @classmethod
+    def _write(cls, path: Path, created: float, results: OptimizationResults):
+        with open(path, "w") as file:
+            file.write(f'{{"created": {created!r}, "results": {results.model_dump_json()}}}')
@@ -4,39 +4,88 @@ Use of this source code is governed by a BSD-style license that can be found in
 
 from __future__ import annotations
 from datetime import datetime
-from typing import List, TYPE_CHECKING
+import importlib
+from typing import Iterator, List, TYPE_CHECKING
 import logging
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import pyomo.core.base.param
-import pyomo.core.base.var
-from pyomo.core.base.PyomoModel import Model
 
 from ..data_models.enums import OptimizationStatus
 from ..data_models.enums import SupportedSolver
+from ..data_models.enums import DetailedResultsFormat
 from ..data_models.optimization_results_model import OptimizationResults
 from ..data_models.optimization_results_scenario_kpis import \
     OptimizationResultsScenarioKpis
 from ..data_models.optimization_results_scenario import \
     OptimizationResultsScenario
 from ..data_models.optimization_results_status import OptimizationResultsStatus
+from ..data_models.optimization_results_time_aggregation import \
+    OptimizationResultsTimeAggregation
 from ..components.component import Component
 from ..components.investment_component import InvestmentComponent
+from ..sparse_model import SparseModel
+from .lazy_import import lazy_import
+from .time_aggregation import TimeAggregation
 if TYPE_CHECKING:
+    from pyomo.core.base.PyomoModel import Model
     from wattadvisor.opt_model import OptModel
 
 
+pyomo_param = lazy_import("pyomo.core.base.param")
+pyomo_var = lazy_import("pyomo.core.base.var")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
 logger = logging.getLogger()
 
 
-def _generate_scenario_kpis(pyomo_model: Model, components_list: List[Component]) -> OptimizationResultsScenarioKpis:
+def _objective_value(model: Model | SparseModel) -> float:
+    """Returns the value of the objective of a solved pyomo or sparse optimization model.
+
+    Parameters
+    ----------
+    model : Model | SparseModel
+        Solved optimization model
+
+    Returns
+    -------
+    float
+        Value of the objective
+    """
+
+    if isinstance(model, SparseModel):
+        return model.objective_value
+
+    return model.Objective.expr()
+
+def _sum_kpi(components_list: List[Component], kpi_name: str) -> float:
+    """Sums up a KPI of all components which provide it, evaluating it only once per component.
+
+    Parameters
+    ----------
+    components_list : List[Component]
+        List of all optimization components added to the optimiziation model
+    kpi_name : str
+        Name of the computed field of the components, e.g. ``co2_emissions``
+
+    Returns
+    -------
+    float
+        Sum of the KPI over all components
+    """
+
+    values = [getattr(component, kpi_name) for component in components_list]
+
+    return sum([value for value in values if value is not None])
+
+def _generate_scenario_kpis(pyomo_model: Model | SparseModel, components_list: List[Component]) -> OptimizationResultsScenarioKpis:
     """Creates an `OptimizationResultsScenarioObject` for one scenario (target or current) which is returned as part of the response of the WattAdvisor.
 
     Parameters
     ----------
-    pyomo_model : Model
-        Pyomo optimization model containing all parameters, variables and constraints aswell as the objective function. 
+    pyomo_model : Model | SparseModel
+        Pyomo or sparse optimization model containing all parameters, variables and constraints aswell as the objective function. 
     components_list : List[Component]
         List of all optimization components added to the optimiziation model
 
@@ -46,12 +95,12 @@ def _generate_scenario_kpis(pyomo_model: Model, components_list: List[Component]
         Object containing the resulting total KPIs for one scenario (target or current)
     """
 
-    total_co2_emissions = sum([component.co2_emissions for component in components_list if component.co2_emissions is not None])
-    total_investment_cost = sum([component.investment_cost for component in components_list if component.investment_cost is not None])
-    total_operational_cost = sum([component.operational_cost for component in components_list if component.operational_cost is not None])
-    total_purchase_cost = sum([component.purchase_cost for component in components_list if component.purchase_cost is not None])
-    total_income = -sum([component.feedin_income for component in components_list if component.feedin_income is not None])
-    total_annuities = pyomo_model.Objective.expr()
+    total_co2_emissions = _sum_kpi(components_list, "co2_emissions")
+    total_investment_cost = _sum_kpi(components_list, "investment_cost")
+    total_operational_cost = _sum_kpi(components_list, "operational_cost")
+    total_purchase_cost = _sum_kpi(components_list, "purchase_cost")
+    total_income = -_sum_kpi(components_list, "feedin_income")
+    total_annuities = _objective_value(pyomo_model)
 
 
     kpis = OptimizationResultsScenarioKpis(
@@ -65,6 +114,119 @@ def _generate_scenario_kpis(pyomo_model: Model, components_list: List[Component]
 
     return kpis
 
+def _generate_time_aggregation_results(time_aggregation: TimeAggregation) -> OptimizationResultsTimeAggregation:
+    """Creates an `OptimizationResultsTimeAggregation` object describing the time aggregation the optimization was performed with
+    and the error of the aggregated time series compared to the full resolution time series.
+
+    Parameters
+    ----------
+    time_aggregation : TimeAggregation
+        Time aggregation of the optimization model
+
+    Returns
+    -------
+    OptimizationResultsTimeAggregation
+        Object containing the size of the aggregated time set and the profile errors
+    """
+
+    return OptimizationResultsTimeAggregation(
+        n_periods=time_aggregation.n_representative_periods,
+        period_length=time_aggregation.period_length,
+        n_time_steps=time_aggregation.n_aggregated_time_steps,
+        max_profile_error=time_aggregation.max_profile_error,
+        profile_errors=time_aggregation.profile_errors
+    )
+
+def fix_current_scenario_variables(opt_model_object: OptModel, components_list: List[Component]):
+    """Fixes the advised power, capacity and area of all components to their already installed values,
+    so that the optimization model represents the current scenario.
+
+    Parameters
+    ----------
+    opt_model_object : OptModel
+        Object of the built optimization model
+    components_list : List[Component]
+        List of all optimization components added to the optimiziation model
+    """
+
+    # the variables are fixed via the optimization model object, so that a persistent solver
+    # only receives the changed bounds instead of loading the whole model again
+    for component in components_list:
+        if all(hasattr(component, attr) for attr in ["potential_power", "installed_power", "potential_capacity", "installed_capacity"]):
+            # storage component
+            opt_model_object.fix_variable(f"{component.name}_advised_capacity", component.installed_capacity)
+
+            if component.installed_power is not None:
+                opt_model_object.fix_variable(f"{component.name}_advised_power", component.installed_power)
+        
+        elif all(hasattr(component, attr) for attr in ["potential_power", "installed_power"]):
+            # power component
+            opt_model_object.fix_variable(f"{component.name}_advised_power", component.installed_power)
+
+        elif all(hasattr(component, attr) for attr in ["potential_area", "installed_area"]):
+            # area component
+            opt_model_object.fix_variable(f"{component.name}_advised_area", component.installed_area)
+
+def generate_scenario_results(model: Model | SparseModel, components_list: List[Component]) -> OptimizationResultsScenario:
+    """Creates an `OptimizationResultsScenario` object from the solved optimization model of one scenario (target or current).
+
+    Parameters
+    ----------
+    model : Model | SparseModel
+        Solved pyomo or sparse optimization model
+    components_list : List[Component]
+        List of all optimization components added to the optimiziation model
+
+    Returns
+    -------
+    OptimizationResultsScenario
+        Object containing the results of all components and the total KPIs of the scenario
+    """
+
+    return OptimizationResultsScenario(
+        components=[x.model_dump(exclude_none=True) for x in components_list],
+        kpis=_generate_scenario_kpis(model, components_list)
+    )
+
+def compose_results_object(status: OptimizationStatus, target_scenario: None | OptimizationResultsScenario = None, current_scenario: None | OptimizationResultsScenario = None, time_aggregation: None | TimeAggregation = None) -> OptimizationResults:
+    """Merges the results of target and current scenario into the `OptimizationResults` returned as the response of the WattAdvisor.
+
+    Parameters
+    ----------
+    status : OptimizationStatus
+        Status of the optimization of the target scenario
+    target_scenario : None | OptimizationResultsScenario, optional
+        Results of the target scenario, by default None
+    current_scenario : None | OptimizationResultsScenario, optional
+        Results of the current scenario, by default None
+    time_aggregation : None | TimeAggregation, optional
+        Time aggregation the scenarios were optimized with, by default None
+
+    Returns
+    -------
+    OptimizationResults
+        Object that contains all relevant results of current and target scenario optimization
+    """
+
+    if status != OptimizationStatus.SUCCESS:
+        results = OptimizationResults(status=OptimizationResultsStatus(status=status))
+
+    elif current_scenario is None:
+        results = OptimizationResults(
+            status=OptimizationResultsStatus(status=status),
+            target_scenario=target_scenario)
+
+    else:
+        results = OptimizationResults(
+            status=OptimizationResultsStatus(status=status),
+            current_scenario=current_scenario,
+            target_scenario=target_scenario)
+
+    if time_aggregation is not None:
+        results.time_aggregation = _generate_time_aggregation_results(time_aggregation)
+
+    return results
+
 def _generate_current_scenario_results(opt_model_object: OptModel, components_list: List[Component], use_solver: SupportedSolver, solver_executable: str | None = None) -> tuple[None | OptimizationResultsScenarioKpis, None | list[Component]]:
     """Determines the cost resulting for the fulfilment of the energy demands by the components already installed (current scenario). 
 
@@ -87,32 +249,11 @@ def _generate_current_scenario_results(opt_model_object: OptModel, components_li
         If optimization of current scenario was not feasible: tuple containing None and None is returned 
     """
 
-    for component in components_list:
-        if all(hasattr(component, attr) for attr in ["potential_power", "installed_power", "potential_capacity", "installed_capacity"]):
-            # storage component
-            variable = opt_model_object.pyomo_model.find_component(f"{component.name}_advised_capacity")
-            if variable is not None:
-                variable.fix(component.installed_capacity)
-
-            if component.installed_power is not None:
-                variable = opt_model_object.pyomo_model.find_component(f"{component.name}_advised_power")
-                if variable is not None:
-                    variable.fix(component.installed_power)
-        
-        elif all(hasattr(component, attr) for attr in ["potential_power", "installed_power"]):
-            # power component
-            variable = opt_model_object.pyomo_model.find_component(f"{component.name}_advised_power")
-            if variable is not None:
-                variable.fix(component.installed_power)   
-
-        elif all(hasattr(component, attr) for attr in ["potential_area", "installed_area"]):
-            # area component
-            variable = opt_model_object.pyomo_model.find_component(f"{component.name}_advised_area")
-            if variable is not None:
-                variable.fix(component.installed_area)
+    fix_current_scenario_variables(opt_model_object, components_list)
 
     try:
-        status, time = opt_model_object._optimize(solver=use_solver, solver_executable=solver_executable)
+        with opt_model_object.performance.phase("solve_current"):
+            status, time = opt_model_object._optimize(solver=use_solver, solver_executable=solver_executable)
 
     except RuntimeError:
         logger.warning("Could not determine current scenario results. Probably given energy demand cannot be fulfilled by the existing components and tariffs.")
@@ -122,55 +263,192 @@ def _generate_current_scenario_results(opt_model_object: OptModel, components_li
         logger.warning("Could not determine current scenario results. Probably given energy demand cannot be fulfilled by the existing components and tariffs.")
         return None, None
 
-    return _generate_scenario_kpis(opt_model_object.pyomo_model, components_list), components_list
+    with opt_model_object.performance.phase("results_current"):
+        kpis = _generate_scenario_kpis(opt_model_object.model, components_list)
+
+    return kpis, components_list
+
+def _iter_detailed_results(pyomo_model: Model | SparseModel, components_list: List[Component], calculation_time: float,
+                           scalar_results: dict) -> Iterator[tuple[str, pd.Series]]:
+    """Yields the values of the indexed variables and parameters of a solved optimization model one at a time,
+    so that only one time series is held in memory by writers streaming them to a file.
+    The values of all scalar variables and parameters and the totals of the model are stored in `scalar_results`
+    and are complete when the generator is exhausted.
+
+    Parameters
+    ----------
+    pyomo_model : Model | SparseModel
+        Pyomo or sparse optimization model containing all parameters, variables and constraints aswell as the objective function.
+    components_list : List[Component]
+        List of all optimization components added to the optimiziation model
+    calculation_time : float
+        Time in seconds it took for the solver to solve the optimization model
+    scalar_results : dict
+        Dict the values of all scalar components are added to
+
+    Yields
+    ------
+    tuple[str, pd.Series]
+        Name of the indexed component and its values indexed by time step
+    """
+
+    scalar_results["Objective"] = _objective_value(pyomo_model)
+    scalar_results["total installation cost"] = sum([component.investment_cost for component in components_list if isinstance(component, InvestmentComponent)])
+    scalar_results["total annual running cost"] = sum([component.operational_cost for component in components_list if isinstance(component, InvestmentComponent)])
+    scalar_results["calculation_time"] = calculation_time
+
+    if isinstance(pyomo_model, SparseModel):
+        index = pd.RangeIndex(1, pyomo_model.n_time_steps + 1)
+
+        for cname, variable in pyomo_model.variables.items():
+            if variable.indexed:
+                yield cname, pd.Series(variable.values, index=index)
+            else:
+                scalar_results[cname] = variable.value
+
+        for cname, parameter in pyomo_model.parameters.items():
+            yield cname, pd.Series(parameter.values, index=index)
+
+    else:
+        for model_object in pyomo_model.component_objects():
+            cname = model_object.getname()
+            ctype = type(model_object)
+
+            if ctype in [pyomo_var.ScalarVar, pyomo_param.ScalarParam]:
+                scalar_results[cname] = model_object.value
+
+            elif ctype in [pyomo_param.IndexedParam, pyomo_var.IndexedVar]:
+                values = model_object.extract_values()
+                yield cname, pd.Series(np.array(list(values.values()), dtype=float), index=list(values.keys()))
+
+def _collect_detailed_results(pyomo_model: Model | SparseModel, components_list: List[Component], calculation_time: float) -> tuple[pd.Series, pd.DataFrame]:
+    """Collects the values of all scalar and indexed variables and parameters of a solved optimization model.
 
-def write_detailed_results(pyomo_model: Model, components_list: List[Component], calculation_time: float, filename: Path | None = None):
-    """Creates a DataFrame with all optimization time series data and writes it to a excel file.
+    Parameters
+    ----------
+    pyomo_model : Model | SparseModel
+        Pyomo or sparse optimization model containing all parameters, variables and constraints aswell as the objective function.
+    components_list : List[Component]
+        List of all optimization components added to the optimiziation model
+    calculation_time : float
+        Time in seconds it took for the solver to solve the optimization model
+
+    Returns
+    -------
+    tuple[pd.Series, pd.DataFrame]
+        Values of all scalar components and values of all indexed components with one column per component
+    """
+
+    scalar_results = {}
+    indexed_results = dict(_iter_detailed_results(pyomo_model, components_list, calculation_time, scalar_results))
+
+    return pd.Series(scalar_results), pd.DataFrame(indexed_results)
+
+def _long_format(cname: str, values: pd.Series) -> pd.DataFrame:
+    """Returns the values of an indexed component as rows of the long table written to CSV and Parquet files."""
+
+    return pd.DataFrame({"name": cname, "time_step": values.index, "value": values.to_numpy(dtype=float)})
+
+def check_detailed_results_format(file_format: DetailedResultsFormat):
+    """Checks whether detailed results can be written in `file_format`, so that a missing
+    writer is reported before the model is built and solved instead of after.
 
     Parameters
     ----------
-    pyomo_model : Model
-        Pyomo optimization model containing all parameters, variables and constraints aswell as the objective function. 
+    file_format : DetailedResultsFormat
+        Format of the file to export
+
+    Raises
+    ------
+    ImportError
+        If `file_format` is Parquet and pyarrow cannot be imported
+    """
+
+    if file_format != DetailedResultsFormat.PARQUET:
+        return
+
+    # imported instead of only looked up, as an installed pyarrow may fail to import (e.g. built for another numpy)
+    try:
+        importlib.import_module("pyarrow.parquet")
+
+    except ImportError as e:
+        raise ImportError(
+            "Exporting detailed results as Parquet requires pyarrow. Install it or choose another export format."
+        ) from e
+
+def write_detailed_results(pyomo_model: Model | SparseModel, components_list: List[Component], calculation_time: float, filename: Path | None = None,
+                           file_format: DetailedResultsFormat = DetailedResultsFormat.EXCEL):
+    """Writes all optimization time series data to an Excel, CSV or Parquet file.
+    Excel files contain the sheets "Scalars" and "Indexed" with one column per indexed component.
+    CSV and Parquet files are streamed one indexed component at a time, so that the time series of the model
+    are never held in memory at once. They contain a long table with the columns ``name``, ``time_step`` and ``value``
+    (one row group per component in Parquet files), which can be pivoted into one column per component with
+    ``df.pivot(index="time_step", columns="name", values="value")``. The scalar values are written
+    to a small side table next to it, whose name is suffixed with "_scalars".
+
+    Parameters
+    ----------
+    pyomo_model : Model | SparseModel
+        Pyomo or sparse optimization model containing all parameters, variables and constraints aswell as the objective function. 
     components_list : List[Component]
         List of all optimization components added to the optimiziation model
     calculation_time : float
         Time in seconds it took for the solver to solve the optimization model
     filename : Path or None
-        name of the Excel file to export, by default None
+        name of the file to export, by default None
+    file_format : DetailedResultsFormat, optional
+        Format of the exported file, by default DetailedResultsFormat.EXCEL
+
+    Raises
+    ------
+    ImportError
+        If `file_format` is Parquet and pyarrow is not installed
     """
 
     if filename is None:
         dt = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"{dt}_results.xlsx"
+        filename = f"{dt}_results.{file_format.value}"
 
-    scalar_results = pd.Series()
-    indexed_results = pd.DataFrame()
+    filename = Path(filename)
 
-    scalar_results["Objective"] = pyomo_model.Objective.expr()
-    scalar_results["total installation cost"] = sum([component.investment_cost for component in components_list if isinstance(component, InvestmentComponent)])
-    scalar_results["total annual running cost"] = sum([component.operational_cost for component in components_list if isinstance(component, InvestmentComponent)])
-    scalar_results["calculation_time"] = calculation_time
+    if file_format == DetailedResultsFormat.EXCEL:
+        scalar_results, indexed_results = _collect_detailed_results(pyomo_model, components_list, calculation_time)
 
-    for model_object in pyomo_model.component_objects():
-        cname = model_object.getname()
-        ctype = type(model_object)
+        with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
+            scalar_results.to_excel(writer, sheet_name="Scalars")
+            indexed_results.to_excel(writer, sheet_name="Indexed")
 
-        if ctype in [pyomo.core.base.var.ScalarVar, pyomo.core.base.param.ScalarParam]:
-            scalar_results[cname] = model_object.value
+            for sheet in ["Scalars", "Indexed"]:
+                worksheet = writer.sheets[sheet]
+                worksheet.autofit()
 
-        elif ctype in [pyomo.core.base.param.IndexedParam, pyomo.core.base.var.IndexedVar]:
-            values = pd.Series(model_object.extract_values())
-            indexed_results[cname] = values
+        return
 
-    with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
-        scalar_results.to_excel(writer, sheet_name="Scalars")
-        indexed_results.to_excel(writer, sheet_name="Indexed")
-        
-        for sheet in ["Scalars", "Indexed"]:
-            worksheet = writer.sheets[sheet]
-            worksheet.autofit()
+    scalar_results = {}
+    indexed_results = _iter_detailed_results(pyomo_model, components_list, calculation_time, scalar_results)
 
-        
+    if file_format == DetailedResultsFormat.CSV:
+        with open(filename, "w", newline="") as file:
+            file.write("name,time_step,value\n")
+
+            for cname, values in indexed_results:
+                _long_format(cname, values).to_csv(file, header=False, index=False)
+
+    elif file_format == DetailedResultsFormat.PARQUET:
+        schema = pa.schema([("name", pa.string()), ("time_step", pa.int64()), ("value", pa.float64())])
+
+        with pq.ParquetWriter(filename, schema) as writer:
+            for cname, values in indexed_results:
+                writer.write_table(pa.Table.from_pandas(_long_format(cname, values), schema=schema, preserve_index=False))
+
+    scalars_filename = filename.with_name(f"{filename.stem}_scalars{filename.suffix}")
+    scalar_results = pd.Series(scalar_results).rename("value").to_frame()
+
+    if file_format == DetailedResultsFormat.CSV:
+        scalar_results.to_csv(scalars_filename)
+
+    elif file_format == DetailedResultsFormat.PARQUET:
+        scalar_results.to_parquet(scalars_filename)
 
 def generate_results_object(opt_model_object: OptModel, components_list: List[Component], status: OptimizationStatus, use_solver: SupportedSolver, solver_executable: str | None = None) -> OptimizationResults:
     """Creates the complete `OptimizationResultsModel` which is returned as the response of the WattAdvisor.
@@ -199,34 +477,21 @@ def generate_results_object(opt_model_object: OptModel, components_list: List[Co
         Object that contains all relevant results of current and target scenario optimization
     """    
 
-    if status == OptimizationStatus.SUCCESS:
+    target_scenario = None
+    current_scenario = None
 
-        kpis_target_scenario = _generate_scenario_kpis(opt_model_object.pyomo_model, components_list)
+    if status == OptimizationStatus.SUCCESS:
 
-        target_scenario = OptimizationResultsScenario(
-            components=[x.model_dump(exclude_none=True) for x in components_list],
-            kpis=kpis_target_scenario
-        )
+        with opt_model_object.performance.phase("results_target"):
+            target_scenario = generate_scenario_results(opt_model_object.model, components_list)
 
         kpis_current_scenario, components_results_current_scenario = _generate_current_scenario_results(opt_model_object, components_list, use_solver, solver_executable)
 
-        if kpis_current_scenario is None or components_results_current_scenario is None:
-            results = OptimizationResults(
-                status=OptimizationResultsStatus(status=status),
-                target_scenario=target_scenario)
-            
-        else:
-            current_scenario = OptimizationResultsScenario(
-                components=[x.model_dump(exclude_none=True) for x in components_results_current_scenario],
-                kpis=kpis_current_scenario
-            )
-
-            results =  OptimizationResults(
-                status=OptimizationResultsStatus(status=status),
-                current_scenario=current_scenario,
-                target_scenario=target_scenario)
-
-    else:
-        results = OptimizationResults(status=OptimizationResultsStatus(status=status))
+        if kpis_current_scenario is not None and components_results_current_scenario is not None:
+            with opt_model_object.performance.phase("results_current"):
+                current_scenario = OptimizationResultsScenario(
+                    components=[x.model_dump(exclude_none=True) for x in components_results_current_scenario],
+                    kpis=kpis_current_scenario
+                )
 
-    return results
\ No newline at end of file
+    return compose_results_object(status, target_scenario, current_scenario, opt_model_object.time_aggregation)
@@ -0,0 +1,358 @@
+"""Contains the aggregation of the time series of all components to representative periods
+(e.g. typical days), which allows to build the optimization model over a reduced time set.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from pyomo.core import Model, RangeSet
+    from ..components.component import Component
+
+
+pyoe = lazy_import("pyomo.environ")
+hierarchy = lazy_import("scipy.cluster.hierarchy")
+logger = logging.getLogger()
+
+TIME_SERIES_ATTRIBUTES = [
+    "demand_profile",
+    "normed_production",
+    "energy_price_profile",
+    "cop_series",
+]
+
+
+class TimeAggregation:
+    """Clusters the periods of the combined time series of all components into a number of
+    representative periods by hierarchical clustering (ward linkage). Each representative period is the mean
+    of the periods of its cluster and is weighted by the number of periods it represents, so that
+    annual sums of energy and cost are preserved. Hours which do not fill a complete period at the end
+    of the time span are kept as an additional, exact period with weight 1.
+
+    Parameters
+    ----------
+    components : list[Component]
+        Components whose time series (see ``TIME_SERIES_ATTRIBUTES``) are used for clustering
+    n_periods : int
+        Number of representative periods
+    period_length : int, optional
+        Number of time steps of one period, by default 24 (typical days).
+        Use 168 for typical weeks.
+    n_time_steps : int, optional
+        Number of time steps of the full time span, by default 8760
+
+    Raises
+    ------
+    ValueError
+        If `n_periods` or `period_length` is smaller than 1 or `period_length` exceeds `n_time_steps`
+    """
+
+    def __init__(
+        self,
+        components: list[Component],
+        n_periods: int,
+        period_length: int = 24,
+        n_time_steps: int = 8760,
+    ):
+        if n_periods < 1:
+            raise ValueError("Number of representative periods must be at least 1.")
+
+        if period_length < 1 or period_length > n_time_steps:
+            raise ValueError(f"Period length must be between 1 and {n_time_steps} time steps.")
+
+        self.period_length = period_length
+        self.n_time_steps = n_time_steps
+        self.n_full_periods = n_time_steps // period_length
+        self.remainder_length = n_time_steps - self.n_full_periods * period_length
+
+        self.time_series = {}
+        for component in components:
+            for attribute in TIME_SERIES_ATTRIBUTES:
+                values = getattr(component, attribute, None)
+                if values is not None:
+                    self.time_series[f"{component.name}.{attribute}"] = np.asarray(values, dtype=float)
+
+        labels = self._cluster(min(n_periods, self.n_full_periods))
+        self.n_clustered_periods = labels.max() + 1
+
+        # index of the representative period of every original period in chronological order
+        self.period_order = labels
+        period_weights = np.bincount(labels, minlength=self.n_clustered_periods)
+        period_lengths = np.full(self.n_clustered_periods, period_length)
+
+        if self.remainder_length > 0:
+            self.period_order = np.append(labels, self.n_clustered_periods)
+            period_weights = np.append(period_weights, 1)
+            period_lengths = np.append(period_lengths, self.remainder_length)
+
+        self.period_weights = period_weights
+        self.period_lengths = period_lengths
+        self.n_representative_periods = len(period_lengths)
+
+        # first time step (0-based) of every representative period on the aggregated time axis
+        self.period_starts = np.concatenate(([0], np.cumsum(period_lengths)[:-1]))
+        self.n_aggregated_time_steps = int(period_lengths.sum())
+
+        # representative period and weight of every time step on the aggregated time axis
+        self.time_step_periods = np.repeat(np.arange(self.n_representative_periods), period_lengths)
+        self.weights = np.repeat(period_weights, period_lengths).astype(float)
+
+        # time step on the aggregated time axis which represents every original time step
+        self.time_step_mapping = np.concatenate(
+            [self.period_starts[k] + np.arange(period_lengths[k]) for k in self.period_order]
+        )
+
+        self.profile_errors = {
+            key: self._profile_error(values) for key, values in self.time_series.items()
+        }
+
+        logger.info(
+            f"Aggregated {n_time_steps} time steps to {self.n_representative_periods} representative periods "
+            f"with {self.n_aggregated_time_steps} time steps, maximum profile error (NRMSE) {self.max_profile_error:.4f}"
+        )
+
+    @property
+    def max_profile_error(self) -> float:
+        """Returns the largest normalized root mean square error of all aggregated time series.
+
+        Returns
+        -------
+        float
+            Maximum profile error [-]
+        """
+
+        return max(self.profile_errors.values(), default=0.0)
+
+    def _cluster(self, n_clusters: int) -> np.ndarray:
+        """Clusters the full periods of all time series, each scaled to the range [0, 1].
+
+        Parameters
+        ----------
+        n_clusters : int
+            Maximum number of clusters
+
+        Returns
+        -------
+        np.ndarray
+            Cluster index of every full period, numbered by first occurrence
+        """
+
+        n_values = self.n_full_periods * self.period_length
+
+        features = []
+        for values in self.time_series.values():
+            values = values[:n_values]
+            value_range = values.max() - values.min()
+            if value_range > 0:
+                features.append(((values - values.min()) / value_range).reshape(self.n_full_periods, self.period_length))
+
+        if len(features) == 0 or n_clusters >= self.n_full_periods:
+            if n_clusters < self.n_full_periods:
+                logger.warning("No varying time series found, all periods are merged into one representative period.")
+                return np.zeros(self.n_full_periods, dtype=int)
+
+            return np.arange(self.n_full_periods)
+
+        tree = hierarchy.linkage(np.hstack(features), method="ward")
+        clusters = hierarchy.fcluster(tree, t=n_clusters, criterion="maxclust")
+
+        _, first_occurrence, labels = np.unique(clusters, return_index=True, return_inverse=True)
+        order = np.argsort(np.argsort(first_occurrence))
+
+        return order[labels]
+
+    def aggregate(self, values: list | np.ndarray) -> np.ndarray:
+        """Aggregates a time series of the full time span to the representative periods.
+
+        Parameters
+        ----------
+        values : list | np.ndarray
+            Values of every time step of the full time span
+
+        Returns
+        -------
+        np.ndarray
+            Values of every time step of the aggregated time axis
+        """
+
+        values = np.asarray(values, dtype=float)
+        n_values = self.n_full_periods * self.period_length
+
+        sums = np.zeros((self.n_clustered_periods, self.period_length))
+        np.add.at(sums, self.period_order[: self.n_full_periods], values[:n_values].reshape(self.n_full_periods, self.period_length))
+        means = sums / self.period_weights[: self.n_clustered_periods, None]
+
+        return np.concatenate((means.ravel(), values[n_values:]))
+
+    def disaggregate(self, values: list | np.ndarray) -> np.ndarray:
+        """Maps a time series of the aggregated time axis back to the full time span.
+
+        Parameters
+        ----------
+        values : list | np.ndarray
+            Values of every time step of the aggregated time axis
+
+        Returns
+        -------
+        np.ndarray
+            Values of every time step of the full time span
+        """
+
+        return np.asarray(values, dtype=float)[self.time_step_mapping]
+
+    def _profile_error(self, values: np.ndarray) -> float:
+        """Calculates the root mean square error of a time series caused by the aggregation,
+        normalized by the range of its values.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values of every time step of the full time span
+
+        Returns
+        -------
+        float
+            Normalized root mean square error [-]
+        """
+
+        value_range = values.max() - values.min()
+        if value_range == 0:
+            return 0.0
+
+        error = self.disaggregate(self.aggregate(values)) - values
+
+        return float(np.sqrt(np.mean(error**2)) / value_range)
+
+    def is_period_start(self, tx: int) -> bool:
+        """Checks whether the time step `tx` of the aggregated pyomo time set (starting at 1)
+        is the first time step of a representative period.
+
+        Parameters
+        ----------
+        tx : int
+            Time step of the aggregated time set
+
+        Returns
+        -------
+        bool
+            True if `tx` starts a representative period
+        """
+
+        return tx == 1 or self.time_step_periods[tx - 1] != self.time_step_periods[tx - 2]
+
+    def add_storage_linking(
+        self,
+        model: Model,
+        t: RangeSet,
+        name: str,
+        storage: pyoe.Var,
+        advised_capacity: pyoe.Var,
+        initial_soc: float,
+        relative_losses: float,
+    ) -> Model:
+        """Links the state of charge of a storage across the original periods.
+        Within a representative period, `storage` holds the state of charge relative to the start of the period.
+        The absolute state of charge at the start of every original period is tracked by an additional variable,
+        which is carried over from one period to the next by the net charge of the represented period. Storage losses
+        are applied to the carried over state of charge. The storage level has to stay within its capacity,
+        which is checked using the minimum and maximum relative state of charge of each representative period.
+
+        Parameters
+        ----------
+        model : Model
+            Pyomo model to which variables and constraints will be added
+        t : RangeSet
+            Aggregated time set
+        name : str
+            Name of the storage component
+        storage : pyoe.Var
+            State of charge of the storage relative to the start of each representative period
+        advised_capacity : pyoe.Var
+            Capacity of the storage
+        initial_soc : float
+            State of charge at the beginning of the time span relative to the capacity
+        relative_losses : float
+            Losses of the stored energy per time step relative to the state of charge
+
+        Returns
+        -------
+        Model
+            Pyomo model with the added variables and constraints
+        """
+
+        n_original_periods = len(self.period_order)
+        original_periods = pyoe.RangeSet(0, n_original_periods - 1)
+        representative_periods = pyoe.RangeSet(0, self.n_representative_periods - 1)
+        period_ends = self.period_starts + self.period_lengths
+
+        # state of charge at the start of every original period and at the end of the time span [kWh]
+        storage_inter = pyoe.Var(pyoe.RangeSet(0, n_original_periods), bounds=(0.0, None))
+        model.add_component(f"{name}_storage_inter", storage_inter)
+
+        # maximum and minimum relative state of charge of every representative period [kWh]
+        storage_intra_max = pyoe.Var(representative_periods, bounds=(0.0, None))
+        model.add_component(f"{name}_storage_intra_max", storage_intra_max)
+
+        storage_intra_min = pyoe.Var(representative_periods, bounds=(None, 0.0))
+        model.add_component(f"{name}_storage_intra_min", storage_intra_min)
+
+        # state of charge at the beginning of the time span
+        model.add_component(
+            f"{name}_eq_inter01",
+            pyoe.Constraint(expr=storage_inter[0] == advised_capacity * initial_soc),
+        )
+
+        # carry over the state of charge from one original period to the next
+        def _eq_inter02_rule(model, d):
+            k = self.period_order[d]
+            return (
+                storage_inter[d + 1]
+                == storage_inter[d] * (1 - relative_losses) ** self.period_lengths[k]
+                + storage[period_ends[k]]
+            )
+
+        model.add_component(f"{name}_eq_inter02", pyoe.Constraint(original_periods, rule=_eq_inter02_rule))
+
+        # determine the range of the relative state of charge of every representative period
+        model.add_component(
+            f"{name}_eq_inter03",
+            pyoe.Constraint(t, rule=lambda model, tx: storage_intra_max[self.time_step_periods[tx - 1]] >= storage[tx]),
+        )
+
+        model.add_component(
+            f"{name}_eq_inter04",
+            pyoe.Constraint(t, rule=lambda model, tx: storage_intra_min[self.time_step_periods[tx - 1]] <= storage[tx]),
+        )
+
+        # keep the absolute state of charge within the capacity of the storage
+        model.add_component(
+            f"{name}_eq_inter05",
+            pyoe.Constraint(
+                original_periods,
+                rule=lambda model, d: storage_inter[d] + storage_intra_min[self.period_order[d]] >= 0,
+            ),
+        )
+
+        model.add_component(
+            f"{name}_eq_inter06",
+            pyoe.Constraint(
+                original_periods,
+                rule=lambda model, d: storage_inter[d] + storage_intra_max[self.period_order[d]] <= advised_capacity,
+            ),
+        )
+
+        model.add_component(
+            f"{name}_eq_inter07",
+            pyoe.Constraint(expr=storage_inter[n_original_periods] <= advised_capacity),
+        )
+
+        return model
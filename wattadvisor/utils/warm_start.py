@@ -0,0 +1,222 @@
+"""Contains a store of solutions of previously solved optimization models, which are used as a warm start
+for the solution of similar models with the same structure, e.g. in parameter sweeps.
+
+Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reserved.
+Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from ..components.component import Component
+
+if TYPE_CHECKING:
+    import highspy
+
+
+logger = logging.getLogger()
+
+
+class WarmStart:
+    def __init__(self, basis: highspy.HighsBasis | None = None, values: np.ndarray | None = None):
+        """Solution of a solved optimization model, which can be supplied to the solver of a model
+        with the same structure.
+
+        Parameters
+        ----------
+        basis : highspy.HighsBasis | None, optional
+            Simplex basis of the solution, used by HiGHS, by default None
+        values : np.ndarray | None, optional
+            Values of all variables in the order of the model, used as MIP start
+            by Gurobi and CBC, by default None
+        """
+
+        self.basis = basis
+        self.values = values
+
+
+def _numeric_features(value) -> list[float]:
+    """Returns the numeric features of a field value: the value of numbers,
+    the sum of time series and arrays and nothing for all other values."""
+
+    if isinstance(value, bool) or value is None:
+        return []
+
+    if isinstance(value, (int, float, np.number)):
+        return [float(value)]
+
+    if isinstance(value, pd.Series):
+        return [float(value.sum())]
+
+    if isinstance(value, (np.ndarray, list, tuple)) and len(value) > 0 and all(
+        isinstance(v, (int, float, np.number)) for v in value
+    ):
+        return [float(np.sum(value))]
+
+    return []
+
+
+class WarmStartStore:
+    """Keeps the solutions of solved target scenarios in memory, grouped by the structure of their models.
+    For a new model, the solution of the most similar model with the same structure is returned,
+    where the similarity is measured by the relative differences of all numeric input fields of the components
+    (e.g. costs, efficiencies and sums of demand and production profiles).
+    If more than `max_cases` solutions are stored, the oldest ones are deleted.
+    The solutions are shared by all threads of the process and guarded by a lock.
+    """
+
+    _max_cases: int = 100
+    _cases: OrderedDict = OrderedDict()
+    _lock: threading.RLock = threading.RLock()
+
+    @classmethod
+    def configure(cls, max_cases: int = 100):
+        """Sets the maximum number of stored solutions.
+
+        Parameters
+        ----------
+        max_cases : int, optional
+            Maximum number of stored solutions, by default 100
+        """
+
+        with cls._lock:
+            cls._max_cases = max_cases
+            cls._evict()
+
+    @classmethod
+    def clear(cls):
+        """Deletes all stored solutions."""
+
+        with cls._lock:
+            cls._cases.clear()
+
+    @classmethod
+    def structure_key(cls, components: list[Component], options: dict, model_size: tuple[int, int]) -> str:
+        """Creates a key which is equal for models with the same structure, i.e. the same component classes
+        in the same order, the same options and the same number of variables and constraints.
+        Names of components are only part of the key if they were given explicitly, as generated names
+        (e.g. ``EnergyDemand_3``) count all components created in the active `ModelScope`
+        and differ between identical systems built one after another.
+
+        Parameters
+        ----------
+        components : list[Component]
+            Components of the optimization model
+        options : dict
+            Options the model is built and solved with (e.g. backend, solver and number of time steps),
+            which have to be JSON serializable
+        model_size : tuple[int, int]
+            Number of variables and constraints of the model
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 hash
+        """
+
+        description = {
+            "components": [
+                [position, type(component).__name__, None if getattr(component, "_generated_name", False) else component.name]
+                for position, component in enumerate(components)
+            ],
+            "options": options,
+            "model_size": list(model_size),
+        }
+
+        return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+    @classmethod
+    def features(cls, components: list[Component]) -> np.ndarray:
+        """Returns the numeric input fields of all components, by which the similarity of models is measured.
+
+        Parameters
+        ----------
+        components : list[Component]
+            Components of the optimization model
+
+        Returns
+        -------
+        np.ndarray
+            Numeric features of the components
+        """
+
+        features = []
+
+        for component in components:
+            for name in type(component).model_fields:
+                features.extend(_numeric_features(getattr(component, name)))
+
+        return np.array(features, dtype=np.float64)
+
+    @classmethod
+    def get(cls, key: str, features: np.ndarray) -> WarmStart | None:
+        """Returns the solution of the most similar stored model with the same structure.
+
+        Parameters
+        ----------
+        key : str
+            Structure key of the model created by `structure_key`
+        features : np.ndarray
+            Features of the model created by `features`
+
+        Returns
+        -------
+        WarmStart | None
+            Solution of the most similar model, None if no model with the same structure was stored
+        """
+
+        best_distance, best_warm_start = None, None
+
+        with cls._lock:
+            cases = list(cls._cases.items())
+
+        for (case_key, _), (case_features, warm_start) in cases:
+            if case_key != key or case_features.shape != features.shape:
+                continue
+
+            scale = np.maximum(np.maximum(np.abs(case_features), np.abs(features)), 1e-9)
+            distance = float(np.sum(np.abs(case_features - features) / scale))
+
+            if best_distance is None or distance < best_distance:
+                best_distance, best_warm_start = distance, warm_start
+
+        if best_warm_start is not None:
+            logger.debug(f"Warm start found with relative distance {best_distance:.4f}")
+
+        return best_warm_start
+
+    @classmethod
+    def put(cls, key: str, features: np.ndarray, warm_start: WarmStart):
+        """Stores the solution of a solved model. A stored solution of a model with the same structure
+        and the same features is replaced.
+
+        Parameters
+        ----------
+        key : str
+            Structure key of the model created by `structure_key`
+        features : np.ndarray
+            Features of the model created by `features`
+        warm_start : WarmStart
+            Solution of the model
+        """
+
+        case_id = (key, hashlib.sha256(features.tobytes()).hexdigest())
+
+        with cls._lock:
+            cls._cases[case_id] = (features, warm_start)
+            cls._cases.move_to_end(case_id)
+            cls._evict()
+
+    @classmethod
+    def _evict(cls):
+        while len(cls._cases) > cls._max_cases:
+            cls._cases.popitem(last=False)
@@ -5,12 +5,18 @@ Copyright (c) 2007, Eclipse Foundation, Inc. and its licensors. All rights reser
 Use of this source code is governed by a BSD-style license that can be found in the LICENSE file.
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import xarray as xr
 
-from feedinlib import era5
 from ..data_models.enums import WeatherDataSource
 from ..data_models.weather_data import (
     WeatherDataCollection,
@@ -18,14 +24,37 @@ from ..data_models.weather_data import (
     WeatherDataHeightSpecific,
     WeatherDataType,
 )
+from .lazy_import import lazy_import
+
+
+xr = lazy_import("xarray")
+
+
+# NetCDF variables of an ERA5 file which are needed to determine every weather data type
+ERA5_VARIABLES = {
+    WeatherDataType.AIR_TEMPERATURE: ["t2m"],
+    WeatherDataType.SOIL_TEMPERATURE: ["stl4"],
+    WeatherDataType.WIND_SPEED: ["u10", "v10", "u100", "v100"],
+    WeatherDataType.PRESSURE: ["sp"],
+    WeatherDataType.ROUGHNESS_LENGTH: ["fsr"],
+    WeatherDataType.GHI: ["ssrd"],
+    WeatherDataType.DHI: ["ssrd", "fdir"],
+}
 
 
 def get_weather_data_from_era5_netcdf(
-    path_netcdf: str | Path, longitude: float, latitude: float
+    path_netcdf: str | Path,
+    longitude: float,
+    latitude: float,
+    weather_data_types: list[WeatherDataType] | None = None,
 ) -> WeatherDataCollection:
     """Loads a NETCDF file aquired from ECMWF Climate Data Store
     into the WattAdvisor internal weather data format.
 
+    The file is opened lazily and the grid point nearest to the location is selected before
+    any data is read, so that only the time series of the required variables at this grid point
+    are loaded into memory, independent of the size of the file.
+
     Parameters
     ----------
     path_netcdf : str | Path
@@ -34,92 +63,222 @@ def get_weather_data_from_era5_netcdf(
         Longitude of the location for which weather data from the file should be extracted
     latitude : float
         Latitude of the location for which weather data from the file should be extracted
+    weather_data_types : list[WeatherDataType] | None, optional
+        Weather data types to extract, by default None (all types contained in ``ERA5_VARIABLES``)
 
     Returns
     -------
     WeatherDataCollection
         Object containing a collection of different weather data variables such as wind speed, air temperature, etc.
 
+    Raises
+    ------
+    ValueError
+        If a weather data type cannot be extracted from ERA5 files
     """
 
-    location = [longitude, latitude]
+    if weather_data_types is None:
+        weather_data_types = list(ERA5_VARIABLES)
 
-    ds = xr.open_dataset(path_netcdf)
-    ds = era5.select_area(ds, *location)
+    for weather_data_type in weather_data_types:
+        if weather_data_type not in ERA5_VARIABLES:
+            raise ValueError(f"Weather data type {weather_data_type} cannot be extracted from ERA5 files.")
 
-    weather_data_wind = era5.format_windpowerlib(ds)
-    weather_data_wind.index = weather_data_wind.index.droplevel(level=[1, 2])
-    weather_data_pv = era5.format_pvlib(ds)
+    variables = list(dict.fromkeys(
+        variable for weather_data_type in weather_data_types for variable in ERA5_VARIABLES[weather_data_type]
+    ))
 
-    weather_data_pv.index = weather_data_pv.index.droplevel(level=[1, 2])
-    weather_data_pv.index = weather_data_pv.index.shift(-30, freq="min")
+    with xr.open_dataset(path_netcdf, cache=False) as ds:
+        point = ds[variables].sel(latitude=latitude, longitude=longitude, method="nearest")
+        point = point.sortby("time").load()
 
-    weather_data_temperature = ds.to_dataframe().reset_index()
-    weather_data_temperature["time"] = weather_data_temperature.time - pd.Timedelta(
-        minutes=60
-    )
-    weather_data_temperature.set_index(["time", "latitude", "longitude"], inplace=True)
-    weather_data_temperature.index = weather_data_temperature.index.droplevel(
-        level=[1, 2]
-    )
-    weather_data_temperature.sort_index(inplace=True)
-    weather_data_temperature = weather_data_temperature.tz_localize("UTC", level=0)
-    weather_data_temperature[["stl4", "t2m"]] = (
-        weather_data_temperature[["stl4", "t2m"]] - 273.15
-    )
+    return _era5_point_to_weather_data_collection(point, weather_data_types)
 
-    weather_data_collection = WeatherDataCollection(
-        air_temperature=WeatherDataHeightSpecific(
-            series=[weather_data_temperature["t2m"]],
+
+def get_weather_data_from_era5_netcdf_batch(
+    path_netcdf: str | Path,
+    locations: list[tuple[float, float]],
+    weather_data_types: list[WeatherDataType] | None = None,
+    max_chunk_size: int = 256 * 1024**2,
+) -> Iterator[WeatherDataCollection]:
+    """Loads the weather data of several locations from a NETCDF file aquired from ECMWF Climate Data Store
+    into the WattAdvisor internal weather data format.
+
+    The nearest grid point of every location is determined once from an index over the grid coordinates.
+    The file is then read in a single pass over the time axis in chunks of at most `max_chunk_size` bytes
+    covering the bounding box of all grid points, from which the time series of all locations are taken.
+
+    Parameters
+    ----------
+    path_netcdf : str | Path
+        Path of the NETCDF file containing weather data from ECMWF Climate Data Store
+    locations : list[tuple[float, float]]
+        Longitude and latitude of every location for which weather data from the file should be extracted
+    weather_data_types : list[WeatherDataType] | None, optional
+        Weather data types to extract, by default None (all types contained in ``ERA5_VARIABLES``)
+    max_chunk_size : int, optional
+        Maximum number of bytes of a single variable read from the file at once, by default 256 MiB
+
+    Yields
+    ------
+    WeatherDataCollection
+        Object containing a collection of different weather data variables of each location in the order of `locations`
+
+    Raises
+    ------
+    ValueError
+        If a weather data type cannot be extracted from ERA5 files
+    """
+
+    if weather_data_types is None:
+        weather_data_types = list(ERA5_VARIABLES)
+
+    for weather_data_type in weather_data_types:
+        if weather_data_type not in ERA5_VARIABLES:
+            raise ValueError(f"Weather data type {weather_data_type} cannot be extracted from ERA5 files.")
+
+    variables = list(dict.fromkeys(
+        variable for weather_data_type in weather_data_types for variable in ERA5_VARIABLES[weather_data_type]
+    ))
+
+    longitudes = np.array([location[0] for location in locations], dtype=float)
+    latitudes = np.array([location[1] for location in locations], dtype=float)
+
+    with xr.open_dataset(path_netcdf, cache=False) as ds:
+        # nearest grid point of every location, as selected by ``xarray.Dataset.sel(method="nearest")``
+        latitude_index = ds.indexes["latitude"].get_indexer(latitudes, method="nearest")
+        longitude_index = ds.indexes["longitude"].get_indexer(longitudes, method="nearest")
+
+        # read every grid point only once, even if it is the nearest one of several locations
+        grid_points, location_grid_points = np.unique(
+            np.stack([latitude_index, longitude_index], axis=1), axis=0, return_inverse=True
+        )
+        location_grid_points = location_grid_points.ravel()
+
+        latitude_slice = slice(grid_points[:, 0].min(), grid_points[:, 0].max() + 1)
+        longitude_slice = slice(grid_points[:, 1].min(), grid_points[:, 1].max() + 1)
+
+        n_time_steps = ds.sizes["time"]
+        time_order = np.argsort(ds["time"].values, kind="stable")
+        times = ds["time"].values[time_order]
+
+        grid_point_values = {}
+        for variable in variables:
+            data = ds[variable].transpose("time", "latitude", "longitude").isel(
+                latitude=latitude_slice, longitude=longitude_slice
+            )
+            step_size = data.dtype.itemsize * data.shape[1] * data.shape[2]
+            chunk_length = max(1, max_chunk_size // step_size)
+
+            values = np.empty((n_time_steps, len(grid_points)), dtype=data.dtype)
+            for start in range(0, n_time_steps, chunk_length):
+                chunk = data.isel(time=slice(start, start + chunk_length)).values
+                values[start : start + chunk_length] = chunk[
+                    :,
+                    grid_points[:, 0] - latitude_slice.start,
+                    grid_points[:, 1] - longitude_slice.start,
+                ]
+
+            grid_point_values[variable] = values[time_order]
+
+    for grid_point in location_grid_points:
+        point = xr.Dataset(
+            {variable: ("time", values[:, grid_point]) for variable, values in grid_point_values.items()},
+            coords={"time": times},
+        )
+
+        yield _era5_point_to_weather_data_collection(point, weather_data_types)
+
+
+def _era5_point_to_weather_data_collection(
+    point: xr.Dataset, weather_data_types: list[WeatherDataType]
+) -> WeatherDataCollection:
+    """Converts the loaded time series of a single ERA5 grid point into the WattAdvisor internal weather data format.
+
+    Parameters
+    ----------
+    point : xr.Dataset
+        Dataset containing the time series of the required ERA5 variables at one grid point
+    weather_data_types : list[WeatherDataType]
+        Weather data types to convert
+
+    Returns
+    -------
+    WeatherDataCollection
+        Object containing a collection of different weather data variables such as wind speed, air temperature, etc.
+    """
+
+    # the time stamp given by ERA5 for mean values corresponds to the end of the valid time interval,
+    # the time stamps are shifted to the beginning of the interval
+    index = pd.DatetimeIndex(point["time"].values, name="time") - pd.Timedelta(minutes=60)
+    index = index.tz_localize("UTC")
+
+    def series(values, name) -> pd.Series:
+        return pd.Series(values, index=index, name=name)
+
+    weather_data = {}
+
+    if WeatherDataType.AIR_TEMPERATURE in weather_data_types:
+        weather_data["air_temperature"] = WeatherDataHeightSpecific(
+            series=[series(point["t2m"].values - 273.15, "t2m")],
             source=WeatherDataSource.ERA5_NETCDF,
             height_measured_at=[2],
             type=WeatherDataType.AIR_TEMPERATURE,
-        ),
-        soil_temperature=WeatherDataHeightUnspecific(
-            series=weather_data_temperature["stl4"],
+        )
+
+    if WeatherDataType.SOIL_TEMPERATURE in weather_data_types:
+        weather_data["soil_temperature"] = WeatherDataHeightUnspecific(
+            series=series(point["stl4"].values - 273.15, "stl4"),
             source=WeatherDataSource.ERA5_NETCDF,
             type=WeatherDataType.SOIL_TEMPERATURE,
-        ),
-        wind_speed=WeatherDataHeightSpecific(
+        )
+
+    if WeatherDataType.WIND_SPEED in weather_data_types:
+        weather_data["wind_speed"] = WeatherDataHeightSpecific(
             series=[
-                weather_data_wind["wind_speed"][height]
-                for height in weather_data_wind["wind_speed"].columns
+                series(np.sqrt(point["u10"].values ** 2 + point["v10"].values ** 2), 10),
+                series(np.sqrt(point["u100"].values ** 2 + point["v100"].values ** 2), 100),
             ],
             source=WeatherDataSource.ERA5_NETCDF,
-            height_measured_at=weather_data_wind["wind_speed"].columns.to_list(),
+            height_measured_at=[10, 100],
             type=WeatherDataType.WIND_SPEED,
-        ),
-        pressure=WeatherDataHeightSpecific(
-            series=[
-                weather_data_wind["pressure"][height]
-                for height in weather_data_wind["pressure"].columns
-            ],
+        )
+
+    if WeatherDataType.PRESSURE in weather_data_types:
+        weather_data["pressure"] = WeatherDataHeightSpecific(
+            series=[series(point["sp"].values, 0)],
             source=WeatherDataSource.ERA5_NETCDF,
-            height_measured_at=weather_data_wind["pressure"].columns.to_list(),
+            height_measured_at=[0],
             type=WeatherDataType.PRESSURE,
-        ),
-        roughness_length=WeatherDataHeightSpecific(
-            series=[
-                weather_data_wind["roughness_length"][height]
-                for height in weather_data_wind["roughness_length"].columns
-            ],
+        )
+
+    if WeatherDataType.ROUGHNESS_LENGTH in weather_data_types:
+        weather_data["roughness_length"] = WeatherDataHeightSpecific(
+            series=[series(point["fsr"].values, 0)],
             source=WeatherDataSource.ERA5_NETCDF,
-            height_measured_at=weather_data_wind["roughness_length"].columns.to_list(),
+            height_measured_at=[0],
             type=WeatherDataType.ROUGHNESS_LENGTH,
-        ),
-        ghi=WeatherDataHeightUnspecific(
-            series=weather_data_pv["ghi"],
-            source=WeatherDataSource.ERA5_NETCDF,
-            type=WeatherDataType.GHI,
-        ),
-        dhi=WeatherDataHeightUnspecific(
-            series=weather_data_pv["dhi"],
-            source=WeatherDataSource.ERA5_NETCDF,
-            type=WeatherDataType.DHI,
-        ),
-    )
+        )
 
-    return weather_data_collection
+    if WeatherDataType.GHI in weather_data_types or WeatherDataType.DHI in weather_data_types:
+        # accumulated irradiation [J/m²] per hour to mean irradiance [W/m²]
+        ghi = point["ssrd"].values / 3600.0
+
+        if WeatherDataType.GHI in weather_data_types:
+            weather_data["ghi"] = WeatherDataHeightUnspecific(
+                series=series(ghi, "ghi"),
+                source=WeatherDataSource.ERA5_NETCDF,
+                type=WeatherDataType.GHI,
+            )
+
+        if WeatherDataType.DHI in weather_data_types:
+            weather_data["dhi"] = WeatherDataHeightUnspecific(
+                series=series(ghi - point["fdir"].values / 3600.0, "dhi"),
+                source=WeatherDataSource.ERA5_NETCDF,
+                type=WeatherDataType.DHI,
+            )
+
+    return WeatherDataCollection(**weather_data)
 
 
 def get_weather_data_from_csv(
@@ -133,8 +292,11 @@ def get_weather_data_from_csv(
     path_air_temperature: str | None = None,
     path_soil_temperature: str | None = None,
     path_water_temperature: str | None = None,
+    cache_directory: str | Path | None = None,
 ) -> WeatherDataCollection:
     """Loads weather data from CSV files into into the WattAdvisor internal weather data format.
+    If `cache_directory` is given, every CSV file is converted once into a binary file named by the
+    checksum of its content, which is read instead of parsing the CSV file again on subsequent calls.
 
     Parameters
     ----------
@@ -158,6 +320,8 @@ def get_weather_data_from_csv(
         path of a CSV file that contains soil temperature measurements, by default None
     path_water_temperature : str | None, optional
         path of a CSV file that contains water temperature measurements, by default None
+    cache_directory : str | Path | None, optional
+        Directory to store the binary form of the CSV files in, by default None (no caching)
 
     Returns
     -------
@@ -189,31 +353,31 @@ def get_weather_data_from_csv(
 
     weather_data_collection = WeatherDataCollection(
         air_temperature=_get_height_specific_weather_data_from_csv_file(
-            path_air_temperature, WeatherDataType.AIR_TEMPERATURE
+            path_air_temperature, WeatherDataType.AIR_TEMPERATURE, cache_directory
         ),
         soil_temperature=_get_height_unspecific_weather_data_from_csv_file(
-            path_soil_temperature, WeatherDataType.SOIL_TEMPERATURE
+            path_soil_temperature, WeatherDataType.SOIL_TEMPERATURE, cache_directory
         ),
         water_temperature=_get_height_unspecific_weather_data_from_csv_file(
-            path_water_temperature, WeatherDataType.WATER_TEMPERATURE
+            path_water_temperature, WeatherDataType.WATER_TEMPERATURE, cache_directory
         ),
         wind_speed=_get_height_specific_weather_data_from_csv_file(
-            path_wind_speed, WeatherDataType.WIND_SPEED
+            path_wind_speed, WeatherDataType.WIND_SPEED, cache_directory
         ),
         pressure=_get_height_specific_weather_data_from_csv_file(
-            path_pressure, WeatherDataType.PRESSURE
+            path_pressure, WeatherDataType.PRESSURE, cache_directory
         ),
         roughness_length=_get_height_specific_weather_data_from_csv_file(
-            path_roughness_length, WeatherDataType.ROUGHNESS_LENGTH
+            path_roughness_length, WeatherDataType.ROUGHNESS_LENGTH, cache_directory
         ),
         ghi=_get_height_unspecific_weather_data_from_csv_file(
-            path_ghi, WeatherDataType.GHI
+            path_ghi, WeatherDataType.GHI, cache_directory
         ),
         dhi=_get_height_unspecific_weather_data_from_csv_file(
-            path_dhi, WeatherDataType.DHI
+            path_dhi, WeatherDataType.DHI, cache_directory
         ),
         dni=_get_height_unspecific_weather_data_from_csv_file(
-            path_dni, WeatherDataType.DNI
+            path_dni, WeatherDataType.DNI, cache_directory
         ),
     )
 
@@ -221,7 +385,7 @@ def get_weather_data_from_csv(
 
 
 def _get_height_specific_weather_data_from_csv_file(
-    file_path: str | None, type: WeatherDataType
+    file_path: str | None, type: WeatherDataType, cache_directory: str | Path | None = None
 ) -> WeatherDataHeightSpecific | None:
     """Loads weather data measured at a specific height above the ground from a single CSV file.
 
@@ -231,6 +395,8 @@ def _get_height_specific_weather_data_from_csv_file(
         Path to the CSV file containing weather data
     type : WeatherDataType
         Type of weather data which is contained in the CSV file
+    cache_directory : str | Path | None, optional
+        Directory to store the binary form of the CSV file in, by default None (no caching)
 
     Returns
     -------
@@ -242,9 +408,7 @@ def _get_height_specific_weather_data_from_csv_file(
         return None
 
     else:
-        weather_data = pd.read_csv(
-            file_path, index_col=0, header=0, date_format="ISO8601"
-        )
+        weather_data = _read_weather_csv(file_path, cache_directory)
 
         weather_data_series = [weather_data[column] for column in weather_data.columns]
         height_measured_at = weather_data.columns.tolist()
@@ -260,7 +424,7 @@ def _get_height_specific_weather_data_from_csv_file(
 
 
 def _get_height_unspecific_weather_data_from_csv_file(
-    file_path: str | None, type: WeatherDataType
+    file_path: str | None, type: WeatherDataType, cache_directory: str | Path | None = None
 ) -> WeatherDataHeightUnspecific | None:
     """Loads weather data from a single CSV file.
 
@@ -270,6 +434,8 @@ def _get_height_unspecific_weather_data_from_csv_file(
         Path to the CSV file containing weather data
     type : WeatherDataType
         Type of weather data which is contained in the CSV file
+    cache_directory : str | Path | None, optional
+        Directory to store the binary form of the CSV file in, by default None (no caching)
 
     Returns
     -------
@@ -281,12 +447,222 @@ def _get_height_unspecific_weather_data_from_csv_file(
         return None
 
     else:
-        weather_data_series = pd.read_csv(
-            file_path, index_col=0, header=0, date_format="ISO8601"
-        ).squeeze()
+        weather_data_series = _read_weather_csv(file_path, cache_directory).squeeze()
 
         weather_data = WeatherDataHeightUnspecific(
             series=weather_data_series, source=WeatherDataSource.CUSTOM_CSV, type=type
         )
 
         return weather_data
+
+
+def _read_weather_csv(file_path: str | Path, cache_directory: str | Path | None = None) -> pd.DataFrame:
+    """Reads a CSV file containing weather data with a timestamp index.
+    If `cache_directory` is given, the parsed data is stored as binary NumPy bundle named by the
+    SHA-256 checksum of the CSV file, which is read instead of the CSV file as long as its content does not change.
+    Files whose index is neither parsed as timestamps nor kept as strings are not cached.
+
+    Parameters
+    ----------
+    file_path : str | Path
+        Path to the CSV file containing weather data
+    cache_directory : str | Path | None, optional
+        Directory to store the binary form of the CSV file in, by default None (no caching)
+
+    Returns
+    -------
+    pd.DataFrame
+        Weather data of all columns of the CSV file
+    """
+
+    if cache_directory is None:
+        return pd.read_csv(file_path, index_col=0, header=0, date_format="ISO8601")
+
+    with open(file_path, "rb") as file:
+        checksum = hashlib.sha256(file.read()).hexdigest()
+
+    cache_directory = Path(cache_directory)
+    cache_path = cache_directory.joinpath(f"{checksum}.npz")
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as bundle:
+            if str(bundle["checksum"]) == checksum:
+                index_name = str(bundle["index_name"]) if bundle["has_index_name"] else None
+
+                if bundle["index"].dtype.kind == "M":
+                    index = pd.DatetimeIndex(bundle["index"], name=index_name)
+                    if str(bundle["tz"]) != "None":
+                        index = index.tz_localize("UTC").tz_convert(str(bundle["tz"]))
+                else:
+                    # timestamps with varying UTC offsets are not parsed by pandas and kept as strings
+                    index = pd.Index(bundle["index"], name=index_name)
+
+                return pd.DataFrame(
+                    {str(column): bundle[f"column_{i}"] for i, column in enumerate(bundle["columns"])},
+                    index=index,
+                )
+
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        pass
+
+    weather_data = pd.read_csv(file_path, index_col=0, header=0, date_format="ISO8601")
+
+    if any(dtype == object for dtype in weather_data.dtypes):
+        return weather_data
+
+    if isinstance(weather_data.index, pd.DatetimeIndex):
+        index = weather_data.index
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        index = index.to_numpy()
+
+    elif pd.api.types.is_string_dtype(weather_data.index):
+        index = np.array(weather_data.index, dtype=str)
+
+    else:
+        return weather_data
+
+    cache_directory.mkdir(parents=True, exist_ok=True)
+    temporary_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+    with open(temporary_path, "wb") as file:
+        np.savez(
+            file,
+            checksum=checksum,
+            index=index,
+            index_name=str(weather_data.index.name),
+            has_index_name=weather_data.index.name is not None,
+            tz=str(getattr(weather_data.index, "tz", None)),
+            columns=np.array([str(column) for column in weather_data.columns]),
+            **{f"column_{i}": weather_data[column].to_numpy() for i, column in enumerate(weather_data.columns)},
+        )
+
+    os.replace(temporary_path, cache_path)
+
+    return weather_data
+
+
+def save_weather_data_collection(
+    weather_data_collection: WeatherDataCollection,
+    directory: str | Path,
+    dtype: np.dtype = np.float32,
+):
+    """Stores a weather data collection as NumPy files in a directory: one matrix of shape
+    (heights, time steps) per weather data variable, one file with the time index shared by all
+    variables and a JSON file with the metadata. The stored collection can be loaded memory-mapped
+    with `load_weather_data_collection`.
+
+    Parameters
+    ----------
+    weather_data_collection : WeatherDataCollection
+        Weather data to store
+    directory : str | Path
+        Directory to store the files in. Is created if it does not exist.
+    dtype : np.dtype, optional
+        Data type of the stored values, by default np.float32
+
+    Raises
+    ------
+    ValueError
+        If the collection contains no weather data or the variables have different time indexes
+    """
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    index = None
+    metadata = {"variables": {}}
+
+    for variable, weather_data in weather_data_collection:
+        if weather_data is None:
+            continue
+
+        if isinstance(weather_data, WeatherDataHeightSpecific):
+            series = weather_data.series
+            metadata["variables"][variable] = {"height_measured_at": weather_data.height_measured_at}
+        else:
+            series = [weather_data.series]
+            metadata["variables"][variable] = {}
+
+        if index is None:
+            index = series[0].index
+        elif any(not s.index.equals(index) for s in series):
+            raise ValueError("All weather data variables must have the same time index to be stored together.")
+
+        metadata["variables"][variable].update(
+            source=weather_data.source.value,
+            type=weather_data.type.value,
+            names=[s.name for s in series],
+        )
+
+        np.save(directory.joinpath(f"{variable}.npy"), np.stack([s.to_numpy(dtype=dtype) for s in series]))
+
+    if index is None:
+        raise ValueError("Weather data collection contains no weather data.")
+
+    metadata["tz"] = None if index.tz is None else str(index.tz)
+    metadata["index_name"] = index.name
+
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+
+    np.save(directory.joinpath("index.npy"), index.to_numpy())
+
+    with open(directory.joinpath("metadata.json"), "w") as file:
+        json.dump(metadata, file)
+
+
+def load_weather_data_collection(directory: str | Path, mmap: bool = True) -> WeatherDataCollection:
+    """Loads a weather data collection stored with `save_weather_data_collection`. All variables share one
+    time index and their series are views on the stored matrices, which are memory-mapped by default, so that
+    weather data of many locations can be held in one process with a small resident memory.
+
+    Parameters
+    ----------
+    directory : str | Path
+        Directory the weather data collection is stored in
+    mmap : bool, optional
+        Whether the stored matrices are memory-mapped read-only instead of being read into memory, by default True
+
+    Returns
+    -------
+    WeatherDataCollection
+        Object containing a collection of different weather data variables such as wind speed, air temperature, etc.
+    """
+
+    directory = Path(directory)
+    mmap_mode = "r" if mmap else None
+
+    with open(directory.joinpath("metadata.json"), "r") as file:
+        metadata = json.load(file)
+
+    index = pd.DatetimeIndex(np.load(directory.joinpath("index.npy")), name=metadata["index_name"])
+    if metadata["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(metadata["tz"])
+
+    weather_data = {}
+    for variable, variable_metadata in metadata["variables"].items():
+        values = np.load(directory.joinpath(f"{variable}.npy"), mmap_mode=mmap_mode)
+
+        if "height_measured_at" in variable_metadata:
+            weather_data[variable] = WeatherDataHeightSpecific.from_array(
+                values,
+                index,
+                source=WeatherDataSource(variable_metadata["source"]),
+                height_measured_at=variable_metadata["height_measured_at"],
+                type=WeatherDataType(variable_metadata["type"]),
+                names=variable_metadata["names"],
+                dtype=None,
+            )
+        else:
+            weather_data[variable] = WeatherDataHeightUnspecific.from_array(
+                values[0],
+                index,
+                source=WeatherDataSource(variable_metadata["source"]),
+                type=WeatherDataType(variable_metadata["type"]),
+                name=variable_metadata["names"][0],
+                dtype=None,
+            )
+
+    return WeatherDataCollection(**weather_data)